@@ -0,0 +1,200 @@
+"""
+API の同時接続ベンチマーク
+
+一時ワークスペースにページを生成して別プロセスで uvicorn を起動し、同時接続数を
+変えながら検索・ページ取得・一覧のリクエストを送ってスループットとレイテンシを計測する。
+同時に /api/health へ一定間隔でリクエストを送り、重いリクエストの処理中も
+イベントループが応答できているか（ルートがループをブロックしていないか）を確認する。
+
+ルートがイベントループをブロックしていると、接続数を増やしてもスループットは伸びず、
+health のレイテンシが重いリクエストの処理時間に引きずられて悪化する。
+
+Usage:
+    python benchmarks/api_concurrency.py --pages 2000 --concurrency 1,2,4,8,16
+"""
+
+import argparse
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+from notenest.core.repository import Repository  # noqa: E402
+
+WORDS = [
+    "alpha",
+    "beta",
+    "gamma",
+    "delta",
+    "epsilon",
+    "zeta",
+    "theta",
+    "kappa",
+    "lambda",
+    "sigma",
+    "omega",
+    "python",
+    "rust",
+]
+
+
+def populate(workspace: Path, count: int, seed: int = 0) -> list[str]:
+    """ランダムな本文・リンク・タグを持つページを生成"""
+    rng = random.Random(seed)
+    slugs = [f"page-{i:05d}" for i in range(count)]
+    repo = Repository(workspace)
+    with repo.transaction():
+        for slug in slugs:
+            body = " ".join(rng.choices(WORDS, k=200))
+            links = " ".join(f"[[{target}]]" for target in rng.sample(slugs, 3))
+            repo.create_page(slug, slug.title(), f"{body}\n\n{links}", tags=rng.sample(WORDS, 2))
+    repo.close()
+    return slugs
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+def start_server(cwd: Path, port: int, threads: int) -> subprocess.Popen[bytes]:
+    """cwd/workspace を使う API サーバーを起動して応答するまで待つ"""
+    env = {
+        **os.environ,
+        "PYTHONPATH": str(ROOT / "src"),
+        "NOTENEST_API_THREADS": str(threads),
+    }
+    server = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "web.api.main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        cwd=cwd,
+        env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/api/health", timeout=1)
+            return server
+        except httpx.TransportError:
+            time.sleep(0.1)
+    server.kill()
+    raise RuntimeError("API server did not start")
+
+
+def make_paths(slugs: list[str], count: int, seed: int) -> list[str]:
+    """検索・ページ取得・概要一覧を 1:1:1 で混ぜたリクエスト"""
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        kind = i % 3
+        if kind == 0:
+            paths.append(f"/api/search?q={rng.choice(WORDS)}&limit=20")
+        elif kind == 1:
+            paths.append(f"/api/pages/{rng.choice(slugs)}")
+        else:
+            paths.append(f"/api/pages?fields=summary&limit=50&offset={rng.randrange(500)}")
+    return paths
+
+
+def run_level(base_url: str, paths: list[str], concurrency: int) -> dict[str, float]:
+    """concurrency 本の接続から paths を送り、並行して health のレイテンシを測る"""
+    local = threading.local()
+
+    def fetch(path: str) -> float:
+        if not hasattr(local, "client"):
+            local.client = httpx.Client(base_url=base_url, timeout=120)
+        start = time.perf_counter()
+        local.client.get(path).raise_for_status()
+        return time.perf_counter() - start
+
+    done = threading.Event()
+    health: list[float] = []
+
+    def probe() -> None:
+        with httpx.Client(base_url=base_url, timeout=120) as client:
+            while not done.is_set():
+                start = time.perf_counter()
+                client.get("/api/health").raise_for_status()
+                health.append(time.perf_counter() - start)
+                time.sleep(0.01)
+
+    prober = threading.Thread(target=probe)
+    prober.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        latencies = sorted(executor.map(fetch, paths))
+    elapsed = time.perf_counter() - started
+    done.set()
+    prober.join()
+
+    health.sort()
+    return {
+        "rps": len(paths) / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "health_p95": health[max(int(len(health) * 0.95) - 1, 0)] * 1000 if health else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="NoteNest API concurrency benchmark")
+    parser.add_argument("--pages", type=int, default=2000, help="生成するページ数")
+    parser.add_argument("--requests", type=int, default=600, help="接続数ごとのリクエスト数")
+    parser.add_argument("--concurrency", default="1,2,4,8,16", help="同時接続数（カンマ区切り）")
+    parser.add_argument("--threads", type=int, default=16, help="サーバーのスレッドプール数")
+    args = parser.parse_args()
+    levels = [int(level) for level in args.concurrency.split(",")]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cwd = Path(tmpdir)
+        print(f"Generating {args.pages} pages...", flush=True)
+        slugs = populate(cwd / "workspace", args.pages)
+
+        port = free_port()
+        server = start_server(cwd, port, args.threads)
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            run_level(base_url, make_paths(slugs, 30, seed=0), 1)  # ウォームアップ
+
+            print(f"CPUs: {os.cpu_count()}  API threads: {args.threads}")
+            print(
+                f"{'clients':>8} {'req/s':>10} {'speedup':>8} "
+                f"{'p50 ms':>8} {'p95 ms':>8} {'health p95 ms':>14}"
+            )
+            baseline = None
+            for level in levels:
+                result = run_level(base_url, make_paths(slugs, args.requests, seed=level), level)
+                baseline = baseline or result["rps"]
+                print(
+                    f"{level:>8} {result['rps']:>10.1f} {result['rps'] / baseline:>7.2f}x "
+                    f"{result['p50']:>8.1f} {result['p95']:>8.1f} {result['health_p95']:>14.1f}",
+                    flush=True,
+                )
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,8 @@
 import argparse
 from pathlib import Path
 
+from notenest.core.repository import Repository
+from notenest.storage.query_compiler import SEARCH_TOKENIZERS
 from notenest.ui.app import NoteNestApp
 
 
@@ -17,12 +19,49 @@ def main() -> None:
         default=".",
         help="ワークスペースディレクトリ（デフォルト: カレントディレクトリ）",
     )
+    parser.add_argument(
+        "--no-watch",
+        action="store_true",
+        help="ファイル変更の監視を無効化（変更は r キーで手動同期）",
+    )
+    parser.add_argument(
+        "--tokenizer",
+        choices=sorted(SEARCH_TOKENIZERS),
+        help="全文検索のトークナイザーを変更してインデックスを再構築し終了（日本語は trigram）",
+    )
+    parser.add_argument(
+        "--rebuild-index",
+        action="store_true",
+        help="全文検索インデックスを再構築して終了",
+    )
+    parser.add_argument(
+        "--optimize-index",
+        action="store_true",
+        help="全文検索インデックスを最適化して終了",
+    )
 
     args = parser.parse_args()
     workspace_path = Path(args.workspace).resolve()
 
+    # インデックスのメンテナンス（TUIは起動しない）
+    if args.tokenizer or args.rebuild_index or args.optimize_index:
+        repo = Repository(workspace_path)
+        try:
+            if args.tokenizer:
+                repo.set_search_tokenizer(args.tokenizer)
+                print(f"Search tokenizer set to {args.tokenizer}")
+            if args.rebuild_index:
+                repo.rebuild_search_index()
+                print("Search index rebuilt")
+            if args.optimize_index:
+                repo.optimize_search_index()
+                print("Search index optimized")
+        finally:
+            repo.close()
+        return
+
     # TUIアプリ起動
-    app = NoteNestApp(workspace_path)
+    app = NoteNestApp(workspace_path, watch=not args.no_watch)
     app.run()
 
 
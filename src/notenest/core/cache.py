@@ -0,0 +1,124 @@
+"""ページキャッシュ"""
+
+import copy
+import dataclasses
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+from notenest.core.page import Page
+
+
+@dataclass
+class CacheStats:
+    """キャッシュ統計"""
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0  # 容量超過で追い出された件数
+    invalidations: int = 0  # 書き込みやファイル変更で破棄された件数
+    size: int = 0
+    max_size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """ヒット率"""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@dataclass
+class _CacheEntry:
+    """キャッシュエントリ（ページと読み込み時のファイル状態）"""
+
+    page: Page
+    size: int
+    mtime_ns: int
+
+
+class PageCache:
+    """
+    読み込み済みページのLRUキャッシュ
+
+    エントリはファイルのサイズ・mtimeと一緒に保持し、取得時にファイルが
+    変化していれば破棄する。返すページはコピーなので呼び出し側で変更してよい。
+    """
+
+    def __init__(self, max_size: int = 512) -> None:
+        self.max_size = max_size
+        self._entries: OrderedDict[str, _CacheEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = CacheStats(max_size=max_size)
+
+    def get(self, slug: str) -> Page | None:
+        """
+        キャッシュからページを取得
+
+        Returns:
+            Page: ファイルが読み込み時から変化していなければそのコピー、それ以外はNone
+        """
+        with self._lock:
+            entry = self._entries.get(slug)
+            if entry is None:
+                self._stats.misses += 1
+                return None
+
+            if not self._is_fresh(entry):
+                del self._entries[slug]
+                self._stats.invalidations += 1
+                self._stats.misses += 1
+                return None
+
+            self._entries.move_to_end(slug)
+            self._stats.hits += 1
+            return self._copy(entry.page)
+
+    def put(self, page: Page, size: int, mtime_ns: int) -> None:
+        """ページをキャッシュに格納（size/mtime_ns は内容を読み込んだ時点の値）"""
+        if self.max_size <= 0 or page.file_path is None:
+            return
+
+        with self._lock:
+            self._entries[page.slug] = _CacheEntry(self._copy(page), size, mtime_ns)
+            self._entries.move_to_end(page.slug)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats.evictions += 1
+
+    def invalidate(self, slug: str) -> None:
+        """ページのキャッシュを破棄"""
+        with self._lock:
+            if self._entries.pop(slug, None) is not None:
+                self._stats.invalidations += 1
+
+    def clear(self) -> None:
+        """全キャッシュを破棄"""
+        with self._lock:
+            self._stats.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        """統計のスナップショット"""
+        with self._lock:
+            return dataclasses.replace(self._stats, size=len(self._entries))
+
+    @staticmethod
+    def _is_fresh(entry: _CacheEntry) -> bool:
+        """ファイルが読み込み時から変化していないか"""
+        file_path: Path | None = entry.page.file_path
+        if file_path is None:
+            return False
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return False
+        return stat.st_size == entry.size and stat.st_mtime_ns == entry.mtime_ns
+
+    @staticmethod
+    def _copy(page: Page) -> Page:
+        """呼び出し側の変更がキャッシュに波及しないようにコピー"""
+        return dataclasses.replace(
+            page, tags=list(page.tags), metadata=copy.deepcopy(page.metadata)
+        )
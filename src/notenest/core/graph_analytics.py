@@ -0,0 +1,328 @@
+"""リンクグラフの分析"""
+
+import threading
+from array import array
+from collections import deque
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from notenest.core.link_graph import LinkGraph
+
+# リンクをたどる向き（out: 発リンク, in: 被リンク, both: 両方向）
+Direction = Literal["out", "in", "both"]
+
+
+@dataclass(frozen=True)
+class CSRGraph:
+    """
+    CSR（圧縮行）形式の有向グラフ
+
+    ノード i の隣接ノードは indices[indptr[i]:indptr[i + 1]]。
+    """
+
+    slugs: list[str]
+    indptr: "array[int]"
+    indices: "array[int]"
+
+    @classmethod
+    def from_adjacency(cls, slugs: list[str], adjacency: list[list[int]]) -> "CSRGraph":
+        """隣接リストから構築"""
+        indptr = array("l", [0])
+        indices = array("l")
+        for targets in adjacency:
+            indices.extend(targets)
+            indptr.append(len(indices))
+        return cls(slugs, indptr, indices)
+
+    @property
+    def node_count(self) -> int:
+        """ノード数"""
+        return len(self.slugs)
+
+    def degree(self, node: int) -> int:
+        """ノードの次数"""
+        return self.indptr[node + 1] - self.indptr[node]
+
+    def neighbors(self, node: int) -> "array[int]":
+        """ノードの隣接ノード"""
+        return self.indices[self.indptr[node] : self.indptr[node + 1]]
+
+    def transpose(self) -> "CSRGraph":
+        """向きを反転したグラフ"""
+        n = self.node_count
+        counts = [0] * (n + 1)
+        for target in self.indices:
+            counts[target + 1] += 1
+        for i in range(n):
+            counts[i + 1] += counts[i]
+
+        indptr = array("l", counts)
+        indices = array("l", bytes(len(self.indices) * indptr.itemsize))
+        fill = counts[:n]
+        for source in range(n):
+            for target in self.neighbors(source):
+                indices[fill[target]] = source
+                fill[target] += 1
+        return CSRGraph(self.slugs, indptr, indices)
+
+
+@dataclass
+class _Snapshot:
+    """ある version のリンクグラフから作ったCSRと計算結果のキャッシュ"""
+
+    graph: LinkGraph
+    version: int
+    forward: CSRGraph
+    backward: CSRGraph
+    index: dict[str, int]
+    results: dict[Hashable, Any] = field(default_factory=dict)
+
+
+class GraphAnalytics:
+    """
+    ページ間リンクのグラフ分析（PageRank・k-hop近傍・最短経路・連結成分）
+
+    LinkGraph の既存ページをCSR形式に変換して計算する。未作成ページへのリンクは
+    含まない。CSRと PageRank・連結成分の結果はリンクグラフの version ごとに
+    キャッシュし、リンクが変化した後の最初の呼び出しで作り直す。
+    """
+
+    def __init__(self, graph_source: Callable[[], LinkGraph]) -> None:
+        """
+        Args:
+            graph_source: 最新のリンクグラフを返す関数
+        """
+        self._graph_source = graph_source
+        self._lock = threading.Lock()
+        self._snapshot: _Snapshot | None = None
+
+    def _current(self) -> _Snapshot:
+        """最新のリンクグラフに対応するスナップショット"""
+        graph = self._graph_source()
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot and snapshot.graph is graph and snapshot.version == graph.version:
+                return snapshot
+
+        version, slugs, adjacency = graph.page_adjacency()
+        forward = CSRGraph.from_adjacency(slugs, adjacency)
+        snapshot = _Snapshot(
+            graph=graph,
+            version=version,
+            forward=forward,
+            backward=forward.transpose(),
+            index={slug: i for i, slug in enumerate(slugs)},
+        )
+        with self._lock:
+            self._snapshot = snapshot
+        return snapshot
+
+    @staticmethod
+    def _cached(snapshot: _Snapshot, key: Hashable, compute: Callable[[], Any]) -> Any:
+        if key not in snapshot.results:
+            snapshot.results[key] = compute()
+        return snapshot.results[key]
+
+    # ========== PageRank ==========
+
+    def pagerank(
+        self, damping: float = 0.85, tolerance: float = 1e-8, max_iterations: int = 100
+    ) -> dict[str, float]:
+        """
+        PageRank を計算
+
+        Args:
+            damping: リンクをたどる確率
+            tolerance: 反復を打ち切る変化量（L1ノルム）
+            max_iterations: 最大反復回数
+
+        Returns:
+            dict: slug -> スコア（合計は1）
+        """
+        if not 0 <= damping <= 1:
+            raise ValueError(f"damping must be between 0 and 1: {damping}")
+
+        snapshot = self._current()
+        key = ("pagerank", damping, tolerance, max_iterations)
+        ranks: list[float] = self._cached(
+            snapshot,
+            key,
+            lambda: _pagerank(
+                snapshot.forward, snapshot.backward, damping, tolerance, max_iterations
+            ),
+        )
+        return dict(zip(snapshot.forward.slugs, ranks, strict=True))
+
+    def top_pages(self, limit: int = 10, damping: float = 0.85) -> list[tuple[str, float]]:
+        """PageRank の上位ページ（スコアの降順、同点はslug順）"""
+        ranks = self.pagerank(damping)
+        return sorted(ranks.items(), key=lambda item: (-item[1], item[0]))[:limit]
+
+    # ========== 近傍・経路 ==========
+
+    def neighborhood(
+        self, slug: str, hops: int = 1, direction: Direction = "out"
+    ) -> dict[str, int]:
+        """
+        slug から hops 回以内のリンクでたどれるページ
+
+        Args:
+            slug: 起点のページ
+            hops: たどるリンクの最大数
+            direction: リンクをたどる向き
+
+        Returns:
+            dict: slug -> 距離（起点自身は含まない。距離・slug順）
+        """
+        if hops < 0:
+            raise ValueError(f"hops must not be negative: {hops}")
+
+        snapshot = self._current()
+        start = snapshot.index.get(slug)
+        if start is None:
+            return {}
+
+        distances = _bfs(self._neighbors(snapshot, direction), start, max_depth=hops)
+        slugs = snapshot.forward.slugs
+        return {
+            slugs[node]: depth
+            for node, depth in sorted(distances.items(), key=lambda item: (item[1], slugs[item[0]]))
+            if node != start
+        }
+
+    def shortest_path(
+        self, source: str, target: str, direction: Direction = "out"
+    ) -> list[str] | None:
+        """
+        source から target への最短経路（リンク数が最小のもの）
+
+        Returns:
+            list: 経路上のslug（両端を含む）。たどり着けなければNone
+        """
+        snapshot = self._current()
+        start, goal = snapshot.index.get(source), snapshot.index.get(target)
+        if start is None or goal is None:
+            return None
+
+        parents: dict[int, int] = {}
+        _bfs(self._neighbors(snapshot, direction), start, goal=goal, parents=parents)
+        if goal != start and goal not in parents:
+            return None
+
+        path = [goal]
+        while path[-1] != start:
+            path.append(parents[path[-1]])
+        return [snapshot.forward.slugs[node] for node in reversed(path)]
+
+    @staticmethod
+    def _neighbors(snapshot: _Snapshot, direction: Direction) -> Callable[[int], Any]:
+        if direction == "out":
+            return snapshot.forward.neighbors
+        if direction == "in":
+            return snapshot.backward.neighbors
+        if direction == "both":
+            return lambda node: [
+                *snapshot.forward.neighbors(node),
+                *snapshot.backward.neighbors(node),
+            ]
+        raise ValueError(f"Unknown direction: {direction}")
+
+    # ========== 連結成分 ==========
+
+    def components(self) -> list[list[str]]:
+        """
+        弱連結成分（リンクの向きを無視してつながっているページの集まり）
+
+        Returns:
+            list: 成分ごとのslugリスト（大きい順。各成分内はslug順）
+        """
+        snapshot = self._current()
+        components: list[list[str]] = self._cached(
+            snapshot, ("components",), lambda: _components(snapshot.forward)
+        )
+        return [list(component) for component in components]
+
+
+def _pagerank(
+    forward: CSRGraph,
+    backward: CSRGraph,
+    damping: float,
+    tolerance: float,
+    max_iterations: int,
+) -> list[float]:
+    """被リンク側のCSRから各ノードのスコアを集める反復計算"""
+    n = forward.node_count
+    if n == 0:
+        return []
+
+    out_degree = [forward.degree(node) for node in range(n)]
+    sinks = [node for node in range(n) if out_degree[node] == 0]
+    ranks = [1.0 / n] * n
+
+    for _ in range(max_iterations):
+        # 発リンクのないページのスコアは全ページに均等に配る
+        base = (1.0 - damping) / n + damping * sum(ranks[node] for node in sinks) / n
+        shares = [
+            rank / degree if degree else 0.0 for rank, degree in zip(ranks, out_degree, strict=True)
+        ]
+        new_ranks = [
+            base + damping * sum(shares[source] for source in backward.neighbors(node))
+            for node in range(n)
+        ]
+        delta = sum(abs(new - old) for new, old in zip(new_ranks, ranks, strict=True))
+        ranks = new_ranks
+        if delta < tolerance:
+            break
+
+    return ranks
+
+
+def _bfs(
+    neighbors: Callable[[int], Any],
+    start: int,
+    max_depth: int | None = None,
+    goal: int | None = None,
+    parents: dict[int, int] | None = None,
+) -> dict[int, int]:
+    """幅優先探索（ノード -> 距離 を返す。goal に到達したら打ち切る）"""
+    distances = {start: 0}
+    queue = deque([start])
+    while queue:
+        node = queue.popleft()
+        depth = distances[node]
+        if node == goal or (max_depth is not None and depth >= max_depth):
+            continue
+        for neighbor in neighbors(node):
+            if neighbor in distances:
+                continue
+            distances[neighbor] = depth + 1
+            if parents is not None:
+                parents[neighbor] = node
+            if neighbor == goal:
+                return distances
+            queue.append(neighbor)
+    return distances
+
+
+def _components(graph: CSRGraph) -> list[list[str]]:
+    """Union-Find で弱連結成分を求める"""
+    parent = list(range(graph.node_count))
+
+    def find(node: int) -> int:
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    for source in range(graph.node_count):
+        for target in graph.neighbors(source):
+            root_a, root_b = find(source), find(target)
+            if root_a != root_b:
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    groups: dict[int, list[str]] = {}
+    for node in range(graph.node_count):
+        groups.setdefault(find(node), []).append(graph.slugs[node])
+    components = [sorted(group) for group in groups.values()]
+    return sorted(components, key=lambda group: (-len(group), group[0]))
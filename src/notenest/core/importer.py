@@ -4,6 +4,8 @@ import json
 from datetime import datetime
 from pathlib import Path
 
+from notenest.core.loader import ParallelLoader
+from notenest.core.markdown_scanner import MarkdownScanner
 from notenest.core.metadata import MetadataParser
 from notenest.core.page import Page
 
@@ -172,14 +174,12 @@ class Importer:
 
         content = file_path.read_text(encoding="utf-8")
 
-        # Obsidian形式のタグを抽出（#tagの形式）
-        import re
-
-        obsidian_tags = re.findall(r"#([a-zA-Z0-9_\-]+)", content)
-
         # Frontmatter解析
         metadata, body = MetadataParser.parse(content)
 
+        # Obsidian形式のタグを抽出（#tagの形式。コードブロック内は除く）
+        obsidian_tags = MarkdownScanner.scan(body).tags
+
         slug = file_path.stem
         title = metadata.get("title", slug)
 
@@ -202,13 +202,21 @@ class Importer:
         )
 
     @staticmethod
-    def import_directory(directory: Path, format: str = "markdown") -> list[Page]:
+    def import_directory(
+        directory: Path, format: str = "markdown", workers: int | None = 1
+    ) -> list[Page]:
         """
         ディレクトリから全ファイルをインポート
 
+        ファイルの読み込み・解析は既定では呼び出し元のプロセスで行い、workers に
+        2以上（またはNone）を指定した場合だけ ParallelLoader でワーカープロセスに分散する
+        （ワーカーの起動コストがあるため大量のファイルを取り込む場合向け）。
+        結果はパス順に並ぶため、ワーカー数によらず同じ順序になる。
+
         Args:
             directory: インポート元ディレクトリ
             format: フォーマット（markdown, json, obsidian）
+            workers: ワーカープロセス数（既定の1で並列化しない、Noneで os.cpu_count()）
 
         Returns:
             list: インポートされたページリスト
@@ -216,30 +224,21 @@ class Importer:
         if not directory.exists() or not directory.is_dir():
             raise ValueError(f"Directory not found: {directory}")
 
-        pages = []
-
         if format == "markdown":
-            for md_file in directory.glob("**/*.md"):
-                try:
-                    page = Importer.import_from_markdown(md_file)
-                    pages.append(page)
-                except Exception as e:
-                    print(f"Failed to import {md_file}: {e}")
-
+            import_file, pattern = Importer.import_from_markdown, "**/*.md"
         elif format == "obsidian":
-            for md_file in directory.glob("**/*.md"):
-                try:
-                    page = Importer.import_from_obsidian(md_file)
-                    pages.append(page)
-                except Exception as e:
-                    print(f"Failed to import {md_file}: {e}")
-
+            import_file, pattern = Importer.import_from_obsidian, "**/*.md"
         elif format == "json":
-            for json_file in directory.glob("**/*.json"):
-                try:
-                    page = Importer.import_from_json(json_file)
-                    pages.append(page)
-                except Exception as e:
-                    print(f"Failed to import {json_file}: {e}")
+            import_file, pattern = Importer.import_from_json, "**/*.json"
+        else:
+            return []
+
+        pages = []
+        loader = ParallelLoader(max_workers=workers, ordered=True)
+        for result in loader.map(import_file, sorted(directory.glob(pattern))):
+            if result.value is None:
+                print(f"Failed to import {result.path}: {result.error}")
+            else:
+                pages.append(result.value)
 
         return pages
@@ -1,6 +1,8 @@
 """リンクモデル"""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+from notenest.core.page import PageSummary
 
 
 @dataclass
@@ -18,3 +20,17 @@ class Link:
         """リンク切れかどうか（未作成ページへのリンク）"""
         # 実際の判定はストレージ層で行う
         return False
+
+
+@dataclass
+class Backlink:
+    """
+    あるページへリンクしているページ
+
+    snippet はリンク元本文のリンク周辺の抜粋。highlights は snippet 内の
+    リンク（[[...]]）の範囲の (開始, 終了) 文字オフセット。
+    """
+
+    page: PageSummary  # リンク元ページ
+    snippet: str = ""
+    highlights: list[tuple[int, int]] = field(default_factory=list)
@@ -0,0 +1,210 @@
+"""メモリ上のリンクグラフ"""
+
+import threading
+from array import array
+from collections.abc import Iterable
+
+# ページが存在しないノードの page_id
+_NO_PAGE = 0
+
+
+class LinkGraph:
+    """
+    ページ間リンクのインメモリインデックス
+
+    slugを連番のノードIDにインターンし、発リンクはノードごとのID配列、
+    被リンクはノードごとのIDの集合として持つ。リンクの追加・削除はページ単位で
+    差分更新するため、発リンク・バックリンク・リンク切れ・孤立ページ・未作成の
+    リンク先の問い合わせはいずれも該当する次数に比例した時間で答えられる。
+
+    まだ作成されていないページ（リンク先としてだけ現れるslug）もノードになる。
+    一度インターンしたslugのIDは再利用しない。
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._ids: dict[str, int] = {}
+        self._slugs: list[str] = []
+        self._page_ids = array("q")  # ノードID -> ページID（ページがなければ0）
+        self._outgoing: list[array[int]] = []  # ノードID -> リンク先ノードIDの配列
+        self._incoming: list[set[int]] = []  # ノードID -> リンク元ノードIDの集合
+        # 被リンクのない既存ページと、被リンクのある未作成ページ
+        self._orphans: set[int] = set()
+        self._dangling: set[int] = set()
+        self._page_count = 0
+        self._link_count = 0
+        self.version = 0  # 変更のたびに増える番号（派生データのキャッシュ判定用）
+
+    @classmethod
+    def build(
+        cls, pages: Iterable[tuple[int, str]], links: Iterable[tuple[str, str]]
+    ) -> "LinkGraph":
+        """
+        ページとリンクの一覧からグラフを構築
+
+        Args:
+            pages: (ページID, slug) の一覧
+            links: (リンク元slug, リンク先slug) の一覧
+
+        Returns:
+            LinkGraph: 構築したグラフ
+        """
+        graph = cls()
+        targets: dict[str, list[str]] = {}
+        for source, target in links:
+            targets.setdefault(source, []).append(target)
+        for page_id, slug in pages:
+            graph.set_page(slug, page_id, targets.get(slug, []))
+        return graph
+
+    # ========== 更新 ==========
+
+    def set_page(self, slug: str, page_id: int, targets: Iterable[str]) -> None:
+        """
+        ページを登録し、発リンクを targets に置き換える
+
+        Args:
+            slug: ページのslug
+            page_id: ページID
+            targets: リンク先slug（重複は1件にまとめる）
+        """
+        with self._lock:
+            node = self._intern(slug)
+            if self._page_ids[node] == _NO_PAGE:
+                self._page_count += 1
+            self._page_ids[node] = page_id
+            self._update_flags(node)
+            new = array("q", dict.fromkeys(self._intern(target) for target in targets))
+            self._replace_outgoing(node, new)
+            self.version += 1
+
+    def remove_page(self, slug: str) -> None:
+        """ページを削除（発リンクも削除し、被リンクはリンク切れとして残す）"""
+        with self._lock:
+            node = self._ids.get(slug)
+            if node is None or self._page_ids[node] == _NO_PAGE:
+                return
+            self._page_ids[node] = _NO_PAGE
+            self._page_count -= 1
+            self._replace_outgoing(node, array("q"))
+            self._update_flags(node)
+            self.version += 1
+
+    def _intern(self, slug: str) -> int:
+        node = self._ids.get(slug)
+        if node is None:
+            node = len(self._slugs)
+            self._ids[slug] = node
+            self._slugs.append(slug)
+            self._page_ids.append(_NO_PAGE)
+            self._outgoing.append(array("q"))
+            self._incoming.append(set())
+        return node
+
+    def _replace_outgoing(self, node: int, new: "array[int]") -> None:
+        old = self._outgoing[node]
+        old_set, new_set = set(old), set(new)
+        for target in old_set - new_set:
+            self._incoming[target].discard(node)
+            self._update_flags(target)
+        for target in new_set - old_set:
+            self._incoming[target].add(node)
+            self._update_flags(target)
+        self._outgoing[node] = new
+        self._link_count += len(new) - len(old)
+
+    def _update_flags(self, node: int) -> None:
+        """孤立ページ・未作成リンク先の集合を更新"""
+        has_page = self._page_ids[node] != _NO_PAGE
+        linked = bool(self._incoming[node])
+        if has_page and not linked:
+            self._orphans.add(node)
+        else:
+            self._orphans.discard(node)
+        if linked and not has_page:
+            self._dangling.add(node)
+        else:
+            self._dangling.discard(node)
+
+    # ========== 問い合わせ ==========
+
+    def has_page(self, slug: str) -> bool:
+        """ページが存在するか"""
+        with self._lock:
+            node = self._ids.get(slug)
+            return node is not None and self._page_ids[node] != _NO_PAGE
+
+    def page_id(self, slug: str) -> int | None:
+        """ページID（ページがなければNone）"""
+        with self._lock:
+            node = self._ids.get(slug)
+            if node is None or self._page_ids[node] == _NO_PAGE:
+                return None
+            return self._page_ids[node]
+
+    def outgoing(self, slug: str) -> list[str]:
+        """リンク先slug（本文中の出現順）"""
+        with self._lock:
+            node = self._ids.get(slug)
+            if node is None:
+                return []
+            return [self._slugs[target] for target in self._outgoing[node]]
+
+    def backlinks(self, slug: str) -> list[str]:
+        """リンク元slug（slug順）"""
+        with self._lock:
+            node = self._ids.get(slug)
+            if node is None:
+                return []
+            return sorted(self._slugs[source] for source in self._incoming[node])
+
+    def broken_links(self) -> list[tuple[str, str]]:
+        """未作成ページへのリンク (リンク元slug, リンク先slug) の一覧"""
+        with self._lock:
+            return sorted(
+                (self._slugs[source], self._slugs[target])
+                for target in self._dangling
+                for source in self._incoming[target]
+            )
+
+    def orphans(self) -> list[str]:
+        """どのページからもリンクされていないページのslug"""
+        with self._lock:
+            return sorted(self._slugs[node] for node in self._orphans)
+
+    def dangling_targets(self) -> dict[str, int]:
+        """リンクされているが未作成のslugと、そのリンク元の数"""
+        with self._lock:
+            return {
+                self._slugs[node]: len(self._incoming[node])
+                for node in sorted(self._dangling, key=self._slugs.__getitem__)
+            }
+
+    def page_adjacency(self) -> tuple[int, list[str], list[list[int]]]:
+        """
+        既存ページだけを 0 から振り直した番号で表した隣接リスト
+
+        Returns:
+            tuple: (version, 番号順のslug, 番号ごとのリンク先番号)。
+                   未作成ページへのリンクは含まない
+        """
+        with self._lock:
+            nodes = [node for node, page_id in enumerate(self._page_ids) if page_id != _NO_PAGE]
+            index = {node: i for i, node in enumerate(nodes)}
+            adjacency = [
+                [index[target] for target in self._outgoing[node] if target in index]
+                for node in nodes
+            ]
+            return self.version, [self._slugs[node] for node in nodes], adjacency
+
+    @property
+    def page_count(self) -> int:
+        """ページ数"""
+        with self._lock:
+            return self._page_count
+
+    @property
+    def link_count(self) -> int:
+        """リンク数（同じページ間のリンクは1件）"""
+        with self._lock:
+            return self._link_count
@@ -0,0 +1,139 @@
+"""並列ファイルローダー"""
+
+import multiprocessing
+import os
+from collections import deque
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from multiprocessing.context import BaseContext
+from pathlib import Path
+from typing import Generic, TypeVar
+
+from notenest.core.metadata import WikiLinkParser
+from notenest.core.page import Page
+from notenest.core.sync import ManifestEntry
+from notenest.storage.file_store import FileStore
+
+T = TypeVar("T")
+
+
+@dataclass
+class LoadResult(Generic[T]):
+    """1ファイル分の読み込み結果（失敗時は value が None で error にメッセージ）"""
+
+    path: Path
+    value: T | None = None
+    error: str | None = None
+
+
+@dataclass
+class LoadedPage:
+    """ワーカーで読み込み・解析済みのページ"""
+
+    page: Page
+    entry: ManifestEntry
+    links: list[str]
+
+
+def load_markdown_page(file_store: FileStore, file_path: Path) -> LoadedPage:
+    """ページファイルを読み込み、Frontmatter解析とWiki Link抽出まで行う"""
+    raw, entry = file_store.read_page_file(file_path)
+    page = file_store.parse_page_file(file_path, raw.decode("utf-8"))
+    return LoadedPage(page=page, entry=entry, links=WikiLinkParser.extract_links(page.content))
+
+
+def _load_chunk(func: Callable[[Path], T], paths: Sequence[Path]) -> list[LoadResult[T]]:
+    """ワーカープロセスで1チャンク分を処理（例外はファイル単位で結果に格納）"""
+    results: list[LoadResult[T]] = []
+    for path in paths:
+        try:
+            results.append(LoadResult(path, value=func(path)))
+        except Exception as e:
+            results.append(LoadResult(path, error=str(e)))
+    return results
+
+
+class ParallelLoader:
+    """
+    ファイルの読み込み・解析を ProcessPoolExecutor に分散する
+
+    パスをチャンクに分けてワーカーに渡し、結果を呼び出し側へ順次返す。
+    呼び出し側（DBへの書き込み）は1スレッドのまま、解析だけをコア数に応じて
+    並列化するための仕組み。func とその引数はpickle可能である必要がある
+    （モジュールレベル関数や functools.partial）。
+
+    ファイル数が min_parallel_files 未満の場合や max_workers が1の場合は、
+    プロセス起動のコストを避けて呼び出し元のプロセスで処理する。
+
+    ワーカーは既定で spawn で起動する。Webサーバーのようにスレッドを持つプロセスで
+    fork すると、他スレッドが保持していたロック（SQLite接続など）ごと複製されて
+    子プロセスがデッドロックしうるため。
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        chunk_size: int = 256,
+        ordered: bool = True,
+        min_parallel_files: int = 512,
+        mp_context: BaseContext | None = None,
+    ) -> None:
+        """
+        Args:
+            max_workers: ワーカープロセス数（Noneで os.cpu_count()）
+            chunk_size: 1回のワーカー呼び出しで処理するファイル数
+            ordered: Trueなら入力順で結果を返す。Falseなら完了したチャンクから返す
+            min_parallel_files: 並列化するファイル数の下限
+            mp_context: ワーカーの起動方法（Noneで spawn）
+        """
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be positive: {chunk_size}")
+
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self.ordered = ordered
+        self.min_parallel_files = min_parallel_files
+        self.mp_context = mp_context or multiprocessing.get_context("spawn")
+
+    def map(self, func: Callable[[Path], T], paths: Sequence[Path]) -> Iterator[LoadResult[T]]:
+        """
+        各パスに func を適用した結果を順次返す
+
+        Args:
+            func: 1ファイルを処理する関数
+            paths: 処理するファイルパス
+
+        Returns:
+            Iterator: ファイルごとの LoadResult
+        """
+        if self.max_workers <= 1 or len(paths) < max(self.min_parallel_files, 2):
+            yield from _load_chunk(func, paths)
+            return
+
+        chunks = [paths[i : i + self.chunk_size] for i in range(0, len(paths), self.chunk_size)]
+        workers = min(self.max_workers, len(chunks))
+
+        # 結果をメモリに溜め込まないよう、実行中のチャンクはワーカー数の2倍までに抑える
+        max_pending = workers * 2
+        with ProcessPoolExecutor(max_workers=workers, mp_context=self.mp_context) as executor:
+            pending: deque[Future[list[LoadResult[T]]]] = deque()
+            chunk_iter = iter(chunks)
+
+            def submit_next() -> None:
+                for chunk in chunk_iter:
+                    pending.append(executor.submit(_load_chunk, func, chunk))
+                    if len(pending) >= max_pending:
+                        return
+
+            submit_next()
+            while pending:
+                if self.ordered:
+                    future = pending.popleft()
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    future = next(iter(done))
+                    pending.remove(future)
+
+                yield from future.result()
+                submit_next()
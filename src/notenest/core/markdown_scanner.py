@@ -0,0 +1,129 @@
+"""マークダウンの1パス走査"""
+
+import re
+from dataclasses import dataclass, field
+
+# 本文全体を1回の finditer で走査するパターン。
+# Wiki Link・外部リンク・インラインタグに加えて、コードフェンス（閉じるまで丸ごと）、
+# ATX見出しの記号、インラインコードを照合する。フェンスとインラインコードは
+# 読み飛ばすだけなので、その中のリンク・タグは抽出されない。
+# 先頭の先読みは、どの要素も始まり得ない位置での照合を早く打ち切るためのもの
+_TOKEN = re.compile(
+    r"(?=[\[#`~]|^ )(?:"
+    r"\[\[(?P<wiki>[^\]]+)\]\]"
+    r"|\[(?P<text>[^\]]+)\]\((?P<url>https?://[^\)]+)\)"
+    r"|(?<![\w#&/])#(?P<tag>[A-Za-z0-9_\-]+)"
+    r"|(?P<fence>^[ ]{0,3}(?P<backticks>`{3,})[^\n]*"
+    r"(?:(?s:.*?)\n[ ]{0,3}(?P=backticks)`*[ \t]*(?=\n|\Z)|(?s:.*)))"
+    r"|(?P<tilde_fence>^[ ]{0,3}(?P<tildes>~{3,})[^\n]*"
+    r"(?:(?s:.*?)\n[ ]{0,3}(?P=tildes)~*[ \t]*(?=\n|\Z)|(?s:.*)))"
+    r"|^[ ]{0,3}(?P<heading>#{1,6})(?=[ \t]|$)"
+    r"|(?P<code>`+).+?(?P=code)"
+    r")",
+    re.MULTILINE,
+)
+
+# 見出し行末尾の閉じ記号（" ##" など）
+_CLOSING_HASHES = re.compile(r"[ \t]+#+$")
+
+
+@dataclass(frozen=True, slots=True)
+class WikiLinkRef:
+    """本文中の Wiki Link（[[slug]] または [[表示名|slug]]）"""
+
+    slug: str
+    label: str | None  # [[表示名|slug]] 形式の表示名
+    start: int  # 本文中の開始位置（[[ の位置）
+    end: int  # 終了位置（]] の直後）
+
+
+@dataclass(frozen=True, slots=True)
+class ExternalLinkRef:
+    """本文中の外部リンク（[text](https://...)）"""
+
+    text: str
+    url: str
+    start: int
+    end: int
+
+
+@dataclass(frozen=True, slots=True)
+class Heading:
+    """見出し"""
+
+    level: int
+    text: str
+    line: int  # 行番号（1始まり）
+
+
+@dataclass
+class ScanResult:
+    """MarkdownScanner.scan の結果"""
+
+    wiki_links: list[WikiLinkRef] = field(default_factory=list)
+    external_links: list[ExternalLinkRef] = field(default_factory=list)
+    tags: list[str] = field(default_factory=list)  # インラインタグ（出現順、重複なし）
+    headings: list[Heading] = field(default_factory=list)
+
+    @property
+    def link_targets(self) -> list[str]:
+        """Wiki Link のリンク先slug（出現順、重複あり）"""
+        return [link.slug for link in self.wiki_links]
+
+
+class MarkdownScanner:
+    """
+    Wiki Link・外部リンク・インラインタグ（#tag）・見出しを1回の走査で抽出
+
+    コードフェンス（``` / ~~~）とインラインコードの中身は無視する。
+    """
+
+    @staticmethod
+    def scan(content: str) -> ScanResult:
+        """
+        マークダウン本文を走査
+
+        Args:
+            content: マークダウンテキスト（Frontmatterを除いた本文）
+
+        Returns:
+            ScanResult: 抽出結果（位置は content 中の文字オフセット）
+        """
+        result = ScanResult()
+        tags: dict[str, None] = {}
+        line_no, line_pos = 1, 0  # 見出しの行番号計算用（直前に数えた位置まで）
+
+        for match in _TOKEN.finditer(content):
+            kind = match.lastgroup
+            if kind == "wiki":
+                target = match.group("wiki")
+                label: str | None = None
+                if "|" in target:
+                    label, target = target.split("|", 1)
+                    label = label.strip()
+                result.wiki_links.append(
+                    WikiLinkRef(target.strip(), label, match.start(), match.end())
+                )
+            elif kind == "url":
+                result.external_links.append(
+                    ExternalLinkRef(
+                        match.group("text").strip(),
+                        match.group("url").strip(),
+                        match.start(),
+                        match.end(),
+                    )
+                )
+            elif kind == "tag":
+                tags[match.group("tag")] = None
+            elif kind == "heading":
+                # 見出しの記号だけを消費し、行内のリンク・タグは続けて照合する
+                line_end = content.find("\n", match.end())
+                if line_end < 0:
+                    line_end = len(content)
+                text = _CLOSING_HASHES.sub("", content[match.end() : line_end].strip())
+                line_no += content.count("\n", line_pos, match.start())
+                line_pos = match.start()
+                result.headings.append(Heading(len(match.group("heading")), text, line_no))
+
+        result.tags = list(tags)
+        return result
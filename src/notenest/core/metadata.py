@@ -2,11 +2,30 @@
 
 import re
 from collections.abc import Callable
+from pathlib import Path
 from typing import Any
 
 import frontmatter
 import yaml
 
+from notenest.core.markdown_scanner import MarkdownScanner
+
+# Frontmatter の区切り行（python-frontmatter の YAMLHandler と同じ定義）
+_FM_BOUNDARY = re.compile(r"^-{3,}\s*$", re.MULTILINE)
+
+# FileStore が書き出す単純な「key: value」行
+_SIMPLE_KEY_LINE = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*):(?: (.*))?$")
+
+# プレーンスカラーとして解釈できない先頭文字（YAMLのインジケータ）
+_PLAIN_INDICATORS = frozenset("-?:,[]{}#&*!|>'\"%@`")
+
+# libyaml が使える場合はCローダーを使う
+_YAML_LOADER: Any = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class _UnsupportedYAMLError(Exception):
+    """簡易パーサーで扱えない記法（完全なYAMLパーサーにフォールバックする）"""
+
 
 class MetadataParser:
     """Frontmatter（YAML）パーサー"""
@@ -16,19 +35,91 @@ class MetadataParser:
         """
         マークダウンからFrontmatterとコンテンツを分離
 
+        python-frontmatter と同じ区切り規則で分割し、FileStore が書き出す
+        単純な形式は専用の簡易パーサーで、それ以外は libyaml（CSafeLoader）で解析する。
+
         Args:
             content: マークダウンテキスト
 
         Returns:
             (metadata, content) のタプル
         """
+        text = content.strip()
+
+        # YAML以外の形式（TOML/JSON）は python-frontmatter に任せる
+        if text.startswith(("+++", "{")):
+            try:
+                post = frontmatter.loads(content)
+                return dict(post.metadata), post.content
+            except Exception:
+                return {}, content
+
+        start = _FM_BOUNDARY.match(text)
+        if not start:
+            return {}, text
+
+        end = _FM_BOUNDARY.search(text, start.end())
+        if not end:
+            return {}, text
+
         try:
-            post = frontmatter.loads(content)
-            return dict(post.metadata), post.content
+            metadata = MetadataParser.parse_yaml(text[start.end() : end.start()])
         except Exception:
-            # Frontmatterがない場合は空の辞書を返す
+            # Frontmatterが解析できない場合は空の辞書を返す
             return {}, content
 
+        return metadata, text[end.end() :].strip()
+
+    @staticmethod
+    def parse_header(file_path: Path) -> dict[str, Any]:
+        """
+        ファイル先頭のFrontmatterだけを読み込む（本文は読まない）
+
+        Args:
+            file_path: マークダウンファイルのパス
+
+        Returns:
+            dict: メタデータ（Frontmatterがない場合は空の辞書）
+        """
+        lines: list[bytes] = []
+        with file_path.open("rb") as f:
+            # 先頭の空行を読み飛ばし、開始区切りを探す
+            for line in f:
+                if line.strip():
+                    break
+            else:
+                return {}
+            if not _FM_BOUNDARY.match(line.decode("utf-8").rstrip("\r\n")):
+                return {}
+
+            for line in f:
+                if line.startswith(b"---") and _FM_BOUNDARY.match(
+                    line.decode("utf-8").rstrip("\r\n")
+                ):
+                    break
+                lines.append(line)
+            else:
+                return {}
+
+        try:
+            return MetadataParser.parse_yaml(b"".join(lines).decode("utf-8"))
+        except Exception:
+            return {}
+
+    @staticmethod
+    def parse_yaml(text: str) -> dict[str, Any]:
+        """
+        Frontmatter部分（区切り行を除く）を解析
+
+        Raises:
+            yaml.YAMLError: YAMLとして不正な場合
+        """
+        try:
+            return _parse_simple_yaml(text)
+        except _UnsupportedYAMLError:
+            data = yaml.load(text, Loader=_YAML_LOADER)
+            return dict(data) if isinstance(data, dict) else {}
+
     @staticmethod
     def serialize(metadata: dict[str, Any], content: str) -> str:
         """
@@ -49,7 +140,11 @@ class MetadataParser:
 
 
 class WikiLinkParser:
-    """Wiki Link（[[ページ名]]）パーサー"""
+    """
+    Wiki Link（[[ページ名]]）パーサー
+
+    抽出・置換は MarkdownScanner で行うため、コードブロック内のリンクは対象外。
+    """
 
     WIKI_LINK_PATTERN = re.compile(r"\[\[([^\]]+)\]\]")
     EXTERNAL_LINK_PATTERN = re.compile(r"\[([^\]]+)\]\((https?://[^\)]+)\)")
@@ -65,40 +160,36 @@ class WikiLinkParser:
         Returns:
             リンク先ページslugのリスト
         """
-        matches = cls.WIKI_LINK_PATTERN.findall(content)
-        # [[表示名|ページ名]] 形式にも対応
-        links = []
-        for match in matches:
-            if "|" in match:
-                # 表示名とページ名が分離されている場合
-                _, slug = match.split("|", 1)
-                links.append(slug.strip())
-            else:
-                links.append(match.strip())
-        return links
+        # [[表示名|ページ名]] 形式はページ名を返す
+        return MarkdownScanner.scan(content).link_targets
 
     @classmethod
-    def replace_links(cls, content: str, replacer: Callable[[str, str], str]) -> str:
+    def replace_links(cls, content: str, replacer: Callable[[str, str], str | None]) -> str:
         """
         Wiki Linkを置換
 
         Args:
             content: マークダウンテキスト
-            replacer: リンク先slugを受け取り、置換後の文字列を返す関数
+            replacer: リンク先slugと表示名を受け取り、置換後の文字列を返す関数
+                      （Noneを返したリンクは元の表記のまま残す）
 
         Returns:
             置換後のマークダウンテキスト
         """
+        parts: list[str] = []
+        position = 0
+        for link in MarkdownScanner.scan(content).wiki_links:
+            replaced = replacer(link.slug, link.slug if link.label is None else link.label)
+            if replaced is None:
+                continue
+            parts.append(content[position : link.start])
+            parts.append(replaced)
+            position = link.end
 
-        def replace_func(match: re.Match[str]) -> str:
-            link_text = match.group(1)
-            if "|" in link_text:
-                display, slug = link_text.split("|", 1)
-                return replacer(slug.strip(), display.strip())
-            else:
-                return replacer(link_text.strip(), link_text.strip())
-
-        return cls.WIKI_LINK_PATTERN.sub(replace_func, content)
+        if not parts:
+            return content
+        parts.append(content[position:])
+        return "".join(parts)
 
     @classmethod
     def extract_external_links(cls, content: str) -> list[tuple[str, str]]:
@@ -111,5 +202,73 @@ class WikiLinkParser:
         Returns:
             list: (link_text, url) のタプルリスト
         """
-        matches = cls.EXTERNAL_LINK_PATTERN.findall(content)
-        return [(text.strip(), url.strip()) for text, url in matches]
+        return [(link.text, link.url) for link in MarkdownScanner.scan(content).external_links]
+
+
+def _parse_simple_yaml(text: str) -> dict[str, Any]:
+    """
+    FileStore.save_page_file が書き出す単純なYAMLを解析
+
+    トップレベルの「key: スカラー」「key: []」と、それに続く「- スカラー」形式の
+    リストのみを扱う。ネストしたマッピングや型付きスカラー（数値・真偽値・日時など）
+    が現れた場合は _UnsupportedYAMLError を送出する。
+    """
+    result: dict[str, Any] = {}
+    list_key: str | None = None
+
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+
+        if line.startswith("- ") and list_key is not None:
+            result[list_key].append(_parse_simple_scalar(line[2:]))
+            continue
+
+        # 「key:」の直後に要素がなければnullかネストしたマッピング
+        if list_key is not None and not result[list_key]:
+            raise _UnsupportedYAMLError(line)
+
+        match = _SIMPLE_KEY_LINE.match(line)
+        if not match:
+            raise _UnsupportedYAMLError(line)
+
+        key, raw = match.groups()
+        if key in result:
+            raise _UnsupportedYAMLError(line)
+
+        if raw is None:
+            # 続く「- 」行をリスト要素として受け取る
+            result[key] = []
+            list_key = key
+        elif raw == "[]":
+            result[key] = []
+            list_key = None
+        else:
+            result[key] = _parse_simple_scalar(raw)
+            list_key = None
+
+    if list_key is not None and not result[list_key]:
+        raise _UnsupportedYAMLError(list_key)
+
+    return result
+
+
+def _parse_simple_scalar(raw: str) -> str:
+    """文字列として確定できるスカラーを解析"""
+    if len(raw) >= 2 and raw[0] == "'" and raw[-1] == "'":
+        inner = raw[1:-1]
+        if "'" in inner.replace("''", ""):
+            raise _UnsupportedYAMLError(raw)
+        return inner.replace("''", "'")
+
+    if not raw or raw[0] in _PLAIN_INDICATORS or raw != raw.strip():
+        raise _UnsupportedYAMLError(raw)
+    if ": " in raw or " #" in raw:
+        raise _UnsupportedYAMLError(raw)
+
+    # 暗黙の型解決で文字列以外になりうる値（数値・真偽値・null・日時など）
+    for _, regexp in yaml.resolver.Resolver.yaml_implicit_resolvers.get(raw[0], []):
+        if regexp.match(raw):
+            raise _UnsupportedYAMLError(raw)
+
+    return raw
@@ -1,5 +1,7 @@
 """ページモデル"""
 
+import hashlib
+import json
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -34,3 +36,47 @@ class Page:
         if self.file_path:
             return self.file_path
         return Path(f"{self.slug}.md")
+
+
+@dataclass(slots=True)
+class PageSummary:
+    """一覧表示用の軽量なページ情報（本文・メタデータ・ファイルパスを持たない）"""
+
+    id: int
+    slug: str
+    title: str
+    metadata_type: str
+    created_at: datetime
+    updated_at: datetime
+    tags: list[str] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class PageFingerprint:
+    """
+    ページの変更検出用ハッシュ
+
+    content_hash はファイル・pages行・検索インデックスに影響する本文側の内容
+    （タイトル・本文・メタデータ型・メタデータ）、tags_hash と links_hash は
+    重複と順序を無視したタグ名・リンク先slugの集合から計算する。
+    """
+
+    content_hash: str
+    tags_hash: str
+    links_hash: str
+
+    @classmethod
+    def compute(cls, page: Page, links: list[str]) -> "PageFingerprint":
+        """ページと本文から抽出したリンク先からフィンガープリントを計算"""
+        content = [page.title, page.metadata_type, page.metadata, page.content]
+        return cls(
+            content_hash=_hash_json(content),
+            tags_hash=_hash_json(sorted(set(page.tags))),
+            links_hash=_hash_json(sorted(set(links))),
+        )
+
+
+def _hash_json(value: Any) -> str:
+    """JSONに正規化した値のハッシュ"""
+    raw = json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
@@ -0,0 +1,58 @@
+"""ページネーション"""
+
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+
+from notenest.core.page import Page, PageSummary
+
+# ソート可能なフィールド
+SORT_FIELDS = ("updated_at", "created_at", "title", "slug")
+
+# ソート順
+SORT_ORDERS = ("asc", "desc")
+
+
+@dataclass(frozen=True)
+class PageCursor:
+    """
+    キーセットページネーション用カーソル（updated_at, id）
+
+    直前に返した最後のページの (updated_at, id) を保持し、
+    次のページを OFFSET なしで取得するために使う。
+    """
+
+    updated_at: str  # ISO形式（DBに保存されている文字列そのもの）
+    id: int
+
+    @classmethod
+    def from_page(cls, page: Page | PageSummary) -> "PageCursor":
+        """ページからカーソルを作成"""
+        if page.id is None or page.updated_at is None:
+            raise ValueError("Page id and updated_at are required for a cursor")
+        return cls(updated_at=page.updated_at.isoformat(), id=page.id)
+
+    def encode(self) -> str:
+        """URLに埋め込める文字列にエンコード"""
+        raw = json.dumps([self.updated_at, self.id], separators=(",", ":"))
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "PageCursor":
+        """エンコードされたカーソルを復元"""
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            updated_at, page_id = json.loads(base64.urlsafe_b64decode(padded))
+            datetime.fromisoformat(updated_at)
+            return cls(updated_at=str(updated_at), id=int(page_id))
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid cursor: {token}") from e
+
+
+def validate_sort(sort_by: str, order: str) -> None:
+    """ソート指定のバリデーション"""
+    if sort_by not in SORT_FIELDS:
+        raise ValueError(f"Invalid sort field: {sort_by}")
+    if order not in SORT_ORDERS:
+        raise ValueError(f"Invalid sort order: {order}")
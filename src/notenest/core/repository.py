@@ -1,30 +1,130 @@
 """リポジトリ - ストレージ層とコア機能を統合"""
 
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import ExitStack, contextmanager
 from datetime import datetime
+from functools import partial
 from pathlib import Path
 from typing import Any
 
-from notenest.core.link import Link
+from notenest.core.cache import CacheStats, PageCache
+from notenest.core.graph_analytics import GraphAnalytics
+from notenest.core.link import Backlink, Link
+from notenest.core.link_graph import LinkGraph
+from notenest.core.loader import LoadedPage, ParallelLoader, load_markdown_page
 from notenest.core.metadata import WikiLinkParser
-from notenest.core.page import Page
+from notenest.core.page import Page, PageFingerprint, PageSummary
+from notenest.core.pagination import PageCursor
+from notenest.core.revision import Revision
+from notenest.core.search import PageQuery, SearchHit, SearchWeights
+from notenest.core.sync import ManifestEntry, SyncResult
 from notenest.core.tag import Tag
+from notenest.core.write_behind import WriteBehindQueue
 from notenest.plugins.registry import PluginRegistry, get_global_registry
-from notenest.storage.db_store import DBStore
+from notenest.storage.db_store import ConnectionProfile, DBStore
 from notenest.storage.file_store import FileStore
 
 
 class Repository:
     """ページ、リンク、タグの統合管理"""
 
-    def __init__(self, workspace_path: Path, plugin_registry: PluginRegistry | None = None) -> None:
-        self.file_store = FileStore(workspace_path)
-        self.db_store = DBStore(self.file_store.get_db_path())
+    def __init__(
+        self,
+        workspace_path: Path,
+        plugin_registry: PluginRegistry | None = None,
+        connection_profile: ConnectionProfile | None = None,
+        page_cache_size: int = 512,
+        loader: ParallelLoader | None = None,
+        fsync_policy: str = "batched",
+        write_behind_delay: float | None = None,
+    ) -> None:
+        """
+        Args:
+            workspace_path: ワークスペースディレクトリ
+            plugin_registry: プラグインレジストリ（Noneでグローバルレジストリ）
+            connection_profile: SQLite接続設定
+            page_cache_size: ページキャッシュの最大件数（0で無効）
+            loader: 同期時のファイル読み込みに使うローダー（Noneで呼び出し元のプロセスで逐次処理）
+            fsync_policy: ページファイルの fsync ポリシー（always, batched, never）
+            write_behind_delay: 指定すると update_page の書き込みをこの秒数だけ遅延し、
+                同じページへの連続した更新をまとめる（Noneで即時書き込み）
+        """
+        self.file_store = FileStore(workspace_path, fsync_policy=fsync_policy)
+        self.db_store = DBStore(self.file_store.get_db_path(), connection_profile)
         self.db_store.connect()
         self.plugin_registry = plugin_registry or get_global_registry()
+        self.page_cache = PageCache(page_cache_size)
+        self.loader = loader or ParallelLoader(max_workers=1)
+        self.write_behind = (
+            WriteBehindQueue(self._write_page, write_behind_delay)
+            if write_behind_delay is not None
+            else None
+        )
+        # リンクグラフは初回の問い合わせで構築し、以降はコミットごとに差分更新する。
+        # 構築・更新時の変更カウンタを保持し、他の接続・プロセスのコミットで
+        # カウンタが進んでいれば作り直す
+        self._link_graph: LinkGraph | None = None
+        self._link_graph_counter = -1
+        # コミット待ちのリンク変更 (slug, ページID, リンク先)。削除はページIDがNone
+        self._link_changes: list[tuple[str, int | None, list[str]]] = []
+        # リンクグラフの分析（結果はリンクが変化するまでキャッシュ）
+        self.graph_analytics = GraphAnalytics(lambda: self.link_graph)
+        # 使用回数付きタグ一覧のキャッシュ (読み込み時の変更カウンタ, 一覧)
+        self._tag_cache: tuple[int, list[Tag]] | None = None
 
     def close(self) -> None:
-        """リソースのクリーンアップ"""
-        self.db_store.close()
+        """リソースのクリーンアップ（遅延中の書き込みは反映してから閉じる）"""
+        try:
+            if self.write_behind:
+                self.write_behind.close()
+        finally:
+            self.file_store.flush()
+            self.db_store.close()
+
+    def flush(self) -> None:
+        """遅延中の書き込みを反映し、ページファイルをディスクに書き出す"""
+        if self.write_behind:
+            self.write_behind.flush()
+        self.file_store.flush()
+
+    def cache_stats(self) -> CacheStats:
+        """ページキャッシュの統計"""
+        return self.page_cache.stats()
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        複数の書き込みを1トランザクションにまとめる
+
+        ブロック内のリンク変更は最も外側のブロックのコミット時にリンクグラフへ反映し、
+        ロールバックされた範囲の変更は破棄する。
+
+        Example:
+            with repo.transaction():
+                repo.create_page("a", "A")
+                repo.create_page("b", "B")
+        """
+        outermost = not self.db_store.in_batch
+        # コミット後のリンクグラフ更新まで、他スレッドの書き込みが割り込まないようにする
+        with self.db_store.write_locked():
+            try:
+                with self.db_store.batch():
+                    # 書き込みトランザクション中は他プロセスもコミットできないため、
+                    # ここで読んだカウンタがこのトランザクションの直前の版になる
+                    base = self.db_store.get_change_counter() if outermost else 0
+                    mark = len(self._link_changes)
+                    try:
+                        yield
+                    except BaseException:
+                        del self._link_changes[mark:]
+                        raise
+            except BaseException:
+                if outermost:
+                    self._link_changes.clear()
+                raise
+            if outermost:
+                counter = self.db_store.committed_counter
+                self._apply_link_changes(base, base if counter is None else counter)
 
     # ========== ページ操作 ==========
 
@@ -47,42 +147,46 @@ class Repository:
             metadata=metadata or {},
         )
 
-        # ファイル保存
-        file_path = self.file_store.save_page_file(page)
-        page.file_path = file_path
-
-        # DB保存
-        page_id = self.db_store.save_page(page)
-        page.id = page_id
-
-        # タグ保存
-        if page.tags:
-            self.db_store.save_page_tags(page_id, page.tags)
+        with self.transaction():
+            # ファイル保存
+            file_path = self.file_store.save_page_file(page)
+            page.file_path = file_path
+            self._record_file(file_path)
 
-        # リンク解析・保存
-        links = WikiLinkParser.extract_links(content)
-        if links:
-            self.db_store.save_links(page_id, links)
+            # DB保存（タグ・リンク・検索インデックスを含む）
+            links = WikiLinkParser.extract_links(content)
+            page_id = self._save_page_index(page, links, previous=None)
 
-        # 検索インデックス更新
-        self.db_store.index_page_for_search(page_id, slug, title, content, page.tags)
+            # プラグインフック: ページ作成
+            plugin = self.plugin_registry.get_metadata_plugin(metadata_type)
+            if plugin:
+                plugin.on_page_create(page_id, page.metadata)
 
-        # プラグインフック: ページ作成
-        plugin = self.plugin_registry.get_metadata_plugin(metadata_type)
-        if plugin:
-            plugin.on_page_create(page_id, page.metadata)
+        # コミット後に破棄（書き込み中に他スレッドが読み込んだ内容を残さない）
+        self.page_cache.invalidate(slug)
 
         return page
 
     def get_page(self, slug: str) -> Page | None:
-        """ページを取得"""
+        """ページを取得（ファイルが変化していなければキャッシュから返す）"""
+        if self.write_behind:
+            pending = self.write_behind.get(slug)
+            if pending:
+                return pending
+
+        cached = self.page_cache.get(slug)
+        if cached:
+            return cached
+
         page = self.db_store.get_page_by_slug(slug)
         if not page:
             return None
 
         # ファイルからコンテンツ読み込み
+        entry = None
         if page.file_path and page.file_path.exists():
-            file_page = self.file_store.load_page_file(page.file_path)
+            raw, entry = self.file_store.read_page_file(page.file_path)
+            file_page = self.file_store.parse_page_file(page.file_path, raw.decode("utf-8"))
             page.content = file_page.content
 
         # タグ読み込み
@@ -90,8 +194,60 @@ class Repository:
             tags = self.db_store.get_page_tags(page.id)
             page.tags = [tag.name for tag in tags]
 
+        if entry:
+            self.page_cache.put(page, entry.size, entry.mtime_ns)
+
         return page
 
+    def get_page_revision(self, slug: str) -> Revision | None:
+        """
+        ページの版を取得（本文ファイル・タグは読み込まない）
+
+        本文はファイルから読むため、ファイルの stat が同期マニフェストと一致する
+        （アプリの外で編集されていない）場合だけ、その stat を含めた版を返す。
+
+        Returns:
+            Revision: ページが存在しない、または版を判定できなければNone
+        """
+        if self.write_behind:
+            pending = self.write_behind.get(slug)
+            if pending:
+                if not pending.created_at or not pending.updated_at:
+                    return None
+                fingerprint = PageFingerprint.compute(pending, [])
+                return Revision.of_page(
+                    pending.id, fingerprint, pending.created_at, pending.updated_at
+                )
+
+        page = self.db_store.get_page_by_slug(slug)
+        if not page or not page.id or not page.created_at or not page.updated_at:
+            return None
+        stored = self.db_store.get_page_fingerprint(page.id)
+        if not stored:
+            return None
+
+        file_path = self.file_store.get_page_path(page)
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return None
+        rel_path = self.file_store.get_relative_path(file_path)
+        entry = self.db_store.get_sync_manifest([rel_path]).get(rel_path)
+        if not entry or not entry.matches_stat(stat.st_size, stat.st_mtime_ns):
+            return None
+
+        return Revision.of_page(
+            page.id,
+            stored,
+            page.created_at,
+            page.updated_at,
+            file_state=(stat.st_size, stat.st_mtime_ns),
+        )
+
+    def get_workspace_revision(self) -> Revision:
+        """ワークスペース全体の版（ページ・タグ・リンクのいずれかの変更がコミットされると変わる）"""
+        return self.db_store.get_workspace_revision()
+
     def update_page(
         self,
         slug: str,
@@ -115,154 +271,724 @@ class Repository:
         if metadata is not None:
             page.metadata.update(metadata)
 
+        # 内容・タグ・リンクが保存済みのものと同じなら何も書き込まない
+        fingerprint = PageFingerprint.compute(page, WikiLinkParser.extract_links(page.content))
+        pending = self.write_behind.get(slug) if self.write_behind else None
+        if pending is None and fingerprint == self.db_store.get_page_fingerprint(page.id):
+            return page
+
         page.updated_at = datetime.now()
 
-        # ファイル保存
-        self.file_store.save_page_file(page)
+        # 遅延書き込み: 同じページへの連続した更新は最後の内容だけを書き込む
+        if self.write_behind:
+            self.write_behind.submit(page)
+            return page
 
-        # DB更新
-        self.db_store.save_page(page)
+        self._write_page(page)
 
-        # タグ更新
-        self.db_store.save_page_tags(page.id, page.tags)
+        return page
+
+    def _write_page(self, page: Page) -> None:
+        """更新されたページをファイル・DB・検索インデックスに書き込む"""
+        assert page.id is not None
 
-        # リンク更新
         links = WikiLinkParser.extract_links(page.content)
-        self.db_store.save_links(page.id, links)
+        previous = self.db_store.get_page_fingerprint(page.id)
+        if previous == PageFingerprint.compute(page, links):
+            # 遅延書き込み中に元の内容へ戻された場合
+            return
 
-        # 検索インデックス更新
-        self.db_store.index_page_for_search(page.id, page.slug, page.title, page.content, page.tags)
+        with self.transaction():
+            # ファイル保存
+            page.file_path = self.file_store.save_page_file(page)
+            self._record_file(page.file_path)
 
-        # プラグインフック: ページ更新
-        plugin = self.plugin_registry.get_metadata_plugin(page.metadata_type)
-        if plugin:
-            plugin.on_page_update(page.id, page.metadata)
+            # DB更新（変化したタグ・リンク・検索インデックスのみ）
+            self._save_page_index(page, links, previous)
 
-        return page
+            # プラグインフック: ページ更新
+            plugin = self.plugin_registry.get_metadata_plugin(page.metadata_type)
+            if plugin:
+                plugin.on_page_update(page.id, page.metadata)
+
+        self.page_cache.invalidate(page.slug)
 
     def delete_page(self, slug: str) -> bool:
         """ページを削除"""
+        if self.write_behind:
+            self.write_behind.discard(slug)
+
         page = self.db_store.get_page_by_slug(slug)
         if not page or not page.id:
             return False
 
-        # プラグインフック: ページ削除（削除前に呼び出す）
-        plugin = self.plugin_registry.get_metadata_plugin(page.metadata_type)
-        if plugin:
-            plugin.on_page_delete(page.id)
+        with self.transaction():
+            # プラグインフック: ページ削除（削除前に呼び出す）
+            plugin = self.plugin_registry.get_metadata_plugin(page.metadata_type)
+            if plugin:
+                plugin.on_page_delete(page.id)
 
-        # ファイル削除
-        if page.file_path and page.file_path.exists():
-            self.file_store.delete_page_file(page.file_path)
+            # ファイル削除
+            if page.file_path:
+                if page.file_path.exists():
+                    self.file_store.delete_page_file(page.file_path)
+                rel_path = self.file_store.get_relative_path(page.file_path)
+                self.db_store.delete_manifest_entry(rel_path)
 
-        # DB削除（カスケードでリンク・タグも削除）
-        self.db_store.delete_page(page.id)
+            # DB削除（カスケードでリンク・タグも削除）
+            self.db_store.delete_page(page.id)
+            self._link_changes.append((slug, None, []))
+
+        self.page_cache.invalidate(slug)
 
         return True
 
-    def list_pages(self) -> list[Page]:
-        """全ページをリスト"""
-        pages = self.db_store.get_all_pages()
+    def rename_page(
+        self, old_slug: str, new_slug: str, rewrite_links: bool = True, batch_size: int = 256
+    ) -> Page | None:
+        """
+        ページのslugを変更
 
-        # 各ページのタグを読み込み
-        for page in pages:
-            if page.id:
-                tags = self.db_store.get_page_tags(page.id)
-                page.tags = [tag.name for tag in tags]
+        rewrite_links が True なら [[old_slug]] / [[表示名|old_slug]] を含むページの
+        リンクも書き換える。書き換えるページはリンク先のインデックスから
+        batch_size 件ずつ取得するため、ワークスペース全体は走査しない。
+
+        DBの変更は1トランザクションで行い、ファイルはコミットまで一時ファイルに
+        書き込んでおく（失敗した場合はどのファイルも変更しない）。
+
+        Args:
+            old_slug: 現在のslug
+            new_slug: 新しいslug
+            rewrite_links: 他ページのリンクも書き換えるか
+            batch_size: リンク元ページを一度に読み込む件数
+
+        Returns:
+            Page: 変更後のページ（old_slug のページがなければNone）
+
+        Raises:
+            ValueError: new_slug のページが既に存在する場合
+        """
+        # 遅延中の書き込みを先に反映（書き換え対象のページを最新にする）
+        if self.write_behind:
+            self.write_behind.flush()
+
+        page = self.get_page(old_slug)
+        if not page or not page.id:
+            return None
+        if new_slug == old_slug:
+            return page
+
+        old_path = self.file_store.get_page_path(page)
+        new_path = old_path.with_name(f"{new_slug}.md")
+        if self.db_store.get_page_by_slug(new_slug) or new_path.exists():
+            raise ValueError(f"Page already exists: {new_slug}")
+
+        def replacer(slug: str, display: str) -> str | None:
+            if slug != old_slug:
+                return None
+            return f"[[{new_slug}]]" if display == slug else f"[[{display}|{new_slug}]]"
+
+        staged: list[tuple[Path, Path]] = []  # (一時ファイル, 置き換えるファイル)
+        rewritten: list[str] = []
+        try:
+            with self.transaction():
+                page.slug = new_slug
+                page.file_path = new_path
+                page.updated_at = datetime.now()
+                if rewrite_links:
+                    page.content = WikiLinkParser.replace_links(page.content, replacer)
+                self._stage_page_file(page, staged)
+                self.db_store.delete_manifest_entry(self.file_store.get_relative_path(old_path))
+                self._link_changes.append((old_slug, None, []))
+
+                # slugは検索インデックスにも含まれるため、フィンガープリントによらず再索引
+                links = WikiLinkParser.extract_links(page.content)
+                self._save_page_index(page, links, previous=None)
+
+                plugin = self.plugin_registry.get_metadata_plugin(page.metadata_type)
+                if plugin:
+                    plugin.on_page_update(page.id, page.metadata)
+
+                if rewrite_links:
+                    rewritten = self._rewrite_backlinks(old_slug, replacer, staged, batch_size)
+        except BaseException:
+            for tmp_path, _ in staged:
+                tmp_path.unlink(missing_ok=True)
+            raise
+
+        # コミット後にファイルを置き換え、元のファイルを削除
+        for tmp_path, file_path in staged:
+            self.file_store.install_staged(tmp_path, file_path)
+        self.file_store.delete_page_file(old_path)
+
+        for slug in (old_slug, new_slug, *rewritten):
+            self.page_cache.invalidate(slug)
+
+        return page
+
+    def _rewrite_backlinks(
+        self,
+        target_slug: str,
+        replacer: Callable[[str, str], str | None],
+        staged: list[tuple[Path, Path]],
+        batch_size: int,
+    ) -> list[str]:
+        """target_slug へリンクしているページのリンクを書き換える（トランザクション内で呼ぶ）"""
+        rewritten: list[str] = []
+        after_id = 0
+        while True:
+            sources = self.db_store.get_link_sources(target_slug, after_id, batch_size)
+            if not sources:
+                return rewritten
+            after_id = sources[-1][0]
+
+            for _, slug in sources:
+                page = self.get_page(slug)
+                if not page or not page.id:
+                    continue
+                content = WikiLinkParser.replace_links(page.content, replacer)
+                if content == page.content:
+                    continue
+
+                previous = self.db_store.get_page_fingerprint(page.id)
+                page.content = content
+                page.updated_at = datetime.now()
+                self._stage_page_file(page, staged)
+                self._save_page_index(page, WikiLinkParser.extract_links(content), previous)
+
+                plugin = self.plugin_registry.get_metadata_plugin(page.metadata_type)
+                if plugin:
+                    plugin.on_page_update(page.id, page.metadata)
+                rewritten.append(slug)
+
+    def _stage_page_file(self, page: Page, staged: list[tuple[Path, Path]]) -> None:
+        """ページファイルの新しい内容を一時ファイルに書き込み、マニフェストに記録"""
+        file_path = self.file_store.get_page_path(page)
+        tmp_path = self.file_store.stage_write(file_path, self.file_store.render_page_file(page))
+        staged.append((tmp_path, file_path))
+
+        # rename では mtime が変わらないため、一時ファイルの状態をそのまま記録できる
+        _, entry = self.file_store.read_page_file(tmp_path)
+        entry.path = self.file_store.get_relative_path(file_path)
+        self.db_store.save_manifest_entry(entry)
+
+    def list_pages(
+        self,
+        limit: int | None = None,
+        offset: int = 0,
+        sort_by: str = "updated_at",
+        order: str = "desc",
+        cursor: str | None = None,
+    ) -> list[Page]:
+        """
+        ページをリスト（ソート・ページネーションはSQL側で実行）
+
+        Args:
+            limit: 取得件数（Noneで全件）
+            offset: 読み飛ばす件数
+            sort_by: ソートキー（updated_at, created_at, title, slug）
+            order: asc または desc
+            cursor: 前回の結果から得たカーソル（指定時は offset を使わない）
+
+        Returns:
+            list: ページリスト
+        """
+        after = PageCursor.decode(cursor) if cursor else None
+        pages = self.db_store.get_pages(
+            limit=limit, offset=0 if after else offset, sort_by=sort_by, order=order, after=after
+        )
+
+        # 全ページのタグを一括で読み込み
+        self._hydrate_tags(pages)
 
         return pages
 
-    def sync_from_files(self) -> None:
-        """ファイルシステムからDBを同期"""
-        # 全マークダウンファイルを走査
-        for file_path in self.file_store.list_page_files():
+    def count_pages(self) -> int:
+        """ページ総数"""
+        return self.db_store.count_pages()
+
+    @staticmethod
+    def next_cursor(pages: Sequence[Page | PageSummary], limit: int | None) -> str | None:
+        """list_pages(sort_by="updated_at") の続きを取得するためのカーソル"""
+        if not pages or limit is None or len(pages) < limit:
+            return None
+        return PageCursor.from_page(pages[-1]).encode()
+
+    def list_page_summaries(
+        self,
+        limit: int | None = None,
+        offset: int = 0,
+        sort_by: str = "updated_at",
+        order: str = "desc",
+        cursor: str | None = None,
+    ) -> list[PageSummary]:
+        """ページ概要をリスト（引数は list_pages と同じ。本文・メタデータを読み込まない）"""
+        after = PageCursor.decode(cursor) if cursor else None
+        summaries = self.db_store.get_page_summaries(
+            limit=limit, offset=0 if after else offset, sort_by=sort_by, order=order, after=after
+        )
+        self._hydrate_tags(summaries)
+        return summaries
+
+    def _hydrate_tags(self, pages: Sequence[Page | PageSummary]) -> None:
+        """ページリストのタグを1クエリでまとめて読み込み"""
+        tags_by_page = self.db_store.get_tags_for_pages(
+            [page.id for page in pages if page.id is not None]
+        )
+        for page in pages:
+            if page.id is not None:
+                page.tags = tags_by_page.get(page.id, [])
+
+    def sync_from_files(self, commit_every: int | None = None) -> SyncResult:
+        """
+        ファイルシステムからDBを差分同期
+
+        同期マニフェスト（サイズ・mtime・内容ハッシュ）と比較し、追加・変更された
+        ファイルだけを解析してDBに反映する。ディスクから消えたファイルのページは
+        DBから削除する。同期時にマークダウンファイル自体は書き換えない。
+
+        ファイルの読み込み・解析は self.loader で行い（並列ローダーを渡した場合は
+        ワーカープロセスに分散）、DBへの書き込みは呼び出し元のスレッドだけで行う。
+
+        Args:
+            commit_every: 指定したファイル数ごとにコミットする（Noneなら最後の1回のみ）
+
+        Returns:
+            SyncResult: 追加・更新・削除・スキップ件数
+        """
+        if commit_every is not None and commit_every < 1:
+            raise ValueError(f"commit_every must be positive: {commit_every}")
+
+        result = SyncResult()
+        manifest = self.db_store.get_sync_manifest()
+        file_paths = sorted(self.file_store.list_page_files())
+        seen_paths = {self.file_store.get_relative_path(path) for path in file_paths}
+        self._sync_files(file_paths, manifest.keys() - seen_paths, manifest, result, commit_every)
+
+        if result.changed:
+            self.page_cache.clear()
+        return result
+
+    def sync_paths(self, paths: Iterable[Path]) -> SyncResult:
+        """
+        指定したファイルだけをDBに同期（ファイル監視からの差分反映用）
+
+        存在するファイルは sync_from_files と同じ基準で変更を判定して取り込み、
+        存在しないファイルはそのページをDBから削除する。pages/ 配下の
+        マークダウンファイル以外は無視する。
+
+        Args:
+            paths: 変更があったファイルのパス
+
+        Returns:
+            SyncResult: 追加・更新・削除・スキップ件数
+        """
+        rel_paths: dict[Path, str] = {}
+        for path in paths:
+            if path.suffix != ".md" or not path.is_relative_to(self.file_store.pages_dir):
+                continue
+            rel_paths[path] = self.file_store.get_relative_path(path)
+
+        result = SyncResult()
+        manifest = self.db_store.get_sync_manifest(list(rel_paths.values()))
+        file_paths = sorted(path for path in rel_paths if path.is_file())
+        removed_paths = {
+            rel_path
+            for path, rel_path in rel_paths.items()
+            if rel_path in manifest and not path.exists()
+        }
+        self._sync_files(file_paths, removed_paths, manifest, result, None)
+
+        if result.changed:
+            for path in rel_paths:
+                self.page_cache.invalidate(path.stem)
+        return result
+
+    def _sync_files(
+        self,
+        file_paths: Sequence[Path],
+        removed_paths: Iterable[str],
+        manifest: dict[str, ManifestEntry],
+        result: SyncResult,
+        commit_every: int | None,
+    ) -> None:
+        """sync_from_files / sync_paths の本体"""
+        to_load: list[Path] = []
+
+        # stat が前回と同じファイルは読み込み自体を省略
+        for file_path in file_paths:
             try:
-                page = self.file_store.load_page_file(file_path)
-
-                # DB に存在するか確認
-                existing = self.db_store.get_page_by_slug(page.slug)
-
-                if existing:
-                    # 更新
-                    page.id = existing.id
-                    self.update_page(
-                        page.slug,
-                        title=page.title,
-                        content=page.content,
-                        tags=page.tags,
-                        metadata=page.metadata,
-                    )
-                else:
-                    # 新規作成
-                    self.create_page(
-                        slug=page.slug,
-                        title=page.title,
-                        content=page.content,
-                        tags=page.tags,
-                        metadata_type=page.metadata_type,
-                        metadata=page.metadata,
-                    )
-            except Exception as e:
+                previous = manifest.get(self.file_store.get_relative_path(file_path))
+                stat = file_path.stat()
+            except OSError as e:
                 print(f"Error syncing {file_path}: {e}")
+                result.errors.append(str(file_path))
+                continue
+
+            if previous and previous.matches_stat(stat.st_size, stat.st_mtime_ns):
+                result.unchanged += 1
+            else:
+                to_load.append(file_path)
+
+        results = self.loader.map(partial(load_markdown_page, self.file_store), to_load)
+
+        with ExitStack() as stack:
+            stack.enter_context(self.transaction())
+
+            for applied, loaded in enumerate(results, start=1):
+                if loaded.value is None:
+                    print(f"Error syncing {loaded.path}: {loaded.error}")
+                    result.errors.append(str(loaded.path))
+                else:
+                    self._apply_loaded_page(loaded.value, manifest, result)
+
+                # 指定件数ごとにコミットして次のトランザクションを開始
+                if commit_every and applied % commit_every == 0:
+                    stack.close()
+                    stack.enter_context(self.transaction())
+
+            # ディスクから消えたファイルのページを削除
+            for rel_path in removed_paths:
+                self.db_store.delete_manifest_entry(rel_path)
+                if self._purge_missing_page(Path(rel_path).stem):
+                    result.deleted += 1
+
+    def _apply_loaded_page(
+        self, loaded: LoadedPage, manifest: dict[str, ManifestEntry], result: SyncResult
+    ) -> None:
+        """読み込み済みのファイル1件をDBに反映"""
+        entry = loaded.entry
+        previous = manifest.get(entry.path)
+
+        # touch されただけで内容が同じ場合はマニフェストのみ更新
+        if previous and previous.content_hash == entry.content_hash:
+            self.db_store.save_manifest_entry(entry)
+            result.unchanged += 1
+            return
+
+        page = loaded.page
+        try:
+            existing = self.db_store.get_page_by_slug(page.slug)
+            # ファイル単位のSAVEPOINT: 失敗したファイルの変更だけを巻き戻す
+            with self.transaction():
+                self._apply_file_page(page, existing, loaded.links)
+                self.db_store.save_manifest_entry(entry)
+        except Exception as e:
+            print(f"Error syncing {page.file_path}: {e}")
+            result.errors.append(str(page.file_path))
+            return
+
+        if existing:
+            result.updated += 1
+        else:
+            result.added += 1
+
+    def _apply_file_page(self, page: Page, existing: Page | None, links: list[str]) -> None:
+        """ファイルから読み込んだページをDBに反映（ファイルは書き換えない）"""
+        previous = None
+        if existing:
+            page.id = existing.id
+            previous = self.db_store.get_page_fingerprint(existing.id) if existing.id else None
+
+        page_id = self._save_page_index(page, links, previous)
+
+        # プラグインフック
+        plugin = self.plugin_registry.get_metadata_plugin(page.metadata_type)
+        if plugin:
+            if existing:
+                plugin.on_page_update(page_id, page.metadata)
+            else:
+                plugin.on_page_create(page_id, page.metadata)
+
+    def _save_page_index(
+        self, page: Page, links: list[str], previous: PageFingerprint | None
+    ) -> int:
+        """
+        pages行を保存し、前回から変化したタグ・リンク・検索インデックスだけを更新
+
+        Args:
+            page: 保存するページ（新規の場合 id は None）
+            links: 本文から抽出したリンク先slug
+            previous: 保存済みのフィンガープリント（新規・未計算ならNone）
+
+        Returns:
+            int: ページID
+        """
+        fingerprint = PageFingerprint.compute(page, links)
+        page_id = self.db_store.save_page(page, fingerprint)
+        page.id = page_id
+
+        tags_changed = previous is None or previous.tags_hash != fingerprint.tags_hash
+        if tags_changed:
+            self.db_store.save_page_tags(page_id, page.tags)
+
+        if previous is None or previous.links_hash != fingerprint.links_hash:
+            self.db_store.save_links(page_id, links)
+            self._link_changes.append((page.slug, page_id, links))
+
+        # 検索インデックスはタイトル・本文・タグを含む
+        if tags_changed or previous is None or previous.content_hash != fingerprint.content_hash:
+            self.db_store.index_page_for_search(
+                page_id, page.slug, page.title, page.content, page.tags
+            )
+
+        return page_id
+
+    def _purge_missing_page(self, slug: str) -> bool:
+        """ファイルが存在しないページをDBから削除"""
+        page = self.db_store.get_page_by_slug(slug)
+        if not page or not page.id:
+            return False
+
+        # 別ディレクトリへ移動されただけの場合は削除しない
+        if page.file_path and page.file_path.exists():
+            return False
+
+        plugin = self.plugin_registry.get_metadata_plugin(page.metadata_type)
+        if plugin:
+            plugin.on_page_delete(page.id)
+
+        self.db_store.delete_page(page.id)
+        self._link_changes.append((slug, None, []))
+        return True
+
+    def _record_file(self, file_path: Path) -> None:
+        """書き込んだファイルの状態を同期マニフェストに記録"""
+        _, entry = self.file_store.read_page_file(file_path)
+        self.db_store.save_manifest_entry(entry)
 
     # ========== リンク操作 ==========
+    #
+    # リンクの問い合わせはDBではなくメモリ上のリンクグラフから答える。
+    # 返す Link の id（linksテーブルの行ID）は常にNone。
+
+    @property
+    def link_graph(self) -> LinkGraph:
+        """
+        ページ間リンクのインメモリインデックス
+
+        初回アクセス時と、他の接続・プロセスのコミットで変更カウンタが進んでいる場合に
+        DBから構築する。
+        """
+        counter = self.db_store.get_change_counter()
+        graph = self._link_graph
+        if graph is not None and self._link_graph_counter == counter:
+            return graph
+
+        # ライターロックだけを保持して構築し、構築中のコミットが反映漏れしないようにする
+        # （読み取りは読み取り接続で行い、SQLiteの書き込みトランザクションは開始しない）
+        in_transaction = self.db_store.in_batch
+        with self.db_store.write_locked():
+            counter = self.db_store.get_change_counter()
+            graph = self._link_graph
+            if graph is None or self._link_graph_counter != counter:
+                # カウンタを先に読むため、構築中に他プロセスがコミットしても次回作り直される
+                graph = LinkGraph.build(*self.db_store.get_link_graph_data())
+                # 未コミットの変更を含むため、トランザクション中に構築したものは保持しない
+                if not in_transaction:
+                    self._link_graph, self._link_graph_counter = graph, counter
+        return graph
+
+    def _apply_link_changes(self, base: int, counter: int) -> None:
+        """
+        コミットしたリンク変更をリンクグラフに反映
+
+        Args:
+            base: コミットしたトランザクションの直前の変更カウンタ
+            counter: コミット後の変更カウンタ
+        """
+        changes, self._link_changes = self._link_changes, []
+        graph = self._link_graph
+        if graph is None:
+            return
+        if self._link_graph_counter != base:
+            # 他の接続・プロセスのコミットを反映していないため、次の問い合わせで作り直す
+            self._link_graph = None
+            return
+        for slug, page_id, targets in changes:
+            if page_id is None:
+                graph.remove_page(slug)
+            else:
+                graph.set_page(slug, page_id, targets)
+        self._link_graph_counter = counter
 
     def get_outgoing_links(self, slug: str) -> list[Link]:
         """ページからの発リンクを取得"""
-        page = self.db_store.get_page_by_slug(slug)
-        if not page or not page.id:
+        graph = self.link_graph
+        page_id = graph.page_id(slug)
+        if page_id is None:
             return []
 
-        return self.db_store.get_outgoing_links(page.id)
+        return [
+            Link(source_page_id=page_id, source_slug=slug, target_slug=target)
+            for target in graph.outgoing(slug)
+        ]
 
     def get_backlinks(self, slug: str) -> list[Link]:
         """ページへのバックリンクを取得"""
-        return self.db_store.get_backlinks(slug)
+        graph = self.link_graph
+        return [
+            Link(source_page_id=graph.page_id(source), source_slug=source, target_slug=slug)
+            for source in graph.backlinks(slug)
+        ]
+
+    def get_backlink_pages(
+        self, slug: str, limit: int | None = 50, offset: int = 0
+    ) -> list[Backlink]:
+        """
+        slug にリンクしているページの概要を、リンク周辺の抜粋付きでslug順に取得
+
+        リンク元の本文ファイルは読まず、1クエリで概要と検索用本文を取得する。
+
+        Args:
+            slug: リンク先slug
+            limit: 取得件数（Noneで全件）
+            offset: 読み飛ばす件数
+
+        Returns:
+            list: リンク元ページごとの Backlink（タグ読み込み済み）
+        """
+        backlinks = self.db_store.get_backlink_pages(slug, limit=limit, offset=offset)
+        self._hydrate_tags([backlink.page for backlink in backlinks])
+        return backlinks
+
+    def count_backlink_pages(self, slug: str) -> int:
+        """slug にリンクしているページ数"""
+        return self.db_store.count_link_sources(slug)
 
     def get_broken_links(self) -> list[Link]:
-        """リンク切れを取得"""
-        all_pages = self.db_store.get_all_pages()
-        existing_slugs = {page.slug for page in all_pages}
+        """リンク切れを取得（未作成ページへのリンク）"""
+        graph = self.link_graph
+        return [
+            Link(source_page_id=graph.page_id(source), source_slug=source, target_slug=target)
+            for source, target in graph.broken_links()
+        ]
 
-        broken_links = []
-        for page in all_pages:
-            if not page.id:
-                continue
-            outgoing = self.db_store.get_outgoing_links(page.id)
-            for link in outgoing:
-                if link.target_slug not in existing_slugs:
-                    broken_links.append(link)
+    def get_orphan_pages(self) -> list[str]:
+        """どのページからもリンクされていないページのslug"""
+        return self.link_graph.orphans()
 
-        return broken_links
+    def get_dangling_targets(self) -> dict[str, int]:
+        """リンクされているが未作成のslugと、そのリンク元の数"""
+        return self.link_graph.dangling_targets()
 
     # ========== タグ操作 ==========
 
-    def get_all_tags(self) -> list[Tag]:
-        """全タグを取得"""
-        return self.db_store.get_all_tags()
+    def get_all_tags(self, limit: int | None = None, offset: int = 0) -> list[Tag]:
+        """
+        全タグを使用回数付きで取得（使用回数の降順、同数は名前順）
+
+        一覧は変更カウンタ（他の接続・プロセスのコミットでも進む）が変わるまでキャッシュする。
+
+        Args:
+            limit: 取得件数（Noneで全件。上位k件の取得に使う）
+            offset: 先頭から読み飛ばす件数
+        """
+        end = None if limit is None else offset + limit
+        if self.db_store.in_batch:
+            # トランザクション内では未コミットの変更を含むDBから読み、キャッシュは使わない
+            return self.db_store.get_all_tags()[offset:end]
+
+        counter = self.db_store.get_change_counter()
+        cached = self._tag_cache
+        if cached is not None and cached[0] == counter:
+            return cached[1][offset:end]
+
+        # カウンタを先に読むため、読み込み中にコミットがあればこのキャッシュは使われない
+        tags = self.db_store.get_all_tags()
+        self._tag_cache = (counter, tags)
+        return tags[offset:end]
 
     def get_pages_by_tag(self, tag_name: str) -> list[Page]:
         """タグでページを検索"""
         pages = self.db_store.get_pages_by_tag(tag_name)
 
-        # 各ページのタグを読み込み
-        for page in pages:
-            if page.id:
-                tags = self.db_store.get_page_tags(page.id)
-                page.tags = [tag.name for tag in tags]
+        # 全ページのタグを一括で読み込み
+        self._hydrate_tags(pages)
 
         return pages
 
+    def get_page_summaries_by_tag(self, tag_name: str) -> list[PageSummary]:
+        """タグでページ概要を検索"""
+        return self.query_page_summaries(PageQuery(tags=[tag_name]))
+
     # ========== 検索操作 ==========
 
     def search_pages(self, query: str) -> list[Page]:
         """全文検索"""
         pages = self.db_store.search_pages(query)
 
-        # 各ページのタグを読み込み
-        for page in pages:
-            if page.id:
-                tags = self.db_store.get_page_tags(page.id)
-                page.tags = [tag.name for tag in tags]
+        # 全ページのタグを一括で読み込み
+        self._hydrate_tags(pages)
+
+        return pages
 
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        weights: SearchWeights | None = None,
+    ) -> list[SearchHit]:
+        """
+        ランキング付き全文検索
+
+        本文は読み込まず、スコア・抜粋・一致位置と概要だけを返す。
+
+        Args:
+            query: FTS5のクエリ
+            limit: 取得件数（上位 limit 件）
+            offset: 読み飛ばす件数
+            weights: bm25 の列ごとの重み（Noneでタイトル・slug重視の既定値）
+
+        Returns:
+            list: 検索結果（タグ読み込み済み）
+        """
+        hits = self.db_store.search_hits(query, limit=limit, offset=offset, weights=weights)
+        self._hydrate_tags([hit.page for hit in hits])
+        return hits
+
+    def get_search_tokenizer(self) -> str:
+        """全文検索のトークナイザープロファイル（porter, trigram）"""
+        return self.db_store.search_tokenizer
+
+    def set_search_tokenizer(self, tokenizer: str) -> None:
+        """
+        全文検索のトークナイザープロファイルを変更（インデックスを再構築）
+
+        日本語など分かち書きしない言語の部分一致検索には trigram を使う。
+        設定はワークスペースのDBに保存される。
+        """
+        self.db_store.set_search_tokenizer(tokenizer)
+
+    def rebuild_search_index(self) -> None:
+        """全文検索インデックスを再構築"""
+        self.db_store.rebuild_search_index()
+
+    def optimize_search_index(self, merge_pages: int | None = None) -> None:
+        """全文検索インデックスを最適化（merge_pages 指定時は段階的マージ）"""
+        self.db_store.optimize_search_index(merge_pages)
+
+    def query_pages(self, query: PageQuery) -> list[Page]:
+        """
+        複合検索（絞り込み・ソート・ページネーションをDB側で実行）
+
+        Args:
+            query: 検索クエリ
+
+        Returns:
+            list: 検索結果（タグ読み込み済み）
+        """
+        pages = self.db_store.query_pages(query)
+        self._hydrate_tags(pages)
         return pages
+
+    def query_page_summaries(self, query: PageQuery) -> list[PageSummary]:
+        """複合検索の結果をページ概要として取得"""
+        summaries = self.db_store.query_page_summaries(query)
+        self._hydrate_tags(summaries)
+        return summaries
+
+    def count_query(self, query: PageQuery) -> int:
+        """検索クエリに一致するページ数"""
+        return self.db_store.count_query_pages(query)
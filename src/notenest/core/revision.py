@@ -0,0 +1,53 @@
+"""リソースの版（HTTPの条件付きリクエスト用）"""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+
+from notenest.core.page import PageFingerprint
+
+
+@dataclass(frozen=True)
+class Revision:
+    """
+    ページやページ一覧の版
+
+    tag は内容が変わると必ず変わる文字列（ETag の元）、modified_at は
+    最終更新日時（Last-Modified の元）。
+    """
+
+    tag: str
+    modified_at: datetime | None = None
+
+    @classmethod
+    def of_page(
+        cls,
+        page_id: int | None,
+        fingerprint: PageFingerprint,
+        created_at: datetime,
+        updated_at: datetime,
+        file_state: tuple[int, int] | None = None,
+    ) -> "Revision":
+        """
+        ページのフィンガープリントと日時から版を作る（タグ・本文・日時のどれが変わっても変わる）
+
+        Args:
+            file_state: 本文を読むファイルの (サイズ, mtime_ns)。ファイルが変わると版も変わる
+        """
+        parts = [
+            str(page_id),
+            fingerprint.content_hash,
+            fingerprint.tags_hash,
+            created_at.isoformat(),
+            updated_at.isoformat(),
+            str(file_state),
+        ]
+        digest = hashlib.blake2b("\0".join(parts).encode("utf-8"), digest_size=16).hexdigest()
+        return cls(digest, updated_at)
+
+    @classmethod
+    def of_workspace(
+        cls, workspace_id: str, change_counter: int, changed_at: datetime
+    ) -> "Revision":
+        """ワークスペース全体の版（DBがコミットされるたびに増える変更カウンタから作る）"""
+        return cls(f"{workspace_id}-{change_counter}", changed_at)
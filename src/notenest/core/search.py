@@ -1,11 +1,11 @@
 """高度な検索機能"""
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import Any
 
-from notenest.core.page import Page
+from notenest.core.page import Page, PageSummary
 
 
 class SearchOperator(Enum):
@@ -42,8 +42,66 @@ class DateRangeFilter:
     end_date: datetime | None = None
 
 
+@dataclass
+class PageQuery:
+    """
+    DBで実行する検索クエリ
+
+    AdvancedSearch.complex_search と同じ条件を表し、ストレージ層で1本のSQLに
+    コンパイルされる（絞り込み・ソート・LIMIT/OFFSETをすべてDB側で実行）。
+    """
+
+    text_query: str | None = None  # タイトル・本文の部分一致（大文字小文字を区別しない）
+    fts_query: str | None = None  # 全文検索（FTS5 MATCH 式）
+    tags: list[str] | None = None
+    match_all_tags: bool = False  # True=全タグに一致, False=いずれかのタグに一致
+    metadata_type: str | None = None
+    metadata_filters: dict[str, Any] | None = None
+    date_range: DateRangeFilter | None = None
+    date_field: str = "updated_at"  # created_at or updated_at
+    sort_by: str = "updated_at"  # created_at, updated_at, title, slug, rank（fts_query 指定時）
+    reverse: bool = True
+    limit: int | None = None
+    offset: int = 0
+
+
+@dataclass(frozen=True)
+class SearchWeights:
+    """全文検索のランキング（bm25）における列ごとの重み"""
+
+    slug: float = 5.0
+    title: float = 10.0
+    content: float = 1.0
+    tags: float = 3.0
+
+    def to_rank_function(self) -> str:
+        """FTS5 の rank 設定（pages_fts の列順: slug, title, content, tags）"""
+        weights = (self.slug, self.title, self.content, self.tags)
+        return f"bm25({', '.join(repr(float(weight)) for weight in weights)})"
+
+
+@dataclass
+class SearchHit:
+    """
+    ランキング付きの検索結果
+
+    snippet は本文の一致箇所周辺の抜粋。highlights / title_highlights は
+    snippet / page.title 内で一致した範囲の (開始, 終了) 文字オフセット。
+    """
+
+    page: PageSummary
+    score: float  # 関連度（大きいほど関連が高い）
+    snippet: str = ""
+    highlights: list[tuple[int, int]] = field(default_factory=list)
+    title_highlights: list[tuple[int, int]] = field(default_factory=list)
+
+
 class AdvancedSearch:
-    """高度な検索機能"""
+    """
+    高度な検索機能（読み込み済みページリストに対するメモリ内フィルタ）
+
+    DB全体を対象にする場合は PageQuery と Repository.query_pages を使う。
+    """
 
     @staticmethod
     def filter_by_date_range(
@@ -0,0 +1,39 @@
+"""ファイル同期モデル"""
+
+from dataclasses import dataclass, field
+
+
+@dataclass
+class ManifestEntry:
+    """同期マニフェストのエントリ（前回同期時のファイル状態）"""
+
+    path: str  # pages/ からの相対パス（POSIX形式）
+    size: int
+    mtime_ns: int
+    content_hash: str
+
+    def matches_stat(self, size: int, mtime_ns: int) -> bool:
+        """stat情報が前回同期時から変化していないか"""
+        return self.size == size and self.mtime_ns == mtime_ns
+
+
+@dataclass
+class SyncResult:
+    """sync_from_files の実行結果"""
+
+    added: int = 0  # 新規に取り込んだファイル数
+    updated: int = 0  # 内容が変化して再インデックスしたファイル数
+    deleted: int = 0  # ディスクから消えてDBから削除したページ数
+    unchanged: int = 0  # 変化がなくスキップしたファイル数
+    errors: list[str] = field(default_factory=list)  # 同期に失敗したファイルパス
+
+    @property
+    def changed(self) -> bool:
+        """DBに何らかの変更があったか"""
+        return bool(self.added or self.updated or self.deleted)
+
+    def __str__(self) -> str:
+        return (
+            f"added={self.added} updated={self.updated} deleted={self.deleted} "
+            f"unchanged={self.unchanged} errors={len(self.errors)}"
+        )
@@ -0,0 +1,303 @@
+"""ファイル監視"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Protocol
+
+from notenest.core.repository import Repository
+from notenest.core.sync import SyncResult
+
+# inotify のイベントマスク（<sys/inotify.h>）
+_IN_ATTRIB = 0x00000004
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_DELETE_SELF = 0x00000400
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_ISDIR = 0x40000000
+
+_WATCH_MASK = (
+    _IN_ATTRIB
+    | _IN_CLOSE_WRITE
+    | _IN_MOVED_FROM
+    | _IN_MOVED_TO
+    | _IN_CREATE
+    | _IN_DELETE
+    | _IN_DELETE_SELF
+    | _IN_ONLYDIR
+)
+
+# struct inotify_event のヘッダ（wd, mask, cookie, len）
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class _Backend(Protocol):
+    """変更検出の実装"""
+
+    def poll(self, timeout: float) -> set[Path] | None:
+        """
+        最大 timeout 秒待って変更されたパスを返す
+
+        Returns:
+            set: 変更（作成・更新・削除）されたファイルパス。
+                 None の場合は個別のパスを特定できないため全体の再スキャンが必要
+        """
+        ...
+
+    def close(self) -> None:
+        """リソースを解放"""
+        ...
+
+
+class _InotifyBackend:
+    """Linux の inotify による変更検出（サブディレクトリも監視）"""
+
+    def __init__(self, root: Path) -> None:
+        libc_name = ctypes.util.find_library("c") or "libc.so.6"
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+        self._fd = fd
+        self._dirs: dict[int, Path] = {}
+        try:
+            self._watch_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def _watch(self, directory: Path) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), str(directory))
+        self._dirs[wd] = directory
+
+    def _watch_tree(self, root: Path) -> None:
+        self._watch(root)
+        for dirpath, _, _ in os.walk(root):
+            if Path(dirpath) != root:
+                self._watch(Path(dirpath))
+
+    def poll(self, timeout: float) -> set[Path] | None:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        changed: set[Path] = set()
+        rescan = False
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, name_len = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset : offset + name_len].rstrip(b"\0"))
+            offset += name_len
+
+            if mask & _IN_Q_OVERFLOW:
+                rescan = True
+                continue
+            if mask & _IN_IGNORED:
+                self._dirs.pop(wd, None)
+                continue
+
+            directory = self._dirs.get(wd)
+            if directory is None or not name:
+                continue
+            path = directory / name
+
+            if mask & _IN_ISDIR:
+                if mask & (_IN_CREATE | _IN_MOVED_TO):
+                    # 監視を追加する前に作られたファイルも拾う
+                    try:
+                        self._watch_tree(path)
+                    except OSError:
+                        rescan = True
+                    changed.update(path.glob("**/*.md"))
+                elif mask & _IN_MOVED_FROM:
+                    # 中身のファイルはイベントが来ないので全体を再スキャン
+                    rescan = True
+            elif path.suffix == ".md":
+                changed.add(path)
+
+        return None if rescan else changed
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+class _PollingBackend:
+    """ファイルのサイズ・mtimeを定期的に比較する変更検出"""
+
+    def __init__(self, root: Path, interval: float) -> None:
+        self._root = root
+        self._interval = interval
+        self._snapshot = self._scan()
+        self._last_scan = time.monotonic()
+
+    def _scan(self) -> dict[Path, tuple[int, int]]:
+        snapshot: dict[Path, tuple[int, int]] = {}
+        for path in self._root.glob("**/*.md"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            snapshot[path] = (stat.st_size, stat.st_mtime_ns)
+        return snapshot
+
+    def poll(self, timeout: float) -> set[Path] | None:
+        remaining = self._interval - (time.monotonic() - self._last_scan)
+        if remaining > 0:
+            time.sleep(min(timeout, remaining))
+            if remaining > timeout:
+                return set()
+
+        snapshot = self._scan()
+        self._last_scan = time.monotonic()
+        previous, self._snapshot = self._snapshot, snapshot
+        return {
+            path
+            for path in previous.keys() | snapshot.keys()
+            if previous.get(path) != snapshot.get(path)
+        }
+
+    def close(self) -> None:
+        pass
+
+
+class WorkspaceWatcher:
+    """
+    pages/ 配下の変更を監視してDBに反映するバックグラウンドスレッド
+
+    Linux では inotify を使い、利用できない環境ではポーリングに切り替える。
+    イベントは debounce 秒間途切れるまでまとめてから、変更されたファイルだけを
+    Repository.sync_paths で反映する（個別に特定できない場合のみ全体を再同期）。
+    """
+
+    def __init__(
+        self,
+        repository: Repository,
+        on_change: Callable[[SyncResult], None] | None = None,
+        debounce: float = 0.2,
+        poll_interval: float = 1.0,
+        use_inotify: bool = True,
+    ) -> None:
+        """
+        Args:
+            repository: 同期先のリポジトリ
+            on_change: DBに変更を反映した後に監視スレッドから呼ばれるコールバック
+            debounce: 最後のイベントから反映までの待ち時間（秒）
+            poll_interval: ポーリング時のスキャン間隔（秒）
+            use_inotify: Falseなら常にポーリングを使う
+        """
+        self.repository = repository
+        self.on_change = on_change
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._backend: _Backend | None = None
+
+    @property
+    def is_running(self) -> bool:
+        """監視中か"""
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def backend_name(self) -> str | None:
+        """使用中の変更検出方式（inotify / polling）"""
+        if isinstance(self._backend, _InotifyBackend):
+            return "inotify"
+        if isinstance(self._backend, _PollingBackend):
+            return "polling"
+        return None
+
+    def start(self) -> None:
+        """監視スレッドを開始"""
+        if self.is_running:
+            return
+
+        self._backend = self._create_backend(self.repository.file_store.pages_dir)
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="notenest-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """監視スレッドを停止（保留中の変更は反映してから終了）"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._backend is not None:
+            self._backend.close()
+            self._backend = None
+
+    def _create_backend(self, root: Path) -> _Backend:
+        if self.use_inotify and sys.platform.startswith("linux"):
+            try:
+                return _InotifyBackend(root)
+            except (OSError, AttributeError):
+                # inotify が使えない（上限超過・非対応のlibcなど）場合はポーリング
+                pass
+        return _PollingBackend(root, self.poll_interval)
+
+    def _run(self) -> None:
+        assert self._backend is not None
+        pending: set[Path] = set()
+        rescan = False
+        last_event = 0.0
+
+        while not self._stop.is_set():
+            changed = self._backend.poll(self.debounce if pending or rescan else 0.5)
+            if changed is None:
+                rescan = True
+                last_event = time.monotonic()
+            elif changed:
+                pending |= changed
+                last_event = time.monotonic()
+
+            if (pending or rescan) and time.monotonic() - last_event >= self.debounce:
+                self._flush(pending, rescan)
+                pending = set()
+                rescan = False
+
+        if pending or rescan:
+            self._flush(pending, rescan)
+
+    def _flush(self, paths: set[Path], rescan: bool) -> None:
+        """溜まった変更をDBに反映"""
+        try:
+            if rescan:
+                result = self.repository.sync_from_files()
+            else:
+                result = self.repository.sync_paths(paths)
+        except Exception as e:
+            print(f"Error applying file changes: {e}")
+            return
+
+        if self.on_change and (result.changed or result.errors):
+            try:
+                self.on_change(result)
+            except Exception as e:
+                print(f"Error in watcher callback: {e}")
@@ -0,0 +1,154 @@
+"""ページ書き込みの遅延キュー"""
+
+import copy
+import threading
+import time
+from collections.abc import Callable
+
+from notenest.core.page import Page
+
+# 書き込みに失敗したページを再試行するまでの待ち時間（秒）。失敗が続くと倍に延ばす
+_RETRY_DELAY = 0.5
+_MAX_RETRY_DELAY = 30.0
+
+
+class WriteBehindQueue:
+    """
+    同じページへの連続した保存をまとめて遅延実行するキュー
+
+    submit したページは delay 秒後にバックグラウンドスレッドで書き込む。
+    書き込み前に同じslugが再度 submit された場合は最新の内容だけを書き込む。
+    待ち時間は最初の submit から数えるため、保存が続いても delay 秒以上は遅れない。
+
+    書き込みに失敗したページは破棄せず、間隔を延ばしながら再試行する。
+    失敗したままのページがあれば flush() / close() がその例外を送出する。
+    """
+
+    def __init__(self, write: Callable[[Page], None], delay: float = 0.5) -> None:
+        """
+        Args:
+            write: ページを実際に書き込む関数
+            delay: 最初の submit から書き込みまでの待ち時間（秒）
+        """
+        self._write = write
+        self.delay = delay
+        self._pending: dict[str, tuple[Page, float]] = {}  # slug -> (ページ, 書き込み期限)
+        self._inflight: dict[str, Page] = {}  # 書き込み中のページ
+        self._errors: dict[str, tuple[Exception, int]] = {}  # slug -> (直近の例外, 連続失敗回数)
+        self._cond = threading.Condition()
+        # 書き込みを直列化して、古い内容が新しい内容を上書きしないようにする
+        self._write_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+    def submit(self, page: Page) -> None:
+        """ページの書き込みを予約"""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("WriteBehindQueue is closed")
+
+            previous = self._pending.get(page.slug)
+            deadline = previous[1] if previous else time.monotonic() + self.delay
+            self._pending[page.slug] = (copy.deepcopy(page), deadline)
+
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="notenest-write-behind", daemon=True
+                )
+                self._thread.start()
+            self._cond.notify()
+
+    def get(self, slug: str) -> Page | None:
+        """まだ書き込まれていないページ（なければNone）"""
+        with self._cond:
+            if slug in self._pending:
+                return copy.deepcopy(self._pending[slug][0])
+            if slug in self._inflight:
+                return copy.deepcopy(self._inflight[slug])
+            return None
+
+    def discard(self, slug: str) -> None:
+        """予約を取り消し（書き込み中のものは完了を待つ）"""
+        with self._write_lock, self._cond:
+            self._pending.pop(slug, None)
+            self._errors.pop(slug, None)
+
+    def pending_count(self) -> int:
+        """未書き込みのページ数"""
+        with self._cond:
+            return len(self._pending) + len(self._inflight)
+
+    def flush(self) -> None:
+        """
+        予約済みのページをすべて今すぐ書き込む
+
+        Raises:
+            Exception: 書き込めなかったページがあればその例外（ページは予約に残る）
+        """
+        with self._write_lock:
+            self._write_due(all_pending=True)
+            with self._cond:
+                error = next((error for error, _ in self._errors.values()), None)
+        if error:
+            raise error
+
+    def close(self) -> None:
+        """予約済みのページを書き込んでスレッドを停止（書き込めなければ flush と同じく送出）"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._closed:
+                    if self._pending:
+                        wait = min(deadline for _, deadline in self._pending.values())
+                        wait -= time.monotonic()
+                        if wait <= 0:
+                            break
+                        self._cond.wait(wait)
+                    else:
+                        self._cond.wait()
+                if self._closed:
+                    return
+
+            with self._write_lock:
+                self._write_due(all_pending=False)
+
+    def _write_due(self, all_pending: bool) -> None:
+        """期限が来たページを書き込む（_write_lock を保持して呼ぶ）"""
+        with self._cond:
+            now = time.monotonic()
+            due = [
+                slug
+                for slug, (_, deadline) in self._pending.items()
+                if all_pending or deadline <= now
+            ]
+            for slug in due:
+                self._inflight[slug] = self._pending.pop(slug)[0]
+
+        for slug in due:
+            page = self._inflight[slug]
+            try:
+                self._write(page)
+            except Exception as e:
+                with self._cond:
+                    failures = self._errors.get(slug, (e, 0))[1] + 1
+                    self._errors[slug] = (e, failures)
+                    # 書き込み中に新しい内容が submit されていなければ、失敗したページを再度予約する
+                    if slug not in self._pending:
+                        retry = min(
+                            max(self.delay, _RETRY_DELAY) * 2 ** (failures - 1), _MAX_RETRY_DELAY
+                        )
+                        self._pending[slug] = (page, time.monotonic() + retry)
+            else:
+                with self._cond:
+                    self._errors.pop(slug, None)
+            finally:
+                with self._cond:
+                    del self._inflight[slug]
@@ -1,36 +1,354 @@
 """SQLiteストレージ"""
 
 import json
+import queue
 import sqlite3
+import threading
+import uuid
+import zlib
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
 
-from notenest.core.link import Link
-from notenest.core.page import Page
+from notenest.core.link import Backlink, Link
+from notenest.core.markdown_scanner import MarkdownScanner
+from notenest.core.page import Page, PageFingerprint, PageSummary
+from notenest.core.pagination import PageCursor, validate_sort
+from notenest.core.revision import Revision
+from notenest.core.search import PageQuery, SearchHit, SearchWeights
+from notenest.core.sync import ManifestEntry
 from notenest.core.tag import Tag
+from notenest.storage.query_compiler import (
+    SEARCH_TOKENIZERS,
+    PageQueryCompiler,
+    fts_terms,
+    short_index_text,
+)
+
+
+def _compress_text(text: str) -> bytes:
+    """検索用本文を圧縮"""
+    return zlib.compress(text.encode("utf-8"))
+
+
+def _decompress_text(data: bytes | None) -> str | None:
+    """圧縮された検索用本文を展開（接続ごとに登録する SQL 関数 notenest_decompress）"""
+    if data is None:
+        return None
+    return zlib.decompress(data).decode("utf-8")
+
+
+def _short_index_values(slug: str, title: str, content: str, tags: str) -> tuple[str, ...]:
+    """pages_fts_short の各列に入れる値"""
+    return tuple(short_index_text(value) for value in (slug, title, content, tags))
+
+
+def _find_highlights(text: str, terms: list[str]) -> list[tuple[int, int]]:
+    """テキスト中の語の出現範囲（大文字小文字を区別しない）"""
+    lowered = text.lower()
+    offsets: list[tuple[int, int]] = []
+    for term in terms:
+        term = term.lower()
+        start = lowered.find(term)
+        while start >= 0:
+            offsets.append((start, start + len(term)))
+            start = lowered.find(term, start + len(term))
+    return sorted(offsets)
+
+
+def _excerpt(content: str, position: int, width: int = 120) -> tuple[str, int, int]:
+    """
+    position の周辺を抜粋
+
+    Returns:
+        tuple: (抜粋, 抜粋した content の開始位置, 終了位置)。
+            開始位置が先頭でなければ抜粋の先頭に "…" が付く
+    """
+    start = max(0, position - width // 4)
+    end = start + width
+    snippet = content[start:end]
+    if start > 0:
+        snippet = "…" + snippet
+    if end < len(content):
+        snippet += "…"
+    return snippet, start, min(end, len(content))
+
+
+def _make_snippet(content: str, terms: list[str], width: int = 120) -> str:
+    """最初に一致した語の周辺を抜粋"""
+    lowered = content.lower()
+    positions = [lowered.find(term.lower()) for term in terms]
+    first = min((pos for pos in positions if pos >= 0), default=0)
+    return _excerpt(content, first, width)[0]
+
+
+def _link_context(
+    content: str, target_slug: str, width: int = 120
+) -> tuple[str, list[tuple[int, int]]]:
+    """target_slug への最初の Wiki Link の周辺を抜粋し、抜粋内のリンクの範囲を返す"""
+    refs = [ref for ref in MarkdownScanner.scan(content).wiki_links if ref.slug == target_slug]
+    snippet, start, end = _excerpt(content, refs[0].start if refs else 0, width)
+    shift = start - 1 if start > 0 else start  # 先頭の "…" の分
+    highlights = [
+        (ref.start - shift, min(ref.end, end) - shift) for ref in refs if start <= ref.start < end
+    ]
+    return snippet, highlights
+
+
+# ソートキーとORDER BY句の対応
+_SORT_COLUMNS = {
+    "updated_at": "updated_at",
+    "created_at": "created_at",
+    "title": "title COLLATE NOCASE",
+    "slug": "slug COLLATE NOCASE",
+}
+
+# PageSummary に必要な列
+_SUMMARY_COLUMNS = "id, slug, title, metadata_type, created_at, updated_at"
+_SUMMARY_COLUMNS_P = "p.id, p.slug, p.title, p.metadata_type, p.created_at, p.updated_at"
+
+
+@dataclass
+class ConnectionProfile:
+    """SQLite接続プロファイル"""
+
+    journal_mode: str = "wal"  # wal, delete, truncate など
+    synchronous: str = "normal"  # off, normal, full
+    mmap_size: int = 256 * 1024 * 1024  # バイト（0で無効）
+    cache_size: int = -64_000  # 負値はKiB指定（-64000 = 約64MB）
+    busy_timeout: int = 5_000  # ミリ秒
+    read_pool_size: int = 4  # 読み取り専用接続の上限数（0でライター接続を共用）
 
 
 class DBStore:
-    """SQLiteデータベース操作"""
+    """
+    SQLiteデータベース操作
 
-    def __init__(self, db_path: Path) -> None:
+    書き込みは単一のライター接続にロックで直列化し、読み取りは読み取り専用接続の
+    プールから行う（WALモードでは書き込み中でも読み取りがブロックされない）。
+    batch() ブロック内のスレッドは未コミットの変更を読めるようライター接続を使う。
+    """
+
+    def __init__(self, db_path: Path, profile: ConnectionProfile | None = None) -> None:
         self.db_path = db_path
+        self.profile = profile or ConnectionProfile()
+        # 全文検索のトークナイザープロファイル（接続時に settings テーブルから読み込む）
+        self.search_tokenizer = "porter"
         self.conn: sqlite3.Connection | None = None
+        self._write_lock = threading.RLock()
+        self._batch_depth = 0
+        self._batch_owner: int | None = None
+        # 直前にコミットしたトランザクションが進めた変更カウンタ（行の変更がなければNone）。
+        # ライターロックを保持している間だけ参照できる
+        self.committed_counter: int | None = None
+        self._read_pool: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue()
+        self._readers: list[sqlite3.Connection] = []
+        self._pool_lock = threading.Lock()
 
     def connect(self) -> None:
         """データベース接続"""
-        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn = sqlite3.connect(
+            str(self.db_path),
+            timeout=self.profile.busy_timeout / 1000,
+            check_same_thread=False,
+        )
         self.conn.row_factory = sqlite3.Row
+        self.conn.execute(f"PRAGMA journal_mode = {self.profile.journal_mode}")
+        self.conn.execute(f"PRAGMA synchronous = {self.profile.synchronous}")
+        self._configure_connection(self.conn)
         # 外部キー制約を有効化（ON DELETE CASCADEを機能させるため）
         self.conn.execute("PRAGMA foreign_keys = ON")
         self._initialize_schema()
 
     def close(self) -> None:
         """データベース切断"""
+        with self._pool_lock:
+            for reader in self._readers:
+                reader.close()
+            self._readers.clear()
+            self._read_pool = queue.LifoQueue()
+
         if self.conn:
             self.conn.close()
             self.conn = None
 
+    def _configure_connection(self, conn: sqlite3.Connection) -> None:
+        """ライター・リーダー共通のPRAGMAとSQL関数を設定"""
+        conn.execute(f"PRAGMA busy_timeout = {int(self.profile.busy_timeout)}")
+        conn.execute(f"PRAGMA cache_size = {int(self.profile.cache_size)}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.profile.mmap_size)}")
+        # 検索用本文（圧縮済み）を展開する関数と、それを使うビュー。
+        # アプリ定義の関数に依存するため接続ごとの TEMP ビューとし、DBファイルのスキーマには
+        # 含めない（sqlite3 CLI やバックアップツールなど他のクライアントでも開けるように）
+        conn.create_function("notenest_decompress", 1, _decompress_text, deterministic=True)
+        conn.execute("""
+            CREATE TEMP VIEW IF NOT EXISTS page_search_content AS
+            SELECT page_id, slug, title, notenest_decompress(body) AS content, tags
+            FROM main.page_content
+        """)
+
+    def _open_reader(self) -> sqlite3.Connection:
+        """読み取り専用接続を開く"""
+        conn = sqlite3.connect(
+            f"{self.db_path.resolve().as_uri()}?mode=ro",
+            uri=True,
+            timeout=self.profile.busy_timeout / 1000,
+            check_same_thread=False,
+        )
+        conn.row_factory = sqlite3.Row
+        self._configure_connection(conn)
+        return conn
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        """プールから読み取り専用接続を取得（上限に達していれば空くまで待つ）"""
+        try:
+            return self._read_pool.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._pool_lock:
+            if len(self._readers) < self.profile.read_pool_size:
+                reader = self._open_reader()
+                self._readers.append(reader)
+                return reader
+
+        return self._read_pool.get()
+
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """読み取り用接続"""
+        if not self.conn:
+            raise RuntimeError("Database not connected")
+
+        # プールなし、または書き込みトランザクション中のスレッドはライター接続で読む
+        if self.profile.read_pool_size <= 0 or self.in_batch:
+            with self._write_lock:
+                yield self.conn
+            return
+
+        reader = self._acquire_reader()
+        try:
+            yield reader
+        finally:
+            self._read_pool.put(reader)
+
+    @contextmanager
+    def _writer(self) -> Iterator[sqlite3.Connection]:
+        """書き込み用接続（batch() 外では抜けた時点でコミット）"""
+        if not self.conn:
+            raise RuntimeError("Database not connected")
+
+        conn = self.conn
+        with self._write_lock:
+            if self._batch_depth > 0:
+                yield conn
+                return
+
+            self._batch_depth = 1
+            self._batch_owner = threading.get_ident()
+            changes = conn.total_changes
+            try:
+                yield conn
+                counter = self._count_change(conn, changes)
+            except BaseException:
+                conn.rollback()
+                raise
+            else:
+                conn.commit()
+                self.committed_counter = counter
+            finally:
+                self._batch_depth = 0
+                self._batch_owner = None
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        複数の書き込みを1トランザクションにまとめる
+
+        ブロック内の各書き込みメソッドはコミットせず、最も外側のブロックを
+        抜けた時点で1回だけコミットする。ネストしたブロックはSAVEPOINTとなり、
+        内側で例外が発生した場合はその範囲の変更だけがロールバックされる。
+        ブロックの間はライターロックを保持するため、他スレッドの書き込みは待たされる。
+        """
+        if not self.conn:
+            raise RuntimeError("Database not connected")
+
+        conn = self.conn
+        with self._write_lock:
+            depth = self._batch_depth
+            savepoint = f"batch_{depth}"
+
+            if depth == 0:
+                if conn.in_transaction:
+                    conn.commit()
+                conn.execute("BEGIN IMMEDIATE")
+                self._batch_owner = threading.get_ident()
+            else:
+                conn.execute(f"SAVEPOINT {savepoint}")
+
+            changes = conn.total_changes
+            counter = None
+            self._batch_depth += 1
+            try:
+                yield
+                if depth == 0:
+                    counter = self._count_change(conn, changes)
+            except BaseException:
+                self._batch_depth -= 1
+                if depth == 0:
+                    self._batch_owner = None
+                    conn.rollback()
+                else:
+                    conn.execute(f"ROLLBACK TO {savepoint}")
+                    conn.execute(f"RELEASE {savepoint}")
+                raise
+            else:
+                self._batch_depth -= 1
+                if depth == 0:
+                    self._batch_owner = None
+                    conn.commit()
+                    self.committed_counter = counter
+                else:
+                    conn.execute(f"RELEASE {savepoint}")
+
+    @staticmethod
+    def _count_change(conn: sqlite3.Connection, changes_before: int) -> int | None:
+        """
+        トランザクション内で行が変更されていれば、コミット前に変更カウンタを進める
+
+        Returns:
+            int: 進めた後の変更カウンタ。行が変更されていなければNone
+        """
+        if conn.total_changes == changes_before:
+            return None
+        cursor = conn.execute(
+            """
+            UPDATE settings
+            SET value = CASE key WHEN 'change_counter' THEN CAST(value AS INTEGER) + 1 ELSE ? END
+            WHERE key IN ('change_counter', 'changed_at')
+            RETURNING key, value
+        """,
+            (datetime.now().isoformat(),),
+        )
+        return next(int(value) for key, value in cursor.fetchall() if key == "change_counter")
+
+    @contextmanager
+    def write_locked(self) -> Iterator[None]:
+        """
+        ライターロックだけを保持する（SQLiteのトランザクションは開始しない）
+
+        batch() のコミット前後の処理を、他スレッドの書き込みと順序付けるために使う。
+        """
+        with self._write_lock:
+            yield
+
+    @property
+    def in_batch(self) -> bool:
+        """現在のスレッドが書き込みトランザクション中かどうか"""
+        return self._batch_owner == threading.get_ident()
+
     def _initialize_schema(self) -> None:
         """スキーマ初期化"""
         if not self.conn:
@@ -48,17 +366,19 @@ class DBStore:
                 metadata_type TEXT DEFAULT 'default',
                 created_at TIMESTAMP NOT NULL,
                 updated_at TIMESTAMP NOT NULL,
-                metadata_json TEXT
+                metadata_json TEXT,
+                content_hash TEXT,
+                tags_hash TEXT,
+                links_hash TEXT
             )
         """)
 
-        # 全文検索テーブル（FTS5）
-        cursor.execute("""
-            CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(
-                slug, title, content, tags,
-                tokenize='porter unicode61'
-            )
-        """)
+        # 旧バージョンのDBにフィンガープリント列を追加
+        cursor.execute("PRAGMA table_info(pages)")
+        page_columns = {row["name"] for row in cursor.fetchall()}
+        for column in ("content_hash", "tags_hash", "links_hash"):
+            if column not in page_columns:
+                cursor.execute(f"ALTER TABLE pages ADD COLUMN {column} TEXT")
 
         # リンクテーブル
         cursor.execute("""
@@ -90,114 +410,409 @@ class DBStore:
             )
         """)
 
+        # 設定テーブル（ワークスペースごとの設定）
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS settings (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            )
+        """)
+        # ワークスペースの識別子と変更カウンタ（コミットのたびに増える。HTTPキャッシュの検証用）
+        cursor.execute(
+            "INSERT OR IGNORE INTO settings (key, value) VALUES ('workspace_id', ?)",
+            (uuid.uuid4().hex[:12],),
+        )
+        cursor.execute(
+            "INSERT OR IGNORE INTO settings (key, value) "
+            "VALUES ('change_counter', '0'), ('changed_at', ?)",
+            (datetime.now().isoformat(),),
+        )
+
+        # 同期マニフェストテーブル（前回同期時のファイル状態）
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS sync_manifest (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                content_hash TEXT NOT NULL
+            )
+        """)
+
+        self._initialize_search_schema(cursor)
+
         # インデックス作成
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_links_source ON links(source_page_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_links_target ON links(target_slug)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_page_tags_page ON page_tags(page_id)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_page_tags_tag ON page_tags(tag_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_pages_updated ON pages(updated_at, id)")
 
         self.conn.commit()
 
-    # ========== ページ操作 ==========
+    def _initialize_search_schema(self, cursor: sqlite3.Cursor) -> None:
+        """
+        全文検索用のスキーマ初期化
 
-    def save_page(self, page: Page) -> int:
-        """ページを保存（新規作成または更新）"""
-        if not self.conn:
-            raise RuntimeError("Database not connected")
-
-        cursor = self.conn.cursor()
-        metadata_json = json.dumps(page.metadata, ensure_ascii=False) if page.metadata else None
+        本文は zlib で圧縮して page_content に保存し、pages_fts は転置インデックスだけを持つ
+        contentless テーブルとするため、本文を二重に保持しない。索引への追加・削除と
+        再構築は page_content の値をPython側で展開して行い、抜粋もPython側で作る。
+        DBファイルのスキーマはアプリ定義のSQL関数に依存しない。
+        """
+        # 検索用本文テーブル（インデックス済みの値をそのまま保持）
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS page_content (
+                page_id INTEGER PRIMARY KEY,
+                slug TEXT NOT NULL,
+                title TEXT NOT NULL,
+                tags TEXT NOT NULL,
+                body BLOB NOT NULL,
+                FOREIGN KEY (page_id) REFERENCES pages(id) ON DELETE CASCADE
+            )
+        """)
 
-        if page.id:
-            # 更新
+        # 旧バージョンのFTSテーブル（本文を保持するもの、展開ビューを参照する
+        # external content のもの）から移行
+        cursor.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'pages_fts'")
+        row = cursor.fetchone()
+        migrate = row is not None and "content=''" not in row["sql"]
+        if migrate and "content=" not in row["sql"]:
             cursor.execute(
+                "SELECT rowid, slug, title, content, tags FROM pages_fts "
+                "WHERE rowid IN (SELECT id FROM pages)"
+            )
+            cursor.executemany(
                 """
-                UPDATE pages
-                SET slug = ?, title = ?, file_path = ?, metadata_type = ?,
-                    updated_at = ?, metadata_json = ?
-                WHERE id = ?
+                INSERT OR REPLACE INTO page_content (page_id, slug, title, tags, body)
+                VALUES (?, ?, ?, ?, ?)
             """,
-                (
-                    page.slug,
-                    page.title,
-                    str(page.file_path) if page.file_path else "",
-                    page.metadata_type,
-                    (page.updated_at or datetime.now()).isoformat(),
-                    metadata_json,
-                    page.id,
-                ),
+                [
+                    (r["rowid"], r["slug"], r["title"], r["tags"], _compress_text(r["content"]))
+                    for r in cursor.fetchall()
+                ],
+            )
+        if migrate:
+            cursor.execute("DROP TABLE pages_fts")
+        cursor.execute("DROP VIEW IF EXISTS main.page_search_content")
+
+        # 全文検索テーブル（FTS5, contentless）
+        cursor.execute("SELECT value FROM settings WHERE key = 'search_tokenizer'")
+        row = cursor.fetchone()
+        self.search_tokenizer = row["value"] if row else "porter"
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'pages_fts_short'"
+        )
+        # 短い語のインデックスを持たない trigram のワークスペースは作成して埋める
+        fill_short = self.search_tokenizer == "trigram" and cursor.fetchone() is None
+        self._create_fts_table(cursor, self.search_tokenizer)
+
+        if migrate or fill_short:
+            self._fill_fts(cursor, self.search_tokenizer)
+
+    @staticmethod
+    def _create_fts_table(cursor: sqlite3.Cursor, tokenizer: str) -> None:
+        """指定したトークナイザープロファイルで pages_fts（trigram では pages_fts_short も）を作成"""
+        cursor.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(
+                slug, title, content, tags,
+                content='',
+                tokenize='{SEARCH_TOKENIZERS[tokenizer]}'
+            )
+        """)
+        if tokenizer != "trigram":
+            return
+
+        # trigram で引けない1〜2文字の語用のインデックス（contentless）。
+        # short_index_text() で2文字ずつに区切った文字列を入れ、1文字の語は前方一致で引く
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts_short USING fts5(
+                slug, title, content, tags,
+                content='',
+                prefix='1',
+                tokenize='unicode61 remove_diacritics 0'
             )
-            page_id = page.id
-        else:
-            # 新規作成
+        """)
+
+    @staticmethod
+    def _fill_fts(cursor: sqlite3.Cursor, tokenizer: str) -> None:
+        """pages_fts（trigram では pages_fts_short も）を page_content から作り直す"""
+        cursor.execute("INSERT INTO pages_fts (pages_fts) VALUES ('delete-all')")
+        if tokenizer == "trigram":
+            cursor.execute("INSERT INTO pages_fts_short (pages_fts_short) VALUES ('delete-all')")
+
+        rows = cursor.connection.execute(
+            "SELECT page_id, slug, title, tags, body FROM page_content"
+        )
+        for row in rows:
+            values = (row["slug"], row["title"], _decompress_text(row["body"]) or "", row["tags"])
             cursor.execute(
-                """
-                INSERT INTO pages (slug, title, file_path, metadata_type, created_at, updated_at, metadata_json)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """,
-                (
-                    page.slug,
-                    page.title,
-                    str(page.file_path) if page.file_path else "",
-                    page.metadata_type,
-                    (page.created_at or datetime.now()).isoformat(),
-                    (page.updated_at or datetime.now()).isoformat(),
-                    metadata_json,
-                ),
+                "INSERT INTO pages_fts (rowid, slug, title, content, tags) VALUES (?, ?, ?, ?, ?)",
+                (row["page_id"], *values),
+            )
+            if tokenizer == "trigram":
+                cursor.execute(
+                    "INSERT INTO pages_fts_short (rowid, slug, title, content, tags) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (row["page_id"], *_short_index_values(*values)),
+                )
+
+    def set_search_tokenizer(self, tokenizer: str) -> None:
+        """
+        全文検索のトークナイザープロファイルを変更してインデックスを再構築
+
+        Args:
+            tokenizer: プロファイル名（SEARCH_TOKENIZERS のキー）
+        """
+        if tokenizer not in SEARCH_TOKENIZERS:
+            raise ValueError(f"Invalid tokenizer: {tokenizer}")
+
+        with self._writer() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DROP TABLE IF EXISTS pages_fts")
+            cursor.execute("DROP TABLE IF EXISTS pages_fts_short")
+            self._create_fts_table(cursor, tokenizer)
+            self._fill_fts(cursor, tokenizer)
+            cursor.execute(
+                "INSERT OR REPLACE INTO settings (key, value) VALUES ('search_tokenizer', ?)",
+                (tokenizer,),
             )
-            assert cursor.lastrowid is not None
-            page_id = cursor.lastrowid
 
-        self.conn.commit()
-        return page_id
+        self.search_tokenizer = tokenizer
+
+    def get_change_counter(self) -> int:
+        """
+        ワークスペースの変更カウンタを取得
+
+        他の接続・プロセスを含め、行を変更したトランザクションがコミットされるたびに増える。
+        インメモリのキャッシュがDBの内容と一致しているかの判定に使う。
+        """
+        with self._reader() as conn:
+            row = conn.execute("SELECT value FROM settings WHERE key = 'change_counter'").fetchone()
+        return int(row["value"])
+
+    def get_workspace_revision(self) -> Revision:
+        """ワークスペース全体の版（いずれかの書き込みがコミットされると変わる）"""
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT key, value FROM settings "
+                "WHERE key IN ('workspace_id', 'change_counter', 'changed_at')"
+            )
+            values = {row["key"]: row["value"] for row in cursor.fetchall()}
+
+        return Revision.of_workspace(
+            values["workspace_id"],
+            int(values["change_counter"]),
+            datetime.fromisoformat(values["changed_at"]),
+        )
+
+    # ========== ページ操作 ==========
+
+    def save_page(self, page: Page, fingerprint: PageFingerprint | None = None) -> int:
+        """
+        ページを保存（新規作成または更新）
+
+        Args:
+            page: 保存するページ
+            fingerprint: 変更検出用ハッシュ（Noneなら更新時は既存の値を残す）
+        """
+        with self._writer() as conn:
+            cursor = conn.cursor()
+            metadata_json = json.dumps(page.metadata, ensure_ascii=False) if page.metadata else None
+            hashes = (
+                (fingerprint.content_hash, fingerprint.tags_hash, fingerprint.links_hash)
+                if fingerprint
+                else (None, None, None)
+            )
+
+            if page.id:
+                # 更新
+                cursor.execute(
+                    """
+                    UPDATE pages
+                    SET slug = ?, title = ?, file_path = ?, metadata_type = ?,
+                        updated_at = ?, metadata_json = ?,
+                        content_hash = COALESCE(?, content_hash),
+                        tags_hash = COALESCE(?, tags_hash),
+                        links_hash = COALESCE(?, links_hash)
+                    WHERE id = ?
+                """,
+                    (
+                        page.slug,
+                        page.title,
+                        str(page.file_path) if page.file_path else "",
+                        page.metadata_type,
+                        (page.updated_at or datetime.now()).isoformat(),
+                        metadata_json,
+                        *hashes,
+                        page.id,
+                    ),
+                )
+                page_id = page.id
+            else:
+                # 新規作成
+                cursor.execute(
+                    """
+                    INSERT INTO pages (
+                        slug, title, file_path, metadata_type, created_at, updated_at,
+                        metadata_json, content_hash, tags_hash, links_hash
+                    )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                    (
+                        page.slug,
+                        page.title,
+                        str(page.file_path) if page.file_path else "",
+                        page.metadata_type,
+                        (page.created_at or datetime.now()).isoformat(),
+                        (page.updated_at or datetime.now()).isoformat(),
+                        metadata_json,
+                        *hashes,
+                    ),
+                )
+                assert cursor.lastrowid is not None
+                page_id = cursor.lastrowid
+            return page_id
+
+    def get_page_fingerprint(self, page_id: int) -> PageFingerprint | None:
+        """保存済みの変更検出用ハッシュ（未計算のページはNone）"""
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT content_hash, tags_hash, links_hash FROM pages WHERE id = ?", (page_id,)
+            )
+            row = cursor.fetchone()
+
+            if not row or None in tuple(row):
+                return None
+
+            return PageFingerprint(
+                content_hash=row["content_hash"],
+                tags_hash=row["tags_hash"],
+                links_hash=row["links_hash"],
+            )
 
     def get_page_by_id(self, page_id: int) -> Page | None:
         """IDでページを取得"""
-        if not self.conn:
-            raise RuntimeError("Database not connected")
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM pages WHERE id = ?", (page_id,))
+            row = cursor.fetchone()
 
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM pages WHERE id = ?", (page_id,))
-        row = cursor.fetchone()
-
-        if not row:
-            return None
+            if not row:
+                return None
 
-        return self._row_to_page(row)
+            return self._row_to_page(row)
 
     def get_page_by_slug(self, slug: str) -> Page | None:
         """slugでページを取得"""
-        if not self.conn:
-            raise RuntimeError("Database not connected")
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT * FROM pages WHERE slug = ?", (slug,))
+            row = cursor.fetchone()
 
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM pages WHERE slug = ?", (slug,))
-        row = cursor.fetchone()
+            if not row:
+                return None
 
-        if not row:
-            return None
-
-        return self._row_to_page(row)
+            return self._row_to_page(row)
 
     def get_all_pages(self) -> list[Page]:
         """全ページを取得"""
-        if not self.conn:
-            raise RuntimeError("Database not connected")
-
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM pages ORDER BY updated_at DESC")
-        rows = cursor.fetchall()
-
-        return [self._row_to_page(row) for row in rows]
+        return self.get_pages()
+
+    def get_pages(
+        self,
+        limit: int | None = None,
+        offset: int = 0,
+        sort_by: str = "updated_at",
+        order: str = "desc",
+        after: PageCursor | None = None,
+    ) -> list[Page]:
+        """
+        ページを取得（ソート・ページネーションをSQL側で実行）
+
+        Args:
+            limit: 取得件数（Noneで全件）
+            offset: 読み飛ばす件数
+            sort_by: ソートキー（updated_at, created_at, title, slug）
+            order: asc または desc
+            after: キーセットページネーション用カーソル（sort_by=updated_at のみ）
+
+        Returns:
+            list: ページリスト
+        """
+        sql, params = self._listing_sql("*", limit, offset, sort_by, order, after)
+
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+            return [self._row_to_page(row) for row in rows]
+
+    def get_page_summaries(
+        self,
+        limit: int | None = None,
+        offset: int = 0,
+        sort_by: str = "updated_at",
+        order: str = "desc",
+        after: PageCursor | None = None,
+    ) -> list[PageSummary]:
+        """ページ概要を取得（引数は get_pages と同じ。メタデータJSONは読み込まない）"""
+        sql, params = self._listing_sql(_SUMMARY_COLUMNS, limit, offset, sort_by, order, after)
+
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+            return [self._row_to_summary(row) for row in rows]
+
+    def _listing_sql(
+        self,
+        columns: str,
+        limit: int | None,
+        offset: int,
+        sort_by: str,
+        order: str,
+        after: PageCursor | None,
+    ) -> tuple[str, list[object]]:
+        """ページ一覧取得用のSELECT文を組み立て"""
+        validate_sort(sort_by, order)
+        direction = order.upper()
+        column = _SORT_COLUMNS[sort_by]
+
+        where = ""
+        params: list[object] = []
+        if after is not None:
+            if sort_by != "updated_at":
+                raise ValueError("Cursor pagination is only supported for sort_by=updated_at")
+            where = f"WHERE (updated_at, id) {'<' if order == 'desc' else '>'} (?, ?)"
+            params.extend([after.updated_at, after.id])
+
+        sql = f"SELECT {columns} FROM pages {where} ORDER BY {column} {direction}, id {direction}"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([limit, offset])
+        elif offset:
+            sql += " LIMIT -1 OFFSET ?"
+            params.append(offset)
+
+        return sql, params
+
+    def count_pages(self) -> int:
+        """ページ総数を取得"""
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT COUNT(*) FROM pages")
+            return int(cursor.fetchone()[0])
 
     def delete_page(self, page_id: int) -> None:
         """ページを削除"""
-        if not self.conn:
-            raise RuntimeError("Database not connected")
-
-        cursor = self.conn.cursor()
-        cursor.execute("DELETE FROM pages WHERE id = ?", (page_id,))
-        self.conn.commit()
+        with self._writer() as conn:
+            cursor = conn.cursor()
+            # 検索インデックスはインデックス時の値が必要なので本文より先に削除
+            self._delete_search_entry(cursor, page_id)
+            cursor.execute("DELETE FROM pages WHERE id = ?", (page_id,))
 
     def _row_to_page(self, row: sqlite3.Row) -> Page:
         """行データをPageオブジェクトに変換"""
@@ -214,220 +829,631 @@ class DBStore:
             metadata=metadata,
         )
 
+    def _row_to_summary(self, row: sqlite3.Row) -> PageSummary:
+        """行データをPageSummaryに変換"""
+        return PageSummary(
+            id=row["id"],
+            slug=row["slug"],
+            title=row["title"],
+            metadata_type=row["metadata_type"],
+            created_at=datetime.fromisoformat(row["created_at"]),
+            updated_at=datetime.fromisoformat(row["updated_at"]),
+        )
+
     # ========== リンク操作 ==========
 
     def save_links(self, source_page_id: int, target_slugs: list[str]) -> None:
-        """ページのリンクを保存（既存リンクは削除して再作成）"""
-        if not self.conn:
-            raise RuntimeError("Database not connected")
-
-        cursor = self.conn.cursor()
+        """
+        ページのリンクを保存
 
-        # 既存リンク削除
-        cursor.execute("DELETE FROM links WHERE source_page_id = ?", (source_page_id,))
+        既存のリンクとの差分だけを追加・削除する。同じリンク先への複数のリンクは1件にまとめる。
+        """
+        with self._writer() as conn:
+            cursor = conn.cursor()
 
-        # 新規リンク追加
-        for target_slug in target_slugs:
             cursor.execute(
-                "INSERT INTO links (source_page_id, target_slug, link_type) VALUES (?, ?, ?)",
-                (source_page_id, target_slug, "wiki"),
+                "SELECT target_slug FROM links WHERE source_page_id = ?", (source_page_id,)
             )
-
-        self.conn.commit()
+            existing = {row["target_slug"] for row in cursor.fetchall()}
+            targets = dict.fromkeys(target_slugs)
+
+            # なくなったリンクを削除
+            removed = existing - targets.keys()
+            if removed:
+                cursor.execute(
+                    """
+                    DELETE FROM links
+                    WHERE source_page_id = ? AND target_slug IN (SELECT value FROM json_each(?))
+                """,
+                    (source_page_id, json.dumps(sorted(removed), ensure_ascii=False)),
+                )
+
+            # 新しいリンクを追加
+            added = [(source_page_id, slug, "wiki") for slug in targets if slug not in existing]
+            if added:
+                cursor.executemany(
+                    "INSERT INTO links (source_page_id, target_slug, link_type) VALUES (?, ?, ?)",
+                    added,
+                )
 
     def get_outgoing_links(self, page_id: int) -> list[Link]:
         """ページからの発リンク（outgoing links）を取得"""
-        if not self.conn:
-            raise RuntimeError("Database not connected")
-
-        cursor = self.conn.cursor()
-        cursor.execute(
-            """
-            SELECT l.*, p.slug as source_slug
-            FROM links l
-            JOIN pages p ON l.source_page_id = p.id
-            WHERE l.source_page_id = ?
-        """,
-            (page_id,),
-        )
-        rows = cursor.fetchall()
-
-        return [
-            Link(
-                id=row["id"],
-                source_page_id=row["source_page_id"],
-                source_slug=row["source_slug"],
-                target_slug=row["target_slug"],
-                link_type=row["link_type"],
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT l.*, p.slug as source_slug
+                FROM links l
+                JOIN pages p ON l.source_page_id = p.id
+                WHERE l.source_page_id = ?
+            """,
+                (page_id,),
             )
-            for row in rows
-        ]
+            rows = cursor.fetchall()
+
+            return [
+                Link(
+                    id=row["id"],
+                    source_page_id=row["source_page_id"],
+                    source_slug=row["source_slug"],
+                    target_slug=row["target_slug"],
+                    link_type=row["link_type"],
+                )
+                for row in rows
+            ]
 
     def get_backlinks(self, slug: str) -> list[Link]:
         """ページへのバックリンク（incoming links）を取得"""
-        if not self.conn:
-            raise RuntimeError("Database not connected")
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT l.*, p.slug as source_slug
+                FROM links l
+                JOIN pages p ON l.source_page_id = p.id
+                WHERE l.target_slug = ?
+            """,
+                (slug,),
+            )
+            rows = cursor.fetchall()
+
+            return [
+                Link(
+                    id=row["id"],
+                    source_page_id=row["source_page_id"],
+                    source_slug=row["source_slug"],
+                    target_slug=row["target_slug"],
+                    link_type=row["link_type"],
+                )
+                for row in rows
+            ]
+
+    def get_link_sources(
+        self, target_slug: str, after_id: int = 0, limit: int = 256
+    ) -> list[tuple[int, str]]:
+        """
+        target_slug にリンクしているページをID順に limit 件ずつ取得
+
+        Args:
+            target_slug: リンク先slug
+            after_id: このページIDより後から取得（前回の最後のID）
+            limit: 取得件数
+
+        Returns:
+            list: (ページID, slug) のリスト
+        """
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT DISTINCT p.id, p.slug
+                FROM links l
+                JOIN pages p ON l.source_page_id = p.id
+                WHERE l.target_slug = ? AND l.source_page_id > ?
+                ORDER BY p.id
+                LIMIT ?
+            """,
+                (target_slug, after_id, limit),
+            )
+            return [(row["id"], row["slug"]) for row in cursor.fetchall()]
+
+    def get_backlink_pages(
+        self, target_slug: str, limit: int | None = None, offset: int = 0
+    ) -> list[Backlink]:
+        """
+        target_slug にリンクしているページの概要とリンク周辺の抜粋をslug順に取得
+
+        Args:
+            target_slug: リンク先slug
+            limit: 取得件数（Noneで全件）
+            offset: 読み飛ばす件数
+
+        Returns:
+            list: リンク元ページごとの Backlink（タグは未設定）
+        """
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"""
+                SELECT {_SUMMARY_COLUMNS_P},
+                    (SELECT content FROM page_search_content c WHERE c.page_id = p.id) AS content
+                FROM pages p
+                WHERE p.id IN (SELECT source_page_id FROM links WHERE target_slug = ?)
+                ORDER BY p.slug
+                LIMIT ? OFFSET ?
+            """,
+                (target_slug, -1 if limit is None else limit, offset),
+            )
+            rows = cursor.fetchall()
 
-        cursor = self.conn.cursor()
-        cursor.execute(
-            """
-            SELECT l.*, p.slug as source_slug
-            FROM links l
-            JOIN pages p ON l.source_page_id = p.id
-            WHERE l.target_slug = ?
-        """,
-            (slug,),
-        )
-        rows = cursor.fetchall()
+        backlinks = []
+        for row in rows:
+            snippet, highlights = _link_context(row["content"] or "", target_slug)
+            backlinks.append(
+                Backlink(page=self._row_to_summary(row), snippet=snippet, highlights=highlights)
+            )
+        return backlinks
 
-        return [
-            Link(
-                id=row["id"],
-                source_page_id=row["source_page_id"],
-                source_slug=row["source_slug"],
-                target_slug=row["target_slug"],
-                link_type=row["link_type"],
+    def count_link_sources(self, target_slug: str) -> int:
+        """target_slug にリンクしているページ数"""
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "SELECT COUNT(DISTINCT source_page_id) FROM links WHERE target_slug = ?",
+                (target_slug,),
+            )
+            return int(cursor.fetchone()[0])
+
+    def get_link_graph_data(self) -> tuple[list[tuple[int, str]], list[tuple[str, str]]]:
+        """
+        リンクグラフ構築用に全ページと全リンクを取得
+
+        Returns:
+            tuple: ((ページID, slug) のリスト, (リンク元slug, リンク先slug) のリスト)
+        """
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, slug FROM pages")
+            pages = [(row["id"], row["slug"]) for row in cursor.fetchall()]
+            cursor.execute(
+                """
+                SELECT p.slug AS source_slug, l.target_slug
+                FROM links l
+                JOIN pages p ON l.source_page_id = p.id
+                ORDER BY l.id
+            """
             )
-            for row in rows
-        ]
+            links = [(row["source_slug"], row["target_slug"]) for row in cursor.fetchall()]
+            return pages, links
 
     # ========== タグ操作 ==========
 
     def get_or_create_tag(self, tag_name: str) -> int:
         """タグを取得または作成"""
-        if not self.conn:
-            raise RuntimeError("Database not connected")
+        return self.get_or_create_tags([tag_name])[tag_name]
 
-        cursor = self.conn.cursor()
+    def get_or_create_tags(self, tag_names: list[str]) -> dict[str, int]:
+        """
+        複数のタグ名をIDに解決（存在しないタグは作成）
 
-        # 既存タグを検索
-        cursor.execute("SELECT id FROM tags WHERE name = ?", (tag_name,))
-        row = cursor.fetchone()
+        タグ数によらず INSERT OR IGNORE と SELECT の2文で処理する。
 
-        if row:
-            return int(row["id"])
+        Returns:
+            dict: タグ名をキー、タグIDを値とする辞書
+        """
+        if not tag_names:
+            return {}
 
-        # 新規作成
-        cursor.execute("INSERT INTO tags (name) VALUES (?)", (tag_name,))
-        self.conn.commit()
-        assert cursor.lastrowid is not None
-        return cursor.lastrowid
+        names_json = json.dumps(list(dict.fromkeys(tag_names)), ensure_ascii=False)
+        with self._writer() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                "INSERT OR IGNORE INTO tags (name) SELECT value FROM json_each(?)", (names_json,)
+            )
+            cursor.execute(
+                "SELECT id, name FROM tags WHERE name IN (SELECT value FROM json_each(?))",
+                (names_json,),
+            )
+            return {row["name"]: row["id"] for row in cursor.fetchall()}
 
     def save_page_tags(self, page_id: int, tag_names: list[str]) -> None:
-        """ページのタグを保存（既存タグは削除して再作成）"""
-        if not self.conn:
-            raise RuntimeError("Database not connected")
-
-        cursor = self.conn.cursor()
+        """
+        ページのタグを保存
 
-        # 既存タグ関連削除
-        cursor.execute("DELETE FROM page_tags WHERE page_id = ?", (page_id,))
+        既存のタグとの差分だけを追加・削除する。重複したタグ名は1件にまとめる。
+        """
+        with self._writer() as conn:
+            cursor = conn.cursor()
 
-        # 新規タグ追加
-        for tag_name in tag_names:
-            tag_id = self.get_or_create_tag(tag_name)
             cursor.execute(
-                "INSERT INTO page_tags (page_id, tag_id) VALUES (?, ?)", (page_id, tag_id)
+                """
+                SELECT t.id, t.name
+                FROM page_tags pt
+                JOIN tags t ON t.id = pt.tag_id
+                WHERE pt.page_id = ?
+            """,
+                (page_id,),
             )
-
-        self.conn.commit()
+            existing = {row["name"]: row["id"] for row in cursor.fetchall()}
+            names = dict.fromkeys(tag_names)
+
+            # 外されたタグを削除
+            removed = [tag_id for name, tag_id in existing.items() if name not in names]
+            if removed:
+                cursor.execute(
+                    """
+                    DELETE FROM page_tags
+                    WHERE page_id = ? AND tag_id IN (SELECT value FROM json_each(?))
+                """,
+                    (page_id, json.dumps(removed)),
+                )
+
+            # 新しいタグを追加
+            added = [name for name in names if name not in existing]
+            if added:
+                tag_ids = self.get_or_create_tags(added)
+                cursor.executemany(
+                    "INSERT INTO page_tags (page_id, tag_id) VALUES (?, ?)",
+                    [(page_id, tag_ids[name]) for name in added],
+                )
 
     def get_page_tags(self, page_id: int) -> list[Tag]:
         """ページのタグを取得"""
-        if not self.conn:
-            raise RuntimeError("Database not connected")
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT t.id, t.name
+                FROM tags t
+                JOIN page_tags pt ON t.id = pt.tag_id
+                WHERE pt.page_id = ?
+            """,
+                (page_id,),
+            )
+            rows = cursor.fetchall()
 
-        cursor = self.conn.cursor()
-        cursor.execute(
-            """
-            SELECT t.id, t.name
-            FROM tags t
-            JOIN page_tags pt ON t.id = pt.tag_id
-            WHERE pt.page_id = ?
-        """,
-            (page_id,),
-        )
-        rows = cursor.fetchall()
+            return [Tag(id=row["id"], name=row["name"]) for row in rows]
 
-        return [Tag(id=row["id"], name=row["name"]) for row in rows]
+    def get_tags_for_pages(self, page_ids: list[int]) -> dict[int, list[str]]:
+        """
+        複数ページのタグ名を1クエリで取得
 
-    def get_all_tags(self) -> list[Tag]:
-        """全タグを取得（使用回数付き）"""
-        if not self.conn:
-            raise RuntimeError("Database not connected")
+        Args:
+            page_ids: ページIDのリスト
 
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT t.id, t.name, COUNT(pt.page_id) as page_count
-            FROM tags t
-            LEFT JOIN page_tags pt ON t.id = pt.tag_id
-            GROUP BY t.id, t.name
-            ORDER BY page_count DESC, t.name
-        """)
-        rows = cursor.fetchall()
+        Returns:
+            dict: ページIDをキー、タグ名リストを値とする辞書（タグのないページは含まない）
+        """
+        if not page_ids:
+            return {}
 
-        return [Tag(id=row["id"], name=row["name"], page_count=row["page_count"]) for row in rows]
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            # IDリストはJSON配列として1パラメータで渡す（変数数の上限を気にしなくてよい）
+            cursor.execute(
+                """
+                SELECT pt.page_id, t.name
+                FROM page_tags pt
+                JOIN tags t ON t.id = pt.tag_id
+                WHERE pt.page_id IN (SELECT value FROM json_each(?))
+                ORDER BY pt.page_id, pt.rowid
+            """,
+                (json.dumps(page_ids),),
+            )
+            rows = cursor.fetchall()
+
+        tags_by_page: dict[int, list[str]] = {}
+        for row in rows:
+            tags_by_page.setdefault(row["page_id"], []).append(row["name"])
+        return tags_by_page
+
+    def get_all_tags(self) -> list[Tag]:
+        """全タグを取得（使用回数付き）"""
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT t.id, t.name, COUNT(pt.page_id) as page_count
+                FROM tags t
+                LEFT JOIN page_tags pt ON t.id = pt.tag_id
+                GROUP BY t.id, t.name
+                ORDER BY page_count DESC, t.name
+            """)
+            rows = cursor.fetchall()
+
+            return [
+                Tag(id=row["id"], name=row["name"], page_count=row["page_count"]) for row in rows
+            ]
 
     def get_pages_by_tag(self, tag_name: str) -> list[Page]:
         """タグでページを検索"""
-        if not self.conn:
-            raise RuntimeError("Database not connected")
-
-        cursor = self.conn.cursor()
-        cursor.execute(
-            """
-            SELECT p.*
-            FROM pages p
-            JOIN page_tags pt ON p.id = pt.page_id
-            JOIN tags t ON pt.tag_id = t.id
-            WHERE t.name = ?
-            ORDER BY p.updated_at DESC
-        """,
-            (tag_name,),
-        )
-        rows = cursor.fetchall()
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                SELECT p.*
+                FROM pages p
+                JOIN page_tags pt ON p.id = pt.page_id
+                JOIN tags t ON pt.tag_id = t.id
+                WHERE t.name = ?
+                ORDER BY p.updated_at DESC
+            """,
+                (tag_name,),
+            )
+            rows = cursor.fetchall()
 
-        return [self._row_to_page(row) for row in rows]
+            return [self._row_to_page(row) for row in rows]
 
     # ========== 検索操作 ==========
 
     def index_page_for_search(
         self, page_id: int, slug: str, title: str, content: str, tags: list[str]
     ) -> None:
-        """ページを全文検索インデックスに追加"""
-        if not self.conn:
-            raise RuntimeError("Database not connected")
+        """ページを全文検索インデックスに追加（既存のエントリは置き換え）"""
+        with self._writer() as conn:
+            cursor = conn.cursor()
 
-        cursor = self.conn.cursor()
+            self._delete_search_entry(cursor, page_id)
 
-        # 既存インデックス削除
-        cursor.execute("DELETE FROM pages_fts WHERE rowid = ?", (page_id,))
-
-        # 新規インデックス追加
-        tags_str = " ".join(tags)
+            tags_str = " ".join(tags)
+            cursor.execute(
+                """
+                INSERT INTO page_content (page_id, slug, title, tags, body)
+                VALUES (?, ?, ?, ?, ?)
+            """,
+                (page_id, slug, title, tags_str, _compress_text(content)),
+            )
+            cursor.execute(
+                "INSERT INTO pages_fts (rowid, slug, title, content, tags) VALUES (?, ?, ?, ?, ?)",
+                (page_id, slug, title, content, tags_str),
+            )
+            if self.search_tokenizer == "trigram":
+                cursor.execute(
+                    "INSERT INTO pages_fts_short (rowid, slug, title, content, tags) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (page_id, *_short_index_values(slug, title, content, tags_str)),
+                )
+
+    def _delete_search_entry(self, cursor: sqlite3.Cursor, page_id: int) -> None:
+        """
+        全文検索インデックスからページを削除
+
+        contentless テーブルでは削除するトークンを知るために
+        インデックス時の値を 'delete' コマンドに渡す必要がある。
+        """
         cursor.execute(
-            "INSERT INTO pages_fts (rowid, slug, title, content, tags) VALUES (?, ?, ?, ?, ?)",
-            (page_id, slug, title, content, tags_str),
+            "SELECT slug, title, content, tags FROM page_search_content WHERE page_id = ?",
+            (page_id,),
         )
+        row = cursor.fetchone()
+        if not row:
+            return
 
-        self.conn.commit()
-
-    def search_pages(self, query: str) -> list[Page]:
-        """全文検索"""
-        if not self.conn:
-            raise RuntimeError("Database not connected")
-
-        cursor = self.conn.cursor()
         cursor.execute(
             """
-            SELECT p.*
-            FROM pages p
-            JOIN pages_fts fts ON p.id = fts.rowid
-            WHERE pages_fts MATCH ?
-            ORDER BY rank
+            INSERT INTO pages_fts (pages_fts, rowid, slug, title, content, tags)
+            VALUES ('delete', ?, ?, ?, ?, ?)
         """,
-            (query,),
+            (page_id, row["slug"], row["title"], row["content"], row["tags"]),
+        )
+        if self.search_tokenizer == "trigram":
+            cursor.execute(
+                """
+                INSERT INTO pages_fts_short (pages_fts_short, rowid, slug, title, content, tags)
+                VALUES ('delete', ?, ?, ?, ?, ?)
+            """,
+                (
+                    page_id,
+                    *_short_index_values(row["slug"], row["title"], row["content"], row["tags"]),
+                ),
+            )
+        cursor.execute("DELETE FROM page_content WHERE page_id = ?", (page_id,))
+
+    def rebuild_search_index(self) -> None:
+        """
+        全文検索インデックスを page_content から再構築
+
+        1トランザクションで実行するため、WALモードでは再構築中も
+        読み取り側は再構築前のインデックスで検索できる。
+        """
+        with self._writer() as conn:
+            self._fill_fts(conn.cursor(), self.search_tokenizer)
+
+    def optimize_search_index(self, merge_pages: int | None = None) -> None:
+        """
+        全文検索インデックスのセグメントをマージ
+
+        Args:
+            merge_pages: 指定すると 'merge' コマンドで最大この数のリーフページ分だけ
+                段階的にマージする（短時間で終わる）。Noneなら 'optimize' で全セグメントを統合
+        """
+        tables = (
+            ["pages_fts", "pages_fts_short"]
+            if self.search_tokenizer == "trigram"
+            else ["pages_fts"]
+        )
+        with self._writer() as conn:
+            for table in tables:
+                if merge_pages is None:
+                    conn.execute(f"INSERT INTO {table} ({table}) VALUES ('optimize')")
+                else:
+                    conn.execute(
+                        f"INSERT INTO {table} ({table}, rank) VALUES ('merge', ?)", (merge_pages,)
+                    )
+
+    def search_pages(self, query: str) -> list[Page]:
+        """全文検索（FTS5のクエリ構文。スコア順）"""
+        return self.query_pages(PageQuery(fts_query=query, sort_by="rank"))
+
+    def search_hits(
+        self,
+        query: str,
+        limit: int = 20,
+        offset: int = 0,
+        weights: SearchWeights | None = None,
+        snippet_width: int = 120,
+    ) -> list[SearchHit]:
+        """
+        ランキング付き全文検索（上位 limit 件のみ取得）
+
+        pages_fts は本文を持たないため、抜粋と一致位置は取得した limit 件の本文から
+        Python側で作る（検索語の大文字小文字を区別しない部分一致）。
+
+        Args:
+            query: FTS5のクエリ
+            limit: 取得件数
+            offset: 読み飛ばす件数
+            weights: bm25 の列ごとの重み
+            snippet_width: 抜粋の最大文字数
+
+        Returns:
+            list: 関連度の高い順の検索結果（タグは未設定）
+        """
+        compiler = PageQueryCompiler(PageQuery(fts_query=query), self.search_tokenizer)
+        if compiler.short_fts:
+            return self._short_search_hits(compiler, query, limit, offset, snippet_width)
+
+        weights = weights or SearchWeights()
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            # rank に重みを設定すると FTS5 が上位 limit 件だけを保持して並べ替える
+            cursor.execute(
+                f"""
+                SELECT {_SUMMARY_COLUMNS_P}, fts.rank AS rank,
+                    (SELECT body FROM page_content c WHERE c.page_id = p.id) AS body
+                FROM pages_fts fts
+                JOIN pages p ON p.id = fts.rowid
+                WHERE pages_fts MATCH ? AND fts.rank MATCH ?
+                ORDER BY fts.rank
+                LIMIT ? OFFSET ?
+            """,
+                (query, weights.to_rank_function(), limit, offset),
+            )
+            rows = cursor.fetchall()
+
+        terms = fts_terms(query)
+        return [self._row_to_hit(row, -row["rank"], terms, snippet_width) for row in rows]
+
+    def _short_search_hits(
+        self,
+        compiler: PageQueryCompiler,
+        query: str,
+        limit: int,
+        offset: int,
+        snippet_width: int,
+    ) -> list[SearchHit]:
+        """
+        trigram で短い語を含む検索（語ごとにインデックスを引く）
+
+        スコアがないため新しい順に並べる。
+        """
+        compiler.query.limit = limit
+        compiler.query.offset = offset
+        sql, params = compiler.compile_select(
+            f"{_SUMMARY_COLUMNS_P}, "
+            "(SELECT body FROM page_content c WHERE c.page_id = p.id) AS body"
         )
-        rows = cursor.fetchall()
 
-        return [self._row_to_page(row) for row in rows]
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+        terms = fts_terms(query)
+        return [self._row_to_hit(row, 0.0, terms, snippet_width) for row in rows]
+
+    def _row_to_hit(
+        self, row: sqlite3.Row, score: float, terms: list[str], snippet_width: int
+    ) -> SearchHit:
+        """概要の列と圧縮済み本文 body を含む行から検索結果を作る"""
+        snippet = _make_snippet(_decompress_text(row["body"]) or "", terms, snippet_width)
+        return SearchHit(
+            page=self._row_to_summary(row),
+            score=score,
+            snippet=snippet,
+            highlights=_find_highlights(snippet, terms),
+            title_highlights=_find_highlights(row["title"], terms),
+        )
+
+    def query_pages(self, query: PageQuery) -> list[Page]:
+        """PageQuery をSQLにコンパイルして実行"""
+        sql, params = PageQueryCompiler(query, self.search_tokenizer).compile_select()
+
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+            return [self._row_to_page(row) for row in rows]
+
+    def query_page_summaries(self, query: PageQuery) -> list[PageSummary]:
+        """PageQuery を実行してページ概要を取得"""
+        sql, params = PageQueryCompiler(query, self.search_tokenizer).compile_select(
+            _SUMMARY_COLUMNS_P
+        )
+
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+
+            return [self._row_to_summary(row) for row in rows]
+
+    def count_query_pages(self, query: PageQuery) -> int:
+        """PageQuery に一致するページ数（LIMIT/OFFSETは無視）"""
+        sql, params = PageQueryCompiler(query, self.search_tokenizer).compile_count()
+
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            cursor.execute(sql, params)
+            return int(cursor.fetchone()[0])
+
+    # ========== 同期マニフェスト操作 ==========
+
+    def get_sync_manifest(self, paths: Sequence[str] | None = None) -> dict[str, ManifestEntry]:
+        """
+        同期マニフェストを取得（相対パスをキーとする辞書）
+
+        Args:
+            paths: 取得する相対パス（Noneで全件）
+        """
+        with self._reader() as conn:
+            cursor = conn.cursor()
+            if paths is None:
+                cursor.execute("SELECT path, size, mtime_ns, content_hash FROM sync_manifest")
+            else:
+                cursor.execute(
+                    """
+                    SELECT path, size, mtime_ns, content_hash FROM sync_manifest
+                    WHERE path IN (SELECT value FROM json_each(?))
+                """,
+                    (json.dumps(list(paths), ensure_ascii=False),),
+                )
+            rows = cursor.fetchall()
+
+            return {
+                row["path"]: ManifestEntry(
+                    path=row["path"],
+                    size=row["size"],
+                    mtime_ns=row["mtime_ns"],
+                    content_hash=row["content_hash"],
+                )
+                for row in rows
+            }
+
+    def save_manifest_entry(self, entry: ManifestEntry) -> None:
+        """同期マニフェストのエントリを保存"""
+        with self._writer() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                """
+                INSERT OR REPLACE INTO sync_manifest (path, size, mtime_ns, content_hash)
+                VALUES (?, ?, ?, ?)
+            """,
+                (entry.path, entry.size, entry.mtime_ns, entry.content_hash),
+            )
+
+    def delete_manifest_entry(self, path: str) -> None:
+        """同期マニフェストのエントリを削除"""
+        with self._writer() as conn:
+            cursor = conn.cursor()
+            cursor.execute("DELETE FROM sync_manifest WHERE path = ?", (path,))
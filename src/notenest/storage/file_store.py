@@ -1,18 +1,41 @@
 """ファイルシステムストレージ"""
 
+import hashlib
+import os
+import secrets
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Any
 
 from notenest.core.metadata import MetadataParser
 from notenest.core.page import Page
+from notenest.core.sync import ManifestEntry
+
+# fsync ポリシー
+# - always: 書き込みごとにファイルとディレクトリを fsync（電源断でも失われない）
+# - batched: ファイルの内容は rename 前に毎回 fsync し、rename を永続化するディレクトリの
+#   fsync だけを fsync_batch_size 件ごと、または flush() 時にまとめる。電源断で直近の
+#   置き換えが元に戻ることはあるが、ページが空や途中までの状態で残ることはない
+# - never: fsync しない（OSのページキャッシュ任せ。電源断でページが壊れることがある）
+FSYNC_POLICIES = ("always", "batched", "never")
 
 
 class FileStore:
     """ファイルシステム操作"""
 
-    def __init__(self, workspace_path: Path) -> None:
+    def __init__(
+        self, workspace_path: Path, fsync_policy: str = "batched", fsync_batch_size: int = 32
+    ) -> None:
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Invalid fsync policy: {fsync_policy}")
+
         self.workspace_path = workspace_path
+        self.fsync_policy = fsync_policy
+        self.fsync_batch_size = fsync_batch_size
+        self._unsynced: set[Path] = set()  # rename 後に未 fsync のディレクトリ
+        self._unsynced_count = 0  # 前回の flush 以降に置き換えたファイル数
+        self._fsync_lock = threading.Lock()
         self.pages_dir = workspace_path / "pages"
         self.config_dir = workspace_path / ".notenest"
 
@@ -20,14 +43,30 @@ class FileStore:
         self.pages_dir.mkdir(parents=True, exist_ok=True)
         self.config_dir.mkdir(parents=True, exist_ok=True)
 
+    def __getstate__(self) -> dict[str, Any]:
+        """ワーカープロセスへ渡すためのpickle（fsync待ちの状態は引き継がない）"""
+        state = self.__dict__.copy()
+        del state["_fsync_lock"]
+        state["_unsynced"] = set()
+        state["_unsynced_count"] = 0
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._fsync_lock = threading.Lock()
+
     def save_page_file(self, page: Page) -> Path:
         """ページをマークダウンファイルとして保存"""
-        # ファイルパス決定
-        if page.file_path:
-            file_path = page.file_path
-        else:
-            file_path = self.pages_dir / f"{page.slug}.md"
+        file_path = self.get_page_path(page)
+        self.write_atomic(file_path, self.render_page_file(page))
+        return file_path
+
+    def get_page_path(self, page: Page) -> Path:
+        """ページの保存先（file_path 未設定なら pages/<slug>.md）"""
+        return page.file_path or self.pages_dir / f"{page.slug}.md"
 
+    def render_page_file(self, page: Page) -> bytes:
+        """ページをFrontmatter付きマークダウンに変換"""
         # メタデータ準備
         metadata: dict[str, Any] = {
             "title": page.title,
@@ -46,13 +85,86 @@ class FileStore:
             metadata["custom_fields"] = page.metadata
 
         # Frontmatter付きマークダウン生成
-        markdown_content = MetadataParser.serialize(metadata, page.content)
+        return MetadataParser.serialize(metadata, page.content).encode("utf-8")
+
+    def write_atomic(self, file_path: Path, data: bytes) -> None:
+        """
+        一時ファイルに書き込んでから rename で置き換える
 
-        # ファイル書き込み
+        書き込み途中でクラッシュしても、元のファイルか新しいファイルの
+        どちらかが完全な状態で残る。一時ファイルは同じディレクトリに
+        ドットで始まる .tmp として作るため、ページとしては認識されない。
+        """
+        self.install_staged(self.stage_write(file_path, data), file_path)
+
+    def stage_write(self, file_path: Path, data: bytes) -> Path:
+        """
+        file_path を置き換える内容を一時ファイルに書き込む
+
+        install_staged を呼ぶまで file_path は変化しない。不要になった場合は
+        返された一時ファイルを削除する。
+
+        Returns:
+            Path: 一時ファイルのパス
+        """
         file_path.parent.mkdir(parents=True, exist_ok=True)
-        file_path.write_text(markdown_content, encoding="utf-8")
+        tmp_path = file_path.with_name(f".{file_path.name}.{secrets.token_hex(4)}.tmp")
 
-        return file_path
+        # パーミッションは write_text と同じく umask に従う
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                # rename より先に内容を永続化しないと、電源断で空のファイルに置き換わりうる
+                if self.fsync_policy != "never":
+                    f.flush()
+                    os.fsync(f.fileno())
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        return tmp_path
+
+    def install_staged(self, tmp_path: Path, file_path: Path) -> None:
+        """stage_write で書き込んだ一時ファイルで file_path を置き換える"""
+        try:
+            os.replace(tmp_path, file_path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+        if self.fsync_policy == "always":
+            self._fsync_directory(file_path.parent)
+        elif self.fsync_policy == "batched":
+            with self._fsync_lock:
+                self._unsynced.add(file_path.parent)
+                self._unsynced_count += 1
+                if self._unsynced_count < self.fsync_batch_size:
+                    return
+            self.flush()
+
+    def flush(self) -> None:
+        """batched ポリシーで未 fsync のディレクトリ（rename）をディスクに書き出す"""
+        with self._fsync_lock:
+            directories, self._unsynced = self._unsynced, set()
+            self._unsynced_count = 0
+
+        for directory in directories:
+            self._fsync_directory(directory)
+
+    @staticmethod
+    def _fsync_directory(directory: Path) -> None:
+        """ディレクトリエントリの変更（rename）をディスクに書き出す"""
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            # ディレクトリの fsync に対応していないファイルシステム
+            pass
+        finally:
+            os.close(fd)
 
     def load_page_file(self, file_path: Path) -> Page:
         """マークダウンファイルからページを読み込み"""
@@ -62,9 +174,24 @@ class FileStore:
         # ファイル読み込み
         content = file_path.read_text(encoding="utf-8")
 
+        return self.parse_page_file(file_path, content)
+
+    def load_page_header(self, file_path: Path) -> Page:
+        """Frontmatterだけを読み込んでページを構築（本文は空）"""
+        if not file_path.exists():
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        metadata = MetadataParser.parse_header(file_path)
+        return self._build_page(file_path, metadata, "")
+
+    def parse_page_file(self, file_path: Path, content: str) -> Page:
+        """読み込み済みのマークダウンテキストからページを構築"""
         # Frontmatter解析
         metadata, body = MetadataParser.parse(content)
+        return self._build_page(file_path, metadata, body)
 
+    def _build_page(self, file_path: Path, metadata: dict[str, Any], body: str) -> Page:
+        """メタデータと本文からページを構築"""
         # Pageオブジェクト作成
         slug = file_path.stem
         title = metadata.get("title", slug)
@@ -108,6 +235,40 @@ class FileStore:
         """全ページファイルをリスト"""
         return list(self.pages_dir.glob("**/*.md"))
 
+    def read_page_file(self, file_path: Path) -> tuple[bytes, ManifestEntry]:
+        """
+        ファイル内容とその時点のフィンガープリントを取得
+
+        stat は読み込みに使ったファイルディスクリプタから取得するため、
+        読み込み中に書き換えられても次回の同期で必ず再検出される。
+
+        Returns:
+            (raw_bytes, manifest_entry) のタプル
+        """
+        with file_path.open("rb") as f:
+            stat = os.fstat(f.fileno())
+            raw = f.read()
+
+        entry = ManifestEntry(
+            path=self.get_relative_path(file_path),
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            content_hash=self.hash_content(raw),
+        )
+        return raw, entry
+
+    def get_relative_path(self, file_path: Path) -> str:
+        """pages/ からの相対パス（マニフェストのキー）"""
+        try:
+            return file_path.relative_to(self.pages_dir).as_posix()
+        except ValueError:
+            return file_path.as_posix()
+
+    @staticmethod
+    def hash_content(raw: bytes) -> str:
+        """ファイル内容のハッシュ"""
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
     def get_db_path(self) -> Path:
         """データベースファイルのパス"""
         return self.config_dir / "notenest.db"
@@ -0,0 +1,347 @@
+"""PageQuery → SQL コンパイラ"""
+
+import json
+import re
+from typing import Any, NoReturn
+
+from notenest.core.pagination import SORT_FIELDS
+from notenest.core.search import PageQuery
+
+# 全文検索のトークナイザープロファイル（名前 → FTS5 の tokenize 指定）
+# - porter: 英語向け（語幹処理あり）。日本語は分かち書きされないため文中の語を検索できない
+# - trigram: 3文字単位のインデックス。言語によらず部分一致で検索できる
+#   （3文字未満の語は pages_fts_short の2文字単位のインデックスで検索する）
+SEARCH_TOKENIZERS = {
+    "porter": "porter unicode61",
+    "trigram": "trigram",
+}
+
+# trigram でインデックスを使える最小の語の長さ
+_TRIGRAM_MIN_LENGTH = 3
+
+# 短い語のインデックスに入れる文字の並び（英数字・かな漢字などの連続。記号と _ で区切る）
+_WORD_RUN = re.compile(r"[^\W_]+")
+
+# FTS5 クエリの字句（フレーズ・括弧・それ以外の語）
+_FTS_TOKEN = re.compile(r'"((?:[^"]|"")*)"|([()])|([^\s()"]+)')
+
+# FTS5 の演算子（大文字のみ演算子として扱われる）
+_FTS_OPERATORS = ("AND", "OR", "NOT")
+
+# 語ごとの検索で再現できない FTS5 の構文（列フィルタ・前方一致・先頭一致・NEAR）
+_FTS_UNSUPPORTED = re.compile(r"[:*^+]|^NEAR$")
+# 語の長さを判定するときに除く記号（列フィルタの接頭辞・前方一致・先頭一致）
+_FTS_TERM_SYNTAX = re.compile(r"^\w+:|[*^+]")
+
+# ソートキーとORDER BY句の対応
+_SORT_COLUMNS = {
+    "updated_at": "p.updated_at",
+    "created_at": "p.created_at",
+    "title": "p.title COLLATE NOCASE",
+    "slug": "p.slug COLLATE NOCASE",
+}
+
+
+class PageQueryCompiler:
+    """
+    PageQuery を pages / page_tags / pages_fts / pages_fts_short / page_search_content /
+    metadata_json を対象とした1本のSQLに変換する
+
+    条件の意味は AdvancedSearch.complex_search に合わせている。
+    ただし大文字小文字の同一視はSQLiteの lower() に従う（ASCIIのみ）。
+    """
+
+    def __init__(self, query: PageQuery, tokenizer: str = "porter") -> None:
+        if tokenizer not in SEARCH_TOKENIZERS:
+            raise ValueError(f"Invalid tokenizer: {tokenizer}")
+        if query.date_field not in ("created_at", "updated_at"):
+            raise ValueError(f"Invalid date field: {query.date_field}")
+        if query.sort_by not in SORT_FIELDS and query.sort_by != "rank":
+            raise ValueError(f"Invalid sort field: {query.sort_by}")
+        if query.sort_by == "rank" and not query.fts_query:
+            raise ValueError("sort_by=rank requires fts_query")
+
+        self.query = query
+        self.tokenizer = tokenizer
+        # trigram で短すぎる語を含む全文検索は、語ごとに pages_fts / pages_fts_short を引く
+        self.short_fts = query.fts_query is not None and self._is_short_for_trigram(query.fts_query)
+
+    def compile_select(self, columns: str = "p.*") -> tuple[str, list[Any]]:
+        """ページ行を返すSELECT文（columns は pages を p として参照する列リスト）"""
+        query = self.query
+        joins, where, params = self._compile_filters()
+
+        sql = f"SELECT {columns} FROM pages p{joins}{where}"
+
+        direction = "DESC" if query.reverse else "ASC"
+        if query.sort_by == "rank" and self.short_fts:
+            # 語ごとに引いた場合はスコアがないので新しい順
+            sql += " ORDER BY p.updated_at DESC, p.id DESC"
+        elif query.sort_by == "rank":
+            sql += " ORDER BY fts.rank, p.id"
+        else:
+            sql += f" ORDER BY {_SORT_COLUMNS[query.sort_by]} {direction}, p.id {direction}"
+
+        if query.limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([query.limit, query.offset])
+        elif query.offset:
+            sql += " LIMIT -1 OFFSET ?"
+            params.append(query.offset)
+
+        return sql, params
+
+    def compile_count(self) -> tuple[str, list[Any]]:
+        """一致件数を返すSELECT COUNT(*)文（LIMIT/OFFSETは無視）"""
+        joins, where, params = self._compile_filters()
+        return f"SELECT COUNT(*) FROM pages p{joins}{where}", params
+
+    def _compile_filters(self) -> tuple[str, str, list[Any]]:
+        """JOIN句・WHERE句・パラメータを組み立て"""
+        query = self.query
+        joins = ""
+        conditions: list[str] = []
+        params: list[Any] = []
+
+        # 全文検索（1回の MATCH で済む場合はランキングのためJOINする）
+        if query.fts_query and self.short_fts:
+            match, match_params = _FtsTermCompiler(query.fts_query).compile()
+            conditions.append(match)
+            params.extend(match_params)
+        elif query.fts_query:
+            joins = " JOIN pages_fts fts ON fts.rowid = p.id"
+            conditions.append("pages_fts MATCH ?")
+            params.append(query.fts_query)
+
+        # テキスト部分一致（タイトル・本文）
+        if (
+            query.text_query
+            and self.tokenizer == "trigram"
+            and len(query.text_query) >= _TRIGRAM_MIN_LENGTH
+        ):
+            # trigram のフレーズ検索は部分一致と同じ意味になるためインデックスを使える
+            phrase = query.text_query.replace('"', '""')
+            conditions.append("p.id IN (SELECT rowid FROM pages_fts WHERE pages_fts MATCH ?)")
+            params.append(f'{{title content}} : "{phrase}"')
+        elif (
+            query.text_query
+            and self.tokenizer == "trigram"
+            and _WORD_RUN.fullmatch(query.text_query)
+        ):
+            conditions.append(
+                "p.id IN (SELECT rowid FROM pages_fts_short WHERE pages_fts_short MATCH ?)"
+            )
+            params.append(f"{{title content}} : {_short_term_match(query.text_query)}")
+        elif query.text_query:
+            conditions.append(
+                "(instr(lower(p.title), lower(?)) > 0 OR p.id IN ("
+                "SELECT page_id FROM page_search_content WHERE instr(lower(content), lower(?)) > 0))"
+            )
+            params.extend([query.text_query, query.text_query])
+
+        # タグフィルタ
+        if query.tags:
+            tag_subquery = (
+                "SELECT pt.page_id FROM page_tags pt JOIN tags t ON t.id = pt.tag_id "
+                "WHERE t.name IN (SELECT value FROM json_each(?))"
+            )
+            params.append(json.dumps(query.tags, ensure_ascii=False))
+            if query.match_all_tags:
+                tag_subquery += " GROUP BY pt.page_id HAVING COUNT(DISTINCT t.name) = ?"
+                params.append(len(set(query.tags)))
+            conditions.append(f"p.id IN ({tag_subquery})")
+
+        # メタデータ型フィルタ
+        if query.metadata_type:
+            conditions.append("p.metadata_type = ?")
+            params.append(query.metadata_type)
+
+        # メタデータフィールドフィルタ
+        if query.metadata_filters:
+            for field_name, field_value in query.metadata_filters.items():
+                condition, condition_params = self._compile_metadata_filter(field_name, field_value)
+                conditions.append(condition)
+                params.extend(condition_params)
+
+        # 日付範囲フィルタ
+        if query.date_range:
+            column = f"p.{query.date_field}"
+            if query.date_range.start_date:
+                conditions.append(f"{column} >= ?")
+                params.append(query.date_range.start_date.isoformat())
+            if query.date_range.end_date:
+                conditions.append(f"{column} <= ?")
+                params.append(query.date_range.end_date.isoformat())
+
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return joins, where, params
+
+    def _is_short_for_trigram(self, fts_query: str) -> bool:
+        """trigram でインデックスを使えない短い語を含むか（演算子・括弧は語に含めない）"""
+        if self.tokenizer != "trigram":
+            return False
+        return any(len(term) < _TRIGRAM_MIN_LENGTH for term in fts_terms(fts_query))
+
+    @staticmethod
+    def _compile_metadata_filter(field_name: str, field_value: Any) -> tuple[str, list[Any]]:
+        """
+        メタデータフィールド条件（AdvancedSearch.filter_by_metadata_field と同じ意味）
+
+        - 文字列: 文字列フィールドへの部分一致
+        - 数値: 完全一致
+        - リスト: 配列フィールドがいずれかの要素を含む
+        - その他: 完全一致
+        """
+        path = f'$."{field_name}"'
+        extract = "json_extract(p.metadata_json, ?)"
+        json_type = "json_type(p.metadata_json, ?)"
+
+        if isinstance(field_value, str):
+            return (
+                f"({json_type} = 'text' AND instr(lower({extract}), lower(?)) > 0)",
+                [path, path, field_value],
+            )
+        if isinstance(field_value, (int, float)):
+            return f"{extract} = ?", [path, field_value]
+        if isinstance(field_value, list):
+            return (
+                f"({json_type} = 'array' AND EXISTS ("
+                "SELECT 1 FROM json_each(p.metadata_json, ?) "
+                "WHERE value IN (SELECT value FROM json_each(?))))",
+                [path, path, json.dumps(field_value, ensure_ascii=False)],
+            )
+        if field_value is None:
+            return f"{json_type} = 'null'", [path]
+        return (
+            f"{extract} = json(?)",
+            [path, json.dumps(field_value, ensure_ascii=False, separators=(",", ":"))],
+        )
+
+
+def _tokenize_fts(fts_query: str) -> list[tuple[str, str]]:
+    """FTS5 クエリを (種類, 値) の列に分解（種類は phrase, paren, operator, term）"""
+    tokens = []
+    for match in _FTS_TOKEN.finditer(fts_query):
+        phrase, paren, word = match.groups()
+        if phrase is not None:
+            tokens.append(("phrase", phrase.replace('""', '"')))
+        elif paren:
+            tokens.append(("paren", paren))
+        elif word in _FTS_OPERATORS:
+            tokens.append(("operator", word))
+        else:
+            tokens.append(("term", word))
+    return tokens
+
+
+def short_index_text(text: str) -> str:
+    """
+    pages_fts_short に入れる文字列（文字の並びを2文字ずつずらして区切り、末尾の1文字を加える）
+
+    例えば "材料を買う" は "材料 料を を買 買う う" になる。2文字の語は1つのトークンとして、
+    1文字の語は前方一致で、文中のどこにあってもインデックスから引ける。
+    """
+    tokens: list[str] = []
+    for run in _WORD_RUN.findall(text):
+        tokens.extend(run[i : i + 2] for i in range(len(run) - 1))
+        tokens.append(run[-1])
+    return " ".join(tokens)
+
+
+def _short_term_match(term: str) -> str:
+    """pages_fts_short で短い語（1〜2文字）を引く MATCH 式"""
+    return f'"{term}" *' if len(term) == 1 else f'"{term}"'
+
+
+def fts_terms(fts_query: str) -> list[str]:
+    """FTS5 クエリ中の検索語・フレーズ（演算子・括弧・引用符と、列フィルタ・前方一致の記号を除く）"""
+    terms = []
+    for kind, value in _tokenize_fts(fts_query):
+        if kind == "term" and value != "NEAR":
+            value = _FTS_TERM_SYNTAX.sub("", value)
+        elif kind != "phrase":
+            continue
+        if value:
+            terms.append(value)
+    return terms
+
+
+class _FtsTermCompiler:
+    """
+    trigram で扱えない短い語を含む FTS5 クエリを、語ごとのインデックス検索の条件に変換する
+
+    3文字以上の語・フレーズは pages_fts、それより短い語は pages_fts_short を引き、
+    AND（暗黙を含む）・OR・NOT と括弧は FTS5 と同じ優先順位（NOT > AND > OR）で
+    組み立てる。列フィルタ・前方一致・NEAR と、記号を含む短い語は
+    インデックスで再現できないため ValueError とする。
+    """
+
+    def __init__(self, fts_query: str) -> None:
+        self.fts_query = fts_query
+        self.tokens = _tokenize_fts(fts_query)
+        self.position = 0
+        self.params: list[str] = []
+
+    def compile(self) -> tuple[str, list[str]]:
+        """WHERE 句に入れる条件とパラメータ"""
+        if not self.tokens:
+            return "1", []
+        sql = self._or()
+        if self.position < len(self.tokens):
+            self._error()
+        return sql, self.params
+
+    def _peek(self) -> tuple[str, str] | None:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _error(self) -> NoReturn:
+        raise ValueError(f"Invalid search query: {self.fts_query}")
+
+    def _or(self) -> str:
+        parts = [self._and()]
+        while self._peek() == ("operator", "OR"):
+            self.position += 1
+            parts.append(self._and())
+        return parts[0] if len(parts) == 1 else f"({' OR '.join(parts)})"
+
+    def _and(self) -> str:
+        parts = [self._not()]
+        while (token := self._peek()) is not None:
+            if token == ("operator", "AND"):
+                self.position += 1
+            elif token[0] not in ("term", "phrase") and token != ("paren", "("):
+                break
+            parts.append(self._not())
+        return parts[0] if len(parts) == 1 else f"({' AND '.join(parts)})"
+
+    def _not(self) -> str:
+        sql = self._primary()
+        while self._peek() == ("operator", "NOT"):
+            self.position += 1
+            sql = f"({sql} AND NOT {self._primary()})"
+        return sql
+
+    def _primary(self) -> str:
+        token = self._peek()
+        if token is None:
+            self._error()
+        self.position += 1
+        kind, value = token
+        if token == ("paren", "("):
+            sql = self._or()
+            if self._peek() != ("paren", ")"):
+                self._error()
+            self.position += 1
+            return sql
+        if kind == "term" and _FTS_UNSUPPORTED.search(value):
+            raise ValueError(f"Unsupported syntax for short search terms: {value}")
+        if kind not in ("term", "phrase"):
+            self._error()
+        if len(value) >= _TRIGRAM_MIN_LENGTH:
+            phrase = value.replace('"', '""')
+            self.params.append(f'"{phrase}"')
+            return "p.id IN (SELECT rowid FROM pages_fts WHERE pages_fts MATCH ?)"
+        if not _WORD_RUN.fullmatch(value):
+            raise ValueError(f"Short search terms must be letters or digits: {value}")
+        self.params.append(_short_term_match(value))
+        return "p.id IN (SELECT rowid FROM pages_fts_short WHERE pages_fts_short MATCH ?)"
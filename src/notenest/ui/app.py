@@ -10,6 +10,8 @@ from textual.containers import Vertical
 from textual.widgets import Footer, Header, Input, Label, ListItem, ListView, Markdown, Static
 
 from notenest.core.repository import Repository
+from notenest.core.sync import SyncResult
+from notenest.core.watcher import WorkspaceWatcher
 
 
 class PageListItem(ListItem):
@@ -74,11 +76,15 @@ class NoteNestApp(App[None]):
         Binding("r", "refresh", "Refresh"),
     ]
 
-    def __init__(self, workspace_path: Path) -> None:
+    def __init__(self, workspace_path: Path, watch: bool = True) -> None:
         super().__init__()
         self.workspace_path = workspace_path
         self.repo = Repository(workspace_path)
         self.current_page_slug: str | None = None
+        # 外部エディタなどによるファイル変更を監視してDBに反映
+        self.watcher = (
+            WorkspaceWatcher(self.repo, on_change=self._on_files_changed) if watch else None
+        )
 
     def compose(self) -> ComposeResult:
         """UIコンポーネント構成"""
@@ -104,6 +110,19 @@ class NoteNestApp(App[None]):
         self.repo.sync_from_files()
         self.refresh_page_list()
 
+        if self.watcher:
+            self.watcher.start()
+
+    def _on_files_changed(self, result: SyncResult) -> None:
+        """ファイル監視スレッドから呼ばれるコールバック"""
+        self.call_from_thread(self._reload_after_sync)
+
+    def _reload_after_sync(self) -> None:
+        """同期後に表示を更新"""
+        self.refresh_page_list()
+        if self.current_page_slug:
+            self.show_page(self.current_page_slug)
+
     def refresh_page_list(self) -> None:
         """ページリストを更新"""
         page_list = self.query_one("#page-list", ListView)
@@ -191,8 +210,8 @@ Content here...
         editor = os.environ.get("EDITOR", "vim")
         subprocess.run([editor, str(page.file_path)])
 
-        # 編集後に再読み込み
-        self.repo.sync_from_files()
+        # 編集後に再読み込み（編集したファイルだけを同期）
+        self.repo.sync_paths([page.file_path])
         self.show_page(self.current_page_slug)
         self.refresh_page_list()
 
@@ -244,8 +263,10 @@ Content here...
 
     def action_refresh(self) -> None:
         """リフレッシュ"""
-        self.repo.sync_from_files()
+        result = self.repo.sync_from_files()
         self.refresh_page_list()
+        if result.changed or result.errors:
+            self.notify(f"Synced: {result}")
 
     def on_input_changed(self, event: Input.Changed) -> None:
         """検索ボックス入力時"""
@@ -268,4 +289,6 @@ Content here...
 
     def on_unmount(self) -> None:
         """アンマウント時のクリーンアップ"""
+        if self.watcher:
+            self.watcher.stop()
         self.repo.close()
@@ -0,0 +1,62 @@
+"""HTTPキャッシュの検証（ETag / Last-Modified と 304 Not Modified）"""
+
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import Request, Response
+
+from notenest.core.revision import Revision
+
+
+def check_not_modified(request: Request, response: Response, revision: Revision) -> Response | None:
+    """
+    条件付きリクエストを判定
+
+    レスポンスに ETag・Last-Modified・Cache-Control: no-cache を設定する。
+    クライアントの持つ版が最新なら、本文を作らずに返す 304 レスポンスを返す。
+
+    Args:
+        request: リクエスト（If-None-Match / If-Modified-Since を参照）
+        response: ルートに注入されたレスポンス（ヘッダーを設定する）
+        revision: 返そうとしているリソースの版
+
+    Returns:
+        Response: 304 レスポンス。本文を返す必要があればNone
+    """
+    etag = f'"{revision.tag}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    modified_at = _to_utc(revision.modified_at) if revision.modified_at else None
+    if modified_at:
+        headers["Last-Modified"] = format_datetime(modified_at, usegmt=True)
+
+    if _is_not_modified(request, etag, modified_at):
+        return Response(status_code=304, headers=headers)
+
+    response.headers.update(headers)
+    return None
+
+
+def _is_not_modified(request: Request, etag: str, modified_at: datetime | None) -> bool:
+    """If-None-Match を優先し、無ければ If-Modified-Since で判定（RFC 9110 13.2.2）"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # GET では弱い比較（W/ の有無を無視）を使う
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or modified_at is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)  # HTTPの日時はGMT
+    # Last-Modified は秒単位なので、秒未満を切り捨てて比較する
+    return modified_at.replace(microsecond=0) <= since
+
+
+def _to_utc(value: datetime) -> datetime:
+    """タイムゾーンなしの日時はローカル時刻とみなしてUTCに変換"""
+    return value.astimezone(UTC)
@@ -1,23 +1,76 @@
 """API dependencies"""
 
+import os
+import threading
 from pathlib import Path
 
 from notenest.core.repository import Repository
+from notenest.core.watcher import WorkspaceWatcher
 from notenest.plugins.registry import PluginRegistry, get_global_registry
+from notenest.storage.db_store import ConnectionProfile
 
 # グローバル状態
 app_state: dict[str, object] = {}
 
+# ルートはスレッドプールから呼ばれるため、初期化を1回に限定する
+_state_lock = threading.Lock()
+
+# スレッドプールの既定サイズ
+DEFAULT_API_THREADS = 16
+
+
+def get_api_threads() -> int:
+    """
+    リクエストを処理するスレッド数（環境変数 NOTENEST_API_THREADS）
+
+    Repository を使うルートは同期関数として定義しており、FastAPI が
+    このサイズに制限したスレッドプールで実行する。
+    """
+    return max(1, int(os.environ.get("NOTENEST_API_THREADS", DEFAULT_API_THREADS)))
+
 
 def get_repository() -> Repository:
     """Repositoryインスタンスを取得"""
     if "repository" not in app_state:
-        workspace = Path("./workspace")
-        workspace.mkdir(exist_ok=True)
-        app_state["repository"] = Repository(workspace)
+        with _state_lock:
+            if "repository" not in app_state:
+                workspace = Path("./workspace")
+                workspace.mkdir(exist_ok=True)
+                # NOTENEST_WRITE_BEHIND（秒）: 自動保存などの連続したPUTをまとめて書き込む
+                write_behind = os.environ.get("NOTENEST_WRITE_BEHIND")
+                app_state["repository"] = Repository(
+                    workspace,
+                    # 各スレッドが読み取り専用接続を待たずに使えるようにする
+                    connection_profile=ConnectionProfile(read_pool_size=get_api_threads()),
+                    write_behind_delay=float(write_behind) if write_behind else None,
+                )
     return app_state["repository"]  # type: ignore
 
 
 def get_plugin_registry() -> PluginRegistry:
     """PluginRegistryインスタンスを取得"""
     return get_global_registry()
+
+
+def start_watcher() -> WorkspaceWatcher | None:
+    """
+    環境変数 NOTENEST_WATCH=1 の場合にファイル監視を開始
+
+    外部エディタで編集されたページを、APIの再起動なしでDBに反映する。
+    """
+    if os.environ.get("NOTENEST_WATCH") != "1":
+        return None
+
+    with _state_lock:
+        if "watcher" not in app_state:
+            watcher = WorkspaceWatcher(get_repository())
+            watcher.start()
+            app_state["watcher"] = watcher
+        return app_state["watcher"]  # type: ignore
+
+
+def stop_watcher() -> None:
+    """ファイル監視を停止"""
+    watcher = app_state.pop("watcher", None)
+    if isinstance(watcher, WorkspaceWatcher):
+        watcher.stop()
@@ -1,18 +1,40 @@
 """FastAPI application"""
 
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from pathlib import Path
 
+from anyio import to_thread
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
-from web.api.routes import pages, plugins, search, tags
+from notenest.core.repository import Repository
+from web.api.dependencies import app_state, get_api_threads, start_watcher, stop_watcher
+from web.api.routes import graph, pages, plugins, search, tags
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """起動・終了処理（スレッドプールの設定、ファイル監視の開始・停止、遅延中の書き込みの反映）"""
+    # 同期関数のルートを実行するスレッドプールの上限
+    to_thread.current_default_thread_limiter().total_tokens = get_api_threads()
+    start_watcher()
+    yield
+    stop_watcher()
+
+    # 遅延中の書き込みを反映
+    repository = app_state.get("repository")
+    if isinstance(repository, Repository):
+        repository.flush()
+
 
 # FastAPIアプリケーション作成
 app = FastAPI(
     title="NoteNest API",
     description="マークダウンベース ナレッジベース・Wikiシステム",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # CORS設定
@@ -25,10 +47,13 @@ app.add_middleware(
 )
 
 # ルーター登録（APIルートは /api/ 配下のみ）
+# Repository を使うルートはイベントループを止めないよう同期関数（def）で定義し、
+# FastAPI のスレッドプールで実行する
 app.include_router(pages.router, prefix="/api/pages", tags=["pages"])
 app.include_router(tags.router, prefix="/api/tags", tags=["tags"])
 app.include_router(search.router, prefix="/api/search", tags=["search"])
 app.include_router(plugins.router, prefix="/api/plugins", tags=["plugins"])
+app.include_router(graph.router, prefix="/api/graph", tags=["graph"])
 
 
 @app.get("/api")
@@ -1,6 +1,7 @@
 """Pydantic models for API"""
 
 from datetime import datetime
+from typing import Literal
 
 from pydantic import BaseModel, Field
 
@@ -45,6 +46,27 @@ class PageListResponse(BaseModel):
 
     pages: list[PageResponse]
     total: int
+    next_cursor: str | None = None  # キーセットページネーション用（sort_by=updated_at のみ）
+
+
+class PageSummaryResponse(BaseModel):
+    """ページ概要レスポンス（本文・メタデータを含まない）"""
+
+    id: int
+    slug: str
+    title: str
+    metadata_type: str
+    created_at: datetime
+    updated_at: datetime
+    tags: list[str] = Field(default_factory=list)
+
+
+class PageSummaryListResponse(BaseModel):
+    """ページ概要一覧レスポンス（fields=summary 指定時）"""
+
+    pages: list[PageSummaryResponse]
+    total: int
+    next_cursor: str | None = None
 
 
 class TagResponse(BaseModel):
@@ -64,6 +86,82 @@ class SearchQuery(BaseModel):
     end_date: datetime | None = None
     limit: int = 50
     offset: int = 0
+    fields: Literal["full", "summary"] = "full"
+
+
+class SearchHitResponse(BaseModel):
+    """ランキング付き検索結果"""
+
+    page: PageSummaryResponse
+    score: float
+    snippet: str
+    highlights: list[tuple[int, int]] = Field(default_factory=list)  # snippet 内の一致範囲
+    title_highlights: list[tuple[int, int]] = Field(default_factory=list)  # title 内の一致範囲
+
+
+class SearchHitListResponse(BaseModel):
+    """ランキング付き検索結果一覧"""
+
+    hits: list[SearchHitResponse]
+    total: int
+
+
+class BacklinkResponse(BaseModel):
+    """バックリンク（リンク元ページの概要とリンク周辺の抜粋）"""
+
+    page: PageSummaryResponse
+    snippet: str
+    highlights: list[tuple[int, int]] = Field(default_factory=list)  # snippet 内のリンクの範囲
+
+
+class BacklinkListResponse(BaseModel):
+    """バックリンク一覧"""
+
+    backlinks: list[BacklinkResponse]
+    total: int
+
+
+class GraphRankResponse(BaseModel):
+    """PageRank の結果"""
+
+    slug: str
+    score: float
+
+
+class GraphRankListResponse(BaseModel):
+    """PageRank の上位ページ"""
+
+    pages: list[GraphRankResponse]
+    total: int  # 全ページ数
+
+
+class GraphNodeResponse(BaseModel):
+    """近傍のページと起点からの距離"""
+
+    slug: str
+    distance: int
+
+
+class GraphNeighborhoodResponse(BaseModel):
+    """k-hop 近傍"""
+
+    slug: str
+    hops: int
+    nodes: list[GraphNodeResponse]
+
+
+class GraphPathResponse(BaseModel):
+    """最短経路"""
+
+    path: list[str]
+    length: int  # たどるリンクの数
+
+
+class GraphComponentsResponse(BaseModel):
+    """連結成分"""
+
+    components: list[list[str]]
+    total: int
 
 
 class PluginResponse(BaseModel):
@@ -0,0 +1,83 @@
+"""Graph API routes"""
+
+from fastapi import APIRouter, HTTPException, Query
+
+from notenest.core.graph_analytics import Direction
+from notenest.core.repository import Repository
+from web.api.dependencies import get_repository
+from web.api.models import (
+    GraphComponentsResponse,
+    GraphNeighborhoodResponse,
+    GraphNodeResponse,
+    GraphPathResponse,
+    GraphRankListResponse,
+    GraphRankResponse,
+)
+
+router = APIRouter()
+
+
+@router.get("/pagerank", response_model=GraphRankListResponse)
+def pagerank(
+    limit: int = Query(20, ge=1, le=1000),
+    damping: float = Query(0.85, ge=0, le=1),
+) -> GraphRankListResponse:
+    """PageRank の上位ページ"""
+    repo: Repository = get_repository()
+    analytics = repo.graph_analytics
+
+    top = analytics.top_pages(limit=limit, damping=damping)
+    return GraphRankListResponse(
+        pages=[GraphRankResponse(slug=slug, score=score) for slug, score in top],
+        total=repo.link_graph.page_count,
+    )
+
+
+@router.get("/neighborhood/{slug}", response_model=GraphNeighborhoodResponse)
+def neighborhood(
+    slug: str,
+    hops: int = Query(1, ge=1, le=10),
+    direction: Direction = "out",
+) -> GraphNeighborhoodResponse:
+    """リンクを hops 回以内でたどれるページ"""
+    repo: Repository = get_repository()
+    if not repo.link_graph.has_page(slug):
+        raise HTTPException(status_code=404, detail=f"Page '{slug}' not found")
+
+    nodes = repo.graph_analytics.neighborhood(slug, hops=hops, direction=direction)
+    return GraphNeighborhoodResponse(
+        slug=slug,
+        hops=hops,
+        nodes=[GraphNodeResponse(slug=node, distance=distance) for node, distance in nodes.items()],
+    )
+
+
+@router.get("/path", response_model=GraphPathResponse)
+def shortest_path(
+    source: str = Query(..., min_length=1),
+    target: str = Query(..., min_length=1),
+    direction: Direction = "out",
+) -> GraphPathResponse:
+    """2ページ間の最短経路"""
+    repo: Repository = get_repository()
+    for slug in (source, target):
+        if not repo.link_graph.has_page(slug):
+            raise HTTPException(status_code=404, detail=f"Page '{slug}' not found")
+
+    path = repo.graph_analytics.shortest_path(source, target, direction=direction)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"No path from '{source}' to '{target}'")
+
+    return GraphPathResponse(path=path, length=len(path) - 1)
+
+
+@router.get("/components", response_model=GraphComponentsResponse)
+def components(
+    min_size: int = Query(1, ge=1),
+    limit: int | None = Query(None, ge=1),
+) -> GraphComponentsResponse:
+    """弱連結成分（大きい順）"""
+    repo: Repository = get_repository()
+    groups = [group for group in repo.graph_analytics.components() if len(group) >= min_size]
+
+    return GraphComponentsResponse(components=groups[:limit], total=len(groups))
@@ -1,11 +1,23 @@
 """Pages API routes"""
 
-from fastapi import APIRouter, HTTPException
+from typing import Literal
 
-from notenest.core.page import Page
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+
+from notenest.core.page import Page, PageSummary
 from notenest.core.repository import Repository
+from web.api.caching import check_not_modified
 from web.api.dependencies import get_repository
-from web.api.models import PageCreate, PageListResponse, PageResponse, PageUpdate
+from web.api.models import (
+    BacklinkListResponse,
+    BacklinkResponse,
+    PageCreate,
+    PageListResponse,
+    PageResponse,
+    PageSummaryListResponse,
+    PageSummaryResponse,
+    PageUpdate,
+)
 
 router = APIRouter()
 
@@ -31,26 +43,82 @@ def _page_to_response(page: Page) -> PageResponse:
     )
 
 
-@router.get("", response_model=PageListResponse)
-async def list_pages(limit: int = 50, offset: int = 0) -> PageListResponse:
-    """ページ一覧を取得"""
+def _summary_to_response(summary: PageSummary) -> PageSummaryResponse:
+    """PageSummaryをPageSummaryResponseに変換"""
+    return PageSummaryResponse(
+        id=summary.id,
+        slug=summary.slug,
+        title=summary.title,
+        metadata_type=summary.metadata_type,
+        created_at=summary.created_at,
+        updated_at=summary.updated_at,
+        tags=summary.tags,
+    )
+
+
+@router.get("", response_model=PageListResponse | PageSummaryListResponse)
+def list_pages(
+    request: Request,
+    response: Response,
+    limit: int = Query(50, ge=1),
+    offset: int = Query(0, ge=0),
+    sort_by: Literal["updated_at", "created_at", "title", "slug"] = "updated_at",
+    order: Literal["asc", "desc"] = "desc",
+    cursor: str | None = None,
+    fields: Literal["full", "summary"] = "full",
+) -> PageListResponse | PageSummaryListResponse | Response:
+    """ページ一覧を取得（fields=summary で本文・メタデータを省略）"""
     repo: Repository = get_repository()
-    all_pages = repo.list_pages()
 
-    # ページネーション
-    total = len(all_pages)
-    pages = all_pages[offset : offset + limit]
+    if cursor and sort_by != "updated_at":
+        raise HTTPException(status_code=400, detail="cursor requires sort_by=updated_at")
+
+    not_modified = check_not_modified(request, response, repo.get_workspace_revision())
+    if not_modified:
+        return not_modified
+
+    # ページネーション・ソートはDB側で実行
+    try:
+        if fields == "summary":
+            summaries = repo.list_page_summaries(
+                limit=limit, offset=offset, sort_by=sort_by, order=order, cursor=cursor
+            )
+        else:
+            pages = repo.list_pages(
+                limit=limit, offset=offset, sort_by=sort_by, order=order, cursor=cursor
+            )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    if fields == "summary":
+        return PageSummaryListResponse(
+            pages=[_summary_to_response(s) for s in summaries],
+            total=repo.count_pages(),
+            next_cursor=repo.next_cursor(summaries, limit) if sort_by == "updated_at" else None,
+        )
+
+    next_cursor = repo.next_cursor(pages, limit) if sort_by == "updated_at" else None
 
     return PageListResponse(
         pages=[_page_to_response(p) for p in pages],
-        total=total,
+        total=repo.count_pages(),
+        next_cursor=next_cursor,
     )
 
 
 @router.get("/{slug}", response_model=PageResponse)
-async def get_page(slug: str) -> PageResponse:
+def get_page(slug: str, request: Request, response: Response) -> PageResponse | Response:
     """ページを取得"""
     repo: Repository = get_repository()
+
+    # 本文を読み込む前に、pages行とファイルの stat で 304 を判定する
+    # （アプリの外で編集されたファイルには検証子を付けない）
+    revision = repo.get_page_revision(slug)
+    if revision:
+        not_modified = check_not_modified(request, response, revision)
+        if not_modified:
+            return not_modified
+
     page = repo.get_page(slug)
 
     if not page:
@@ -60,7 +128,7 @@ async def get_page(slug: str) -> PageResponse:
 
 
 @router.post("", response_model=PageResponse, status_code=201)
-async def create_page(page_data: PageCreate) -> PageResponse:
+def create_page(page_data: PageCreate) -> PageResponse:
     """ページを作成"""
     repo: Repository = get_repository()
 
@@ -86,7 +154,7 @@ async def create_page(page_data: PageCreate) -> PageResponse:
 
 
 @router.put("/{slug}", response_model=PageResponse)
-async def update_page(slug: str, page_data: PageUpdate) -> PageResponse:
+def update_page(slug: str, page_data: PageUpdate) -> PageResponse:
     """ページを更新"""
     repo: Repository = get_repository()
 
@@ -112,7 +180,7 @@ async def update_page(slug: str, page_data: PageUpdate) -> PageResponse:
 
 
 @router.delete("/{slug}", status_code=204)
-async def delete_page(slug: str) -> None:
+def delete_page(slug: str) -> None:
     """ページを削除"""
     repo: Repository = get_repository()
 
@@ -123,27 +191,34 @@ async def delete_page(slug: str) -> None:
     repo.delete_page(slug)
 
 
-@router.get("/{slug}/backlinks", response_model=PageListResponse)
-async def get_backlinks(slug: str) -> PageListResponse:
-    """バックリンクを取得"""
+@router.get("/{slug}/backlinks", response_model=BacklinkListResponse)
+def get_backlinks(
+    slug: str,
+    request: Request,
+    response: Response,
+    limit: int = Query(50, ge=1),
+    offset: int = Query(0, ge=0),
+) -> BacklinkListResponse | Response:
+    """バックリンク（リンク元ページの概要とリンク周辺の抜粋）を取得"""
     repo: Repository = get_repository()
 
     # ページ存在確認
-    page = repo.get_page(slug)
-    if not page:
+    if not repo.link_graph.has_page(slug):
         raise HTTPException(status_code=404, detail=f"Page '{slug}' not found")
 
-    # バックリンク取得
-    backlinks = repo.get_backlinks(slug)
-
-    # リンクからページを取得
-    backlink_pages = []
-    for link in backlinks:
-        source_page = repo.get_page(link.source_slug)
-        if source_page:
-            backlink_pages.append(source_page)
-
-    return PageListResponse(
-        pages=[_page_to_response(p) for p in backlink_pages],
-        total=len(backlink_pages),
+    not_modified = check_not_modified(request, response, repo.get_workspace_revision())
+    if not_modified:
+        return not_modified
+
+    backlinks = repo.get_backlink_pages(slug, limit=limit, offset=offset)
+    return BacklinkListResponse(
+        backlinks=[
+            BacklinkResponse(
+                page=_summary_to_response(backlink.page),
+                snippet=backlink.snippet,
+                highlights=backlink.highlights,
+            )
+            for backlink in backlinks
+        ],
+        total=repo.count_backlink_pages(slug),
     )
@@ -1,33 +1,76 @@
 """Search API routes"""
 
-from fastapi import APIRouter
+import sqlite3
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 
 from notenest.core.repository import Repository
-from notenest.core.search import AdvancedSearch, DateRangeFilter
+from notenest.core.search import DateRangeFilter, PageQuery, SearchWeights
+from web.api.caching import check_not_modified
 from web.api.dependencies import get_repository
-from web.api.models import PageListResponse, SearchQuery
-from web.api.routes.pages import _page_to_response
+from web.api.models import (
+    PageListResponse,
+    PageSummaryListResponse,
+    SearchHitListResponse,
+    SearchHitResponse,
+    SearchQuery,
+)
+from web.api.routes.pages import _page_to_response, _summary_to_response
 
 router = APIRouter()
 
+_DEFAULT_WEIGHTS = SearchWeights()
 
-@router.post("", response_model=PageListResponse)
-async def search_pages(query: SearchQuery) -> PageListResponse:
-    """ページを検索"""
+
+@router.get("", response_model=SearchHitListResponse)
+def search_hits(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1),
+    limit: int = Query(20, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    title_weight: float = Query(_DEFAULT_WEIGHTS.title, ge=0),
+    slug_weight: float = Query(_DEFAULT_WEIGHTS.slug, ge=0),
+    tags_weight: float = Query(_DEFAULT_WEIGHTS.tags, ge=0),
+    content_weight: float = Query(_DEFAULT_WEIGHTS.content, ge=0),
+) -> SearchHitListResponse | Response:
+    """ランキング付き全文検索（本文は返さず、抜粋と一致位置のみ）"""
     repo: Repository = get_repository()
 
-    # 全ページを取得
-    all_pages = repo.list_pages()
+    not_modified = check_not_modified(request, response, repo.get_workspace_revision())
+    if not_modified:
+        return not_modified
+    weights = SearchWeights(
+        slug=slug_weight, title=title_weight, content=content_weight, tags=tags_weight
+    )
+
+    try:
+        hits = repo.search(q, limit=limit, offset=offset, weights=weights)
+        total = repo.count_query(PageQuery(fts_query=q))
+    except (sqlite3.OperationalError, ValueError) as e:
+        # FTS5のクエリ構文エラー（trigram の短い語と組み合わせられない構文を含む）
+        raise HTTPException(status_code=400, detail=f"Invalid search query: {e}") from e
+
+    return SearchHitListResponse(
+        hits=[
+            SearchHitResponse(
+                page=_summary_to_response(hit.page),
+                score=hit.score,
+                snippet=hit.snippet,
+                highlights=hit.highlights,
+                title_highlights=hit.title_highlights,
+            )
+            for hit in hits
+        ],
+        total=total,
+    )
+
 
-    # テキスト検索
-    if query.q:
-        search_results = repo.search_pages(query.q)
-        # IDのセットを作成
-        result_ids = {p.id for p in search_results if p.id is not None}
-        # フィルタリング
-        all_pages = [p for p in all_pages if p.id is not None and p.id in result_ids]
+@router.post("", response_model=PageListResponse | PageSummaryListResponse)
+def search_pages(query: SearchQuery) -> PageListResponse | PageSummaryListResponse:
+    """ページを検索"""
+    repo: Repository = get_repository()
 
-    # 高度なフィルタリング
     date_range_filter = None
     if query.start_date or query.end_date:
         date_range_filter = DateRangeFilter(
@@ -35,19 +78,26 @@ async def search_pages(query: SearchQuery) -> PageListResponse:
             end_date=query.end_date,
         )
 
-    filtered_pages = AdvancedSearch.complex_search(
-        all_pages,
-        text_query=None,  # 既にテキスト検索済み
+    # 絞り込み・ソート・ページネーションを1本のSQLで実行
+    page_query = PageQuery(
+        fts_query=query.q,
         tags=query.tags,
         metadata_type=query.metadata_type,
         date_range=date_range_filter,
+        limit=query.limit,
+        offset=query.offset,
     )
 
-    # ページネーション
-    total = len(filtered_pages)
-    pages = filtered_pages[query.offset : query.offset + query.limit]
+    if query.fields == "summary":
+        summaries = repo.query_page_summaries(page_query)
+        return PageSummaryListResponse(
+            pages=[_summary_to_response(s) for s in summaries],
+            total=repo.count_query(page_query),
+        )
+
+    pages = repo.query_pages(page_query)
 
     return PageListResponse(
         pages=[_page_to_response(p) for p in pages],
-        total=total,
+        total=repo.count_query(page_query),
     )
@@ -1,34 +1,53 @@
 """Tags API routes"""
 
-from fastapi import APIRouter
+from typing import Literal
+
+from fastapi import APIRouter, Query, Request, Response
 
 from notenest.core.repository import Repository
+from web.api.caching import check_not_modified
 from web.api.dependencies import get_repository
-from web.api.models import PageListResponse, TagResponse
-from web.api.routes.pages import _page_to_response
+from web.api.models import PageListResponse, PageSummaryListResponse, TagResponse
+from web.api.routes.pages import _page_to_response, _summary_to_response
 
 router = APIRouter()
 
 
 @router.get("", response_model=list[TagResponse])
-async def list_tags() -> list[TagResponse]:
-    """タグ一覧を取得"""
+def list_tags(
+    request: Request,
+    response: Response,
+    limit: int | None = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
+) -> list[TagResponse] | Response:
+    """タグ一覧を使用回数の多い順に取得（limit で上位k件）"""
     repo: Repository = get_repository()
-    tags = repo.get_all_tags()
-
-    # タグごとのページ数をカウント
-    tag_counts = []
-    for tag in tags:
-        pages = repo.get_pages_by_tag(tag.name)
-        tag_counts.append(TagResponse(name=tag.name, count=len(pages)))
 
-    return tag_counts
+    not_modified = check_not_modified(request, response, repo.get_workspace_revision())
+    if not_modified:
+        return not_modified
+    tags = repo.get_all_tags(limit=limit, offset=offset)
+    return [TagResponse(name=tag.name, count=tag.page_count) for tag in tags]
 
 
-@router.get("/{tag}/pages", response_model=PageListResponse)
-async def get_pages_by_tag(tag: str) -> PageListResponse:
-    """特定タグのページ一覧を取得"""
+@router.get("/{tag}/pages", response_model=PageListResponse | PageSummaryListResponse)
+def get_pages_by_tag(
+    tag: str, request: Request, response: Response, fields: Literal["full", "summary"] = "full"
+) -> PageListResponse | PageSummaryListResponse | Response:
+    """特定タグのページ一覧を取得（fields=summary で本文・メタデータを省略）"""
     repo: Repository = get_repository()
+
+    not_modified = check_not_modified(request, response, repo.get_workspace_revision())
+    if not_modified:
+        return not_modified
+
+    if fields == "summary":
+        summaries = repo.get_page_summaries_by_tag(tag)
+        return PageSummaryListResponse(
+            pages=[_summary_to_response(s) for s in summaries],
+            total=len(summaries),
+        )
+
     pages = repo.get_pages_by_tag(tag)
 
     return PageListResponse(
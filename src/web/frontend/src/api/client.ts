@@ -1,5 +1,5 @@
 import axios from 'axios';
-import type { Page, PageCreate, PageUpdate, Tag, Plugin } from '../types';
+import type { Backlink, Page, PageCreate, PageUpdate, SearchHit, Tag, Plugin } from '../types';
 
 const API_BASE_URL = 'http://localhost:8000/api';
 
@@ -36,8 +36,12 @@ export const api = {
     await client.delete(`/pages/${slug}`);
   },
 
-  async getBacklinks(slug: string): Promise<{ pages: Page[]; total: number }> {
-    const response = await client.get(`/pages/${slug}/backlinks`);
+  async getBacklinks(
+    slug: string,
+    limit = 50,
+    offset = 0
+  ): Promise<{ backlinks: Backlink[]; total: number }> {
+    const response = await client.get(`/pages/${slug}/backlinks`, { params: { limit, offset } });
     return response.data;
   },
 
@@ -64,6 +68,15 @@ export const api = {
     return response.data;
   },
 
+  async searchHits(
+    q: string,
+    limit = 20,
+    offset = 0
+  ): Promise<{ hits: SearchHit[]; total: number }> {
+    const response = await client.get('/search', { params: { q, limit, offset } });
+    return response.data;
+  },
+
   // Plugins
   async listPlugins(): Promise<Plugin[]> {
     const response = await client.get('/plugins');
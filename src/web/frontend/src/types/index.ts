@@ -9,6 +9,30 @@ export interface Page {
   tags: string[];
 }
 
+export interface PageSummary {
+  id: number;
+  slug: string;
+  title: string;
+  metadata_type: string;
+  created_at: string;
+  updated_at: string;
+  tags: string[];
+}
+
+export interface SearchHit {
+  page: PageSummary;
+  score: number;
+  snippet: string;
+  highlights: [number, number][];
+  title_highlights: [number, number][];
+}
+
+export interface Backlink {
+  page: PageSummary;
+  snippet: string;
+  highlights: [number, number][];
+}
+
 export interface PageCreate {
   title: string;
   content: string;
@@ -0,0 +1,62 @@
+"""Graph API tests"""
+
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from notenest.core.repository import Repository
+from web.api.dependencies import app_state
+from web.api.main import app
+
+
+@pytest.fixture
+def client() -> Iterator[TestClient]:
+    """リンクを含むページを持つテストクライアント"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repository = Repository(Path(tmpdir))
+        repository.create_page(slug="hub", title="Hub", content="[[a]]")
+        repository.create_page(slug="a", title="A", content="[[hub]] [[b]]")
+        repository.create_page(slug="b", title="B", content="[[hub]]")
+        repository.create_page(slug="lonely", title="Lonely")
+        app_state["repository"] = repository
+        yield TestClient(app)
+        app_state.pop("repository", None)
+        repository.close()
+
+
+def test_pagerank(client: TestClient) -> None:
+    """PageRank 上位ページのテスト"""
+    response = client.get("/api/graph/pagerank", params={"limit": 2})
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["total"] == 4
+    assert [page["slug"] for page in data["pages"]] == ["hub", "a"]
+
+
+def test_neighborhood(client: TestClient) -> None:
+    """k-hop 近傍のテスト"""
+    response = client.get("/api/graph/neighborhood/hub", params={"hops": 2})
+    assert response.status_code == 200
+    assert response.json()["nodes"] == [
+        {"slug": "a", "distance": 1},
+        {"slug": "b", "distance": 2},
+    ]
+
+    assert client.get("/api/graph/neighborhood/missing").status_code == 404
+
+
+def test_path_and_components(client: TestClient) -> None:
+    """最短経路と連結成分のテスト"""
+    response = client.get("/api/graph/path", params={"source": "hub", "target": "b"})
+    assert response.status_code == 200
+    assert response.json() == {"path": ["hub", "a", "b"], "length": 2}
+
+    response = client.get("/api/graph/path", params={"source": "hub", "target": "lonely"})
+    assert response.status_code == 404
+
+    response = client.get("/api/graph/components", params={"min_size": 2})
+    assert response.json() == {"components": [["a", "b", "hub"]], "total": 1}
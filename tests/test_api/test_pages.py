@@ -0,0 +1,231 @@
+"""Pages API tests"""
+
+import tempfile
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from notenest.core.repository import Repository
+from web.api.dependencies import app_state
+from web.api.main import app
+
+
+@pytest.fixture
+def repo() -> Iterator[Repository]:
+    """一時ワークスペースのRepositoryをAPIに差し込む"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repository = Repository(Path(tmpdir))
+        app_state["repository"] = repository
+        yield repository
+        app_state.pop("repository", None)
+        repository.close()
+
+
+@pytest.fixture
+def client(repo: Repository) -> TestClient:
+    """テストクライアント"""
+    return TestClient(app)
+
+
+def _create_pages(repo: Repository, count: int) -> None:
+    """updated_at が1分ずつ異なるページを作成"""
+    base = datetime(2025, 1, 1)
+    with repo.transaction():
+        for i in range(count):
+            page = repo.create_page(slug=f"page-{i:02d}", title=f"Page {i:02d}", tags=["t"])
+            page.updated_at = base + timedelta(minutes=i)
+            repo.db_store.save_page(page)
+
+
+def test_list_pages_pagination(repo: Repository, client: TestClient) -> None:
+    """オフセットページネーションとソートのテスト"""
+    _create_pages(repo, 5)
+
+    response = client.get("/api/pages", params={"limit": 2, "offset": 1})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 5
+    assert [p["slug"] for p in data["pages"]] == ["page-03", "page-02"]
+    assert data["pages"][0]["tags"] == ["t"]
+
+    response = client.get("/api/pages", params={"sort_by": "title", "order": "asc", "limit": 2})
+    assert [p["slug"] for p in response.json()["pages"]] == ["page-00", "page-01"]
+
+    response = client.get("/api/pages", params={"sort_by": "bogus"})
+    assert response.status_code == 422
+
+
+def test_list_pages_cursor(repo: Repository, client: TestClient) -> None:
+    """キーセット（カーソル）ページネーションのテスト"""
+    _create_pages(repo, 5)
+
+    slugs: list[str] = []
+    params: dict[str, object] = {"limit": 2}
+    while True:
+        data = client.get("/api/pages", params=params).json()
+        slugs.extend(p["slug"] for p in data["pages"])
+        if not data["next_cursor"]:
+            break
+        params = {"limit": 2, "cursor": data["next_cursor"]}
+
+    assert slugs == ["page-04", "page-03", "page-02", "page-01", "page-00"]
+
+    response = client.get("/api/pages", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_list_pages_summary_fields(repo: Repository, client: TestClient) -> None:
+    """fields=summary で本文・メタデータを返さないことのテスト"""
+    repo.create_page(slug="a", title="A", content="body", tags=["x"], metadata={"k": "v"})
+
+    data = client.get("/api/pages", params={"fields": "summary"}).json()
+    assert data["total"] == 1
+    page = data["pages"][0]
+    assert page["slug"] == "a"
+    assert page["tags"] == ["x"]
+    assert "content" not in page
+    assert "metadata" not in page
+
+    data = client.get("/api/tags/x/pages", params={"fields": "summary"}).json()
+    assert [p["slug"] for p in data["pages"]] == ["a"]
+    assert "content" not in data["pages"][0]
+
+    data = client.post("/api/search", json={"tags": ["x"], "fields": "summary"}).json()
+    assert data["total"] == 1
+    assert "content" not in data["pages"][0]
+
+
+def test_concurrent_requests(repo: Repository, client: TestClient) -> None:
+    """複数スレッドからの書き込み・読み込みが並行しても整合することのテスト"""
+
+    def create_and_read(i: int) -> tuple[int, int]:
+        created = client.post(
+            "/api/pages", json={"slug": f"c{i}", "title": f"C{i}", "content": f"[[c{i + 1}]]"}
+        )
+        fetched = client.get(f"/api/pages/c{i}")
+        return created.status_code, fetched.status_code
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(create_and_read, range(32)))
+
+    assert all(created == 201 and fetched == 200 for created, fetched in results)
+    assert repo.count_pages() == 32
+    assert [link.source_slug for link in repo.get_broken_links()] == ["c31"]
+
+
+def test_backlinks(repo: Repository, client: TestClient) -> None:
+    """リンク周辺の抜粋付きバックリンクのテスト"""
+    repo.create_page(slug="hub", title="Hub")
+    repo.create_page(
+        slug="b", title="B", content="intro " * 40 + "see [[the hub|hub]] and [[hub]]", tags=["x"]
+    )
+    repo.create_page(slug="a", title="A", content="`[[hub]]` in code, then [[hub]]")
+    repo.create_page(slug="c", title="C", content="[[other]]")
+
+    response = client.get("/api/pages/hub/backlinks")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total"] == 2
+    assert [backlink["page"]["slug"] for backlink in data["backlinks"]] == ["a", "b"]
+    assert data["backlinks"][1]["page"]["tags"] == ["x"]
+
+    # 抜粋はリンクの周辺で、highlights はコード外のリンクを指す
+    highlighted = [
+        [backlink["snippet"][start:end] for start, end in backlink["highlights"]]
+        for backlink in data["backlinks"]
+    ]
+    assert highlighted == [["[[hub]]"], ["[[the hub|hub]]", "[[hub]]"]]
+    assert data["backlinks"][1]["snippet"].startswith("…")
+
+    response = client.get("/api/pages/hub/backlinks", params={"limit": 1, "offset": 1})
+    data = response.json()
+    assert data["total"] == 2
+    assert [backlink["page"]["slug"] for backlink in data["backlinks"]] == ["b"]
+
+    assert client.get("/api/pages/missing/backlinks").status_code == 404
+
+
+def test_get_page_conditional(repo: Repository, client: TestClient) -> None:
+    """ページの ETag / Last-Modified による 304 のテスト"""
+    repo.create_page(slug="a", title="A", content="first", tags=["x"])
+
+    response = client.get("/api/pages/a")
+    etag = response.headers["etag"]
+    assert response.headers["cache-control"] == "no-cache"
+    assert "last-modified" in response.headers
+
+    response = client.get("/api/pages/a", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+    response = client.get(
+        "/api/pages/a", headers={"If-Modified-Since": response.headers["last-modified"]}
+    )
+    assert response.status_code == 304
+
+    # 本文・タグが変わると ETag も変わる
+    repo.update_page("a", content="second")
+    response = client.get("/api/pages/a", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["content"] == "second"
+    assert response.headers["etag"] != etag
+
+    etag = response.headers["etag"]
+    repo.update_page("a", tags=["y"])
+    assert client.get("/api/pages/a", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_get_page_conditional_after_external_edit(repo: Repository, client: TestClient) -> None:
+    """アプリの外でファイルが編集された場合は 304 を返さないことのテスト"""
+    page = repo.create_page(slug="a", title="A", content="first")
+    etag = client.get("/api/pages/a").headers["etag"]
+
+    assert page.file_path is not None
+    page.file_path.write_text(
+        page.file_path.read_text(encoding="utf-8").replace("first", "edited outside"),
+        encoding="utf-8",
+    )
+
+    response = client.get("/api/pages/a", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.json()["content"] == "edited outside"
+    # 同期されるまでは古い版の検証子を返さない
+    assert "etag" not in response.headers
+    assert "last-modified" not in response.headers
+
+    repo.sync_from_files()
+    response = client.get("/api/pages/a", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    new_etag = response.headers["etag"]
+    assert new_etag != etag
+    assert client.get("/api/pages/a", headers={"If-None-Match": new_etag}).status_code == 304
+
+
+def test_list_pages_conditional(repo: Repository, client: TestClient) -> None:
+    """ワークスペースの変更カウンタによる一覧の 304 のテスト"""
+    _create_pages(repo, 3)
+
+    response = client.get("/api/pages", params={"fields": "summary"})
+    etag = response.headers["etag"]
+    response = client.get(
+        "/api/pages", params={"fields": "summary"}, headers={"If-None-Match": f"W/{etag}"}
+    )
+    assert response.status_code == 304
+
+    # 他のページが変わっても一覧の ETag は変わる
+    repo.create_page(slug="new", title="New")
+    response = client.get(
+        "/api/pages", params={"fields": "summary"}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 200
+    assert response.json()["total"] == 4
+    assert client.get("/api/tags", headers={"If-None-Match": etag}).status_code == 200
+    assert (
+        client.get("/api/tags", headers={"If-None-Match": response.headers["etag"]}).status_code
+        == 304
+    )
@@ -0,0 +1,57 @@
+"""Search API tests"""
+
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from notenest.core.repository import Repository
+from web.api.dependencies import app_state
+from web.api.main import app
+
+
+@pytest.fixture
+def client() -> Iterator[TestClient]:
+    """一時ワークスペースのRepositoryを使うテストクライアント"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repository = Repository(Path(tmpdir))
+        repository.create_page(slug="python", title="Python Guide", content="Learn python basics")
+        repository.create_page(
+            slug="notes", title="Notes", content="Some notes that mention python once"
+        )
+        app_state["repository"] = repository
+        yield TestClient(app)
+        app_state.pop("repository", None)
+        repository.close()
+
+
+def test_search_hits(client: TestClient) -> None:
+    """ランキング付き検索結果のテスト"""
+    response = client.get("/api/search", params={"q": "python", "limit": 1})
+    assert response.status_code == 200
+    data = response.json()
+
+    assert data["total"] == 2
+    assert len(data["hits"]) == 1
+    hit = data["hits"][0]
+    assert hit["page"]["slug"] == "python"
+    assert "content" not in hit["page"]
+    start, end = hit["highlights"][0]
+    assert hit["snippet"][start:end].lower() == "python"
+    assert hit["title_highlights"] == [[0, 6]]
+
+
+def test_search_invalid_query(client: TestClient) -> None:
+    """FTS構文エラーは400を返すことのテスト"""
+    response = client.get("/api/search", params={"q": '"unterminated'})
+    assert response.status_code == 400
+
+    # trigram の短い語と組み合わせられない構文も400
+    app_state["repository"].set_search_tokenizer("trigram")
+    response = client.get("/api/search", params={"q": "py*"})
+    assert response.status_code == 400
+    response = client.get("/api/search", params={"q": "py OR notes"})
+    assert response.status_code == 200
+    assert response.json()["total"] == 2
@@ -0,0 +1,57 @@
+"""Tags API tests"""
+
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from notenest.core.repository import Repository
+from web.api.dependencies import app_state
+from web.api.main import app
+
+
+@pytest.fixture
+def client() -> Iterator[TestClient]:
+    """一時ワークスペースのRepositoryを使うテストクライアント"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        repository = Repository(Path(tmpdir))
+        repository.create_page(slug="a", title="A", tags=["python", "rust"])
+        repository.create_page(slug="b", title="B", tags=["python"])
+        repository.create_page(slug="c", title="C", tags=["python", "go", "rust"])
+        app_state["repository"] = repository
+        yield TestClient(app)
+        app_state.pop("repository", None)
+        repository.close()
+
+
+def test_list_tags(client: TestClient) -> None:
+    """使用回数の多い順のタグ一覧のテスト"""
+    response = client.get("/api/tags")
+    assert response.status_code == 200
+    assert response.json() == [
+        {"name": "python", "count": 3},
+        {"name": "rust", "count": 2},
+        {"name": "go", "count": 1},
+    ]
+
+
+def test_list_tags_pagination(client: TestClient) -> None:
+    """上位k件・オフセット指定のテスト"""
+    response = client.get("/api/tags", params={"limit": 2})
+    assert [tag["name"] for tag in response.json()] == ["python", "rust"]
+
+    response = client.get("/api/tags", params={"limit": 2, "offset": 2})
+    assert [tag["name"] for tag in response.json()] == ["go"]
+
+    assert client.get("/api/tags", params={"limit": 0}).status_code == 422
+
+
+def test_list_tags_after_delete(client: TestClient) -> None:
+    """ページ削除後のタグ一覧のテスト"""
+    client.get("/api/tags")
+    assert client.delete("/api/pages/c").status_code == 204
+
+    counts = {tag["name"]: tag["count"] for tag in client.get("/api/tags").json()}
+    assert counts == {"python": 2, "rust": 1, "go": 0}
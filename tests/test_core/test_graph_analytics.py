@@ -0,0 +1,75 @@
+"""グラフ分析のテスト"""
+
+import pytest
+
+from notenest.core.graph_analytics import CSRGraph, GraphAnalytics
+from notenest.core.link_graph import LinkGraph
+
+
+@pytest.fixture
+def graph() -> LinkGraph:
+    """hub を中心としたグラフと、独立した2ページ"""
+    return LinkGraph.build(
+        [(1, "hub"), (2, "a"), (3, "b"), (4, "c"), (5, "x"), (6, "y")],
+        [
+            ("a", "hub"),
+            ("b", "hub"),
+            ("c", "hub"),
+            ("hub", "a"),
+            ("c", "b"),
+            ("x", "y"),
+            ("y", "missing"),
+        ],
+    )
+
+
+def test_csr_transpose():
+    """CSRの転置"""
+    csr = CSRGraph.from_adjacency(["a", "b", "c"], [[1, 2], [2], []])
+    assert list(csr.neighbors(0)) == [1, 2]
+    assert csr.degree(2) == 0
+
+    reverse = csr.transpose()
+    assert [list(reverse.neighbors(node)) for node in range(3)] == [[], [0], [0, 1]]
+
+
+def test_pagerank(graph: LinkGraph):
+    """PageRank の合計が1で、被リンクの多いページが上位になる"""
+    analytics = GraphAnalytics(lambda: graph)
+    ranks = analytics.pagerank()
+
+    assert set(ranks) == {"hub", "a", "b", "c", "x", "y"}
+    assert sum(ranks.values()) == pytest.approx(1.0)
+    assert analytics.top_pages(limit=2)[0][0] == "hub"
+    assert ranks["y"] > ranks["x"]
+
+
+def test_neighborhood_and_path(graph: LinkGraph):
+    """k-hop 近傍と最短経路"""
+    analytics = GraphAnalytics(lambda: graph)
+
+    assert analytics.neighborhood("c") == {"b": 1, "hub": 1}
+    assert analytics.neighborhood("c", hops=2) == {"b": 1, "hub": 1, "a": 2}
+    assert analytics.neighborhood("hub", direction="in") == {"a": 1, "b": 1, "c": 1}
+    assert analytics.neighborhood("unknown") == {}
+
+    assert analytics.shortest_path("c", "a") == ["c", "hub", "a"]
+    assert analytics.shortest_path("a", "c") is None
+    assert analytics.shortest_path("a", "c", direction="both") == ["a", "hub", "c"]
+    assert analytics.shortest_path("a", "a") == ["a"]
+
+    with pytest.raises(ValueError):
+        analytics.neighborhood("c", direction="sideways")  # type: ignore[arg-type]
+
+
+def test_cache_invalidated_on_link_change(graph: LinkGraph):
+    """リンクが変化するまで結果をキャッシュし、変化したら再計算する"""
+    analytics = GraphAnalytics(lambda: graph)
+
+    assert analytics.components() == [["a", "b", "c", "hub"], ["x", "y"]]
+    first = analytics.pagerank()
+    assert analytics.pagerank() == first
+
+    graph.set_page("y", 6, ["c"])
+    assert analytics.components() == [["a", "b", "c", "hub", "x", "y"]]
+    assert analytics.pagerank() != first
@@ -0,0 +1,60 @@
+"""リンクグラフのテスト"""
+
+from notenest.core.link_graph import LinkGraph
+
+
+def test_build_and_query():
+    """構築と基本的な問い合わせ"""
+    graph = LinkGraph.build(
+        [(1, "a"), (2, "b"), (3, "c")],
+        [("a", "b"), ("a", "missing"), ("b", "a"), ("c", "missing"), ("c", "a")],
+    )
+
+    assert graph.page_count == 3
+    assert graph.link_count == 5
+    assert graph.outgoing("a") == ["b", "missing"]
+    assert graph.backlinks("a") == ["b", "c"]
+    assert graph.backlinks("missing") == ["a", "c"]
+    assert graph.broken_links() == [("a", "missing"), ("c", "missing")]
+    assert graph.orphans() == ["c"]
+    assert graph.dangling_targets() == {"missing": 2}
+    assert graph.page_id("b") == 2
+    assert graph.page_id("missing") is None
+    assert not graph.has_page("missing")
+
+
+def test_set_page_replaces_links():
+    """発リンクの置き換えで被リンク・リンク切れが差分更新される"""
+    graph = LinkGraph()
+    graph.set_page("a", 1, ["b", "b", "c"])
+    assert graph.outgoing("a") == ["b", "c"]
+    assert graph.dangling_targets() == {"b": 1, "c": 1}
+
+    graph.set_page("b", 2, [])
+    assert graph.dangling_targets() == {"c": 1}
+    assert graph.orphans() == ["a"]
+
+    version = graph.version
+    graph.set_page("a", 1, ["c"])
+    assert graph.version > version
+    assert graph.backlinks("b") == []
+    assert graph.orphans() == ["a", "b"]
+    assert graph.link_count == 1
+
+
+def test_remove_page():
+    """削除したページへのリンクはリンク切れになる"""
+    graph = LinkGraph()
+    graph.set_page("a", 1, ["b"])
+    graph.set_page("b", 2, ["a"])
+
+    graph.remove_page("b")
+    assert graph.page_count == 1
+    assert graph.outgoing("b") == []
+    assert graph.broken_links() == [("a", "b")]
+    assert graph.orphans() == ["a"]
+
+    # 作り直すとリンク切れが解消される
+    graph.set_page("b", 3, [])
+    assert graph.broken_links() == []
+    assert graph.page_id("b") == 3
@@ -0,0 +1,63 @@
+"""並列ローダーのテスト"""
+
+from multiprocessing import get_context
+from pathlib import Path
+
+from notenest.core import importer
+from notenest.core.importer import Importer
+from notenest.core.loader import ParallelLoader
+
+
+def test_parallel_loader_preserves_order(tmp_path):
+    """ワーカープロセスで処理しても入力順で結果が返ることのテスト"""
+    paths = []
+    for i in range(20):
+        path = tmp_path / f"{i:02d}.txt"
+        path.write_text(str(i), encoding="utf-8")
+        paths.append(path)
+    paths.append(tmp_path / "missing.txt")
+
+    loader = ParallelLoader(max_workers=2, chunk_size=3, min_parallel_files=0)
+    results = list(loader.map(Path.read_text, paths))
+
+    assert [result.path for result in results] == paths
+    assert [result.value for result in results[:-1]] == [str(i) for i in range(20)]
+    assert results[-1].value is None
+    assert results[-1].error
+
+
+def test_parallel_loader_spawns_workers():
+    """ワーカーを既定で spawn で起動することのテスト"""
+    assert ParallelLoader().mp_context.get_start_method() == "spawn"
+    assert ParallelLoader(mp_context=get_context("fork")).mp_context.get_start_method() == "fork"
+
+
+def test_import_directory_is_sequential_by_default(tmp_path, monkeypatch):
+    """ワーカー数を指定しない取り込みではワーカープロセスを使わないことのテスト"""
+    (tmp_path / "a.md").write_text("---\ntitle: A\n---\n\nBody\n", encoding="utf-8")
+    loaders: list[ParallelLoader] = []
+
+    class RecordingLoader(ParallelLoader):
+        def __init__(self, *args, **kwargs) -> None:
+            super().__init__(*args, **kwargs)
+            loaders.append(self)
+
+    monkeypatch.setattr(importer, "ParallelLoader", RecordingLoader)
+    assert [page.slug for page in Importer.import_directory(tmp_path)] == ["a"]
+    assert [loader.max_workers for loader in loaders] == [1]
+
+
+def test_import_directory_with_workers(tmp_path):
+    """ワーカー数によらず同じ結果になることのテスト"""
+    for name in ["b", "a", "c"]:
+        (tmp_path / f"{name}.md").write_text(
+            f"---\ntitle: Page {name}\n---\n\nBody {name}\n", encoding="utf-8"
+        )
+
+    sequential = Importer.import_directory(tmp_path, workers=1)
+    parallel = Importer.import_directory(tmp_path, workers=2)
+
+    assert [page.slug for page in sequential] == ["a", "b", "c"]
+    assert [(p.slug, p.title, p.content) for p in parallel] == [
+        (p.slug, p.title, p.content) for p in sequential
+    ]
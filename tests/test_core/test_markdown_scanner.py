@@ -0,0 +1,55 @@
+"""マークダウン走査のテスト"""
+
+from notenest.core.markdown_scanner import Heading, MarkdownScanner, WikiLinkRef
+from notenest.core.metadata import WikiLinkParser
+
+CONTENT = """# Title #draft
+
+See [[page-a]] and [[Label | page-b]], plus [docs](https://example.com/docs).
+Tagged #python and #python again, but not foo#bar or `#code` or `[[inline]]`.
+
+```python
+# not a heading
+link = "[[in-fence]]"  # tag #hidden
+```
+
+## Section ##
+~~~~
+[[also-hidden]]
+~~~
+still in fence [[hidden-too]]
+~~~~
+Back to [[page-c]].
+"""
+
+
+def test_scan():
+    """リンク・タグ・見出しの抽出とコードの除外"""
+    result = MarkdownScanner.scan(CONTENT)
+
+    assert result.link_targets == ["page-a", "page-b", "page-c"]
+    assert result.wiki_links[1].label == "Label"
+    assert result.wiki_links[0].label is None
+    assert [(link.text, link.url) for link in result.external_links] == [
+        ("docs", "https://example.com/docs")
+    ]
+    assert result.tags == ["draft", "python"]
+    assert result.headings == [Heading(1, "Title #draft", 1), Heading(2, "Section", 11)]
+
+
+def test_scan_positions():
+    """リンクの位置が本文のオフセットと一致する"""
+    content = "a\r\n[[x]] b [[y|z]]"
+    links = MarkdownScanner.scan(content).wiki_links
+
+    assert links == [WikiLinkRef("x", None, 3, 8), WikiLinkRef("z", "y", 11, 18)]
+    assert [content[link.start : link.end] for link in links] == ["[[x]]", "[[y|z]]"]
+
+
+def test_replace_links_skips_code():
+    """コードブロック内のリンクは置換しない"""
+    content = "[[old]]\n```\n[[old]]\n```\n"
+
+    result = WikiLinkParser.replace_links(content, lambda slug, display: "[[new]]")
+
+    assert result == "[[new]]\n```\n[[old]]\n```\n"
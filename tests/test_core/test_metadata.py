@@ -1,5 +1,7 @@
 """メタデータパーサーのテスト"""
 
+import frontmatter
+
 from notenest.core.metadata import MetadataParser, WikiLinkParser
 
 
@@ -47,3 +49,53 @@ def test_extract_wiki_links():
     assert "link2" in links
     assert "page-slug" in links
     assert len(links) == 3
+
+
+def test_replace_wiki_links():
+    """Wiki Linkの置換テスト（Noneを返したリンクは元の表記のまま）"""
+    content = "[[old]], [[ Label | old ]] and [[ other ]]"
+
+    result = WikiLinkParser.replace_links(
+        content, lambda slug, display: f"[[{display}|new]]" if slug == "old" else None
+    )
+
+    assert result == "[[old|new]], [[Label|new]] and [[ other ]]"
+
+
+def test_parse_matches_python_frontmatter():
+    """高速パーサーが python-frontmatter と同じ結果を返すことのテスト"""
+    cases = [
+        MetadataParser.serialize(
+            {
+                "title": "It's: a test",
+                "tags": ["yes", "123", "日本語"],
+                "created": "2025-10-01T10:00:00.123456",
+                "metadata_type": "default",
+            },
+            "# Body\n",
+        ),
+        MetadataParser.serialize(
+            {"title": "Recipe", "tags": [], "custom_fields": {"servings": 2, "spicy": True}},
+            "Body",
+        ),
+        "---\ntitle: Unquoted\ncreated: 2025-10-01T10:00:00\n---\n\nBody",
+        "No frontmatter\n",
+    ]
+
+    for content in cases:
+        post = frontmatter.loads(content)
+        assert MetadataParser.parse(content) == (dict(post.metadata), post.content)
+
+
+def test_parse_header(tmp_path):
+    """Frontmatterのみの読み込みテスト"""
+    file_path = tmp_path / "page.md"
+    file_path.write_text(
+        MetadataParser.serialize({"title": "Header", "tags": ["a"]}, "---\nnot: metadata\n"),
+        encoding="utf-8",
+    )
+
+    assert MetadataParser.parse_header(file_path) == {"title": "Header", "tags": ["a"]}
+
+    file_path.write_text("# No frontmatter", encoding="utf-8")
+    assert MetadataParser.parse_header(file_path) == {}
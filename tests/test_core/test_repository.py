@@ -1,11 +1,18 @@
 """リポジトリのテスト"""
 
+import os
+import stat
 import tempfile
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
 import pytest
 
+from notenest.core.loader import ParallelLoader
 from notenest.core.repository import Repository
+from notenest.storage.db_store import ConnectionProfile
 
 
 @pytest.fixture
@@ -108,3 +115,605 @@ def test_tags(temp_workspace):
     assert len(python_pages) == 2
 
     repo.close()
+
+
+def test_tag_counts_cache(temp_workspace):
+    """タグ一覧キャッシュの無効化とページングのテスト"""
+    repo = Repository(temp_workspace)
+    repo.create_page(slug="a", title="A", tags=["python", "rust"])
+    repo.create_page(slug="b", title="B", tags=["python"])
+
+    counts = {tag.name: tag.page_count for tag in repo.get_all_tags()}
+    assert counts == {"python": 2, "rust": 1}
+    assert [tag.name for tag in repo.get_all_tags(limit=1)] == ["python"]
+    assert [tag.name for tag in repo.get_all_tags(limit=1, offset=1)] == ["rust"]
+
+    # タグの変更・ページ削除はキャッシュに反映される
+    repo.update_page("b", tags=["rust", "go"])
+    counts = {tag.name: tag.page_count for tag in repo.get_all_tags()}
+    assert counts == {"python": 1, "rust": 2, "go": 1}
+
+    repo.delete_page("a")
+    counts = {tag.name: tag.page_count for tag in repo.get_all_tags()}
+    assert counts == {"python": 0, "rust": 1, "go": 1}
+
+    # ロールバックされた変更はキャッシュに残らない
+    with pytest.raises(RuntimeError), repo.transaction():
+        repo.create_page(slug="c", title="C", tags=["go"])
+        assert {tag.name: tag.page_count for tag in repo.get_all_tags()}["go"] == 2
+        raise RuntimeError("rollback")
+    assert {tag.name: tag.page_count for tag in repo.get_all_tags()}["go"] == 1
+
+    repo.close()
+
+
+def test_tag_counts_cache_with_concurrent_transactions(temp_workspace):
+    """別スレッドのトランザクション中に読み込んだタグ一覧がコミット後に残らないことのテスト"""
+    repo = Repository(temp_workspace, connection_profile=ConnectionProfile(read_pool_size=2))
+    repo.create_page(slug="a", title="A", tags=["old"])
+
+    def write(slug: str, tag: str, written: threading.Event, resume: threading.Event) -> None:
+        with repo.transaction():
+            repo.create_page(slug=slug, title=slug, tags=[tag])
+            written.set()
+            assert resume.wait(timeout=5)
+
+    for slug, tag in [("b", "new"), ("c", "newer")]:
+        written, resume = threading.Event(), threading.Event()
+        writer = threading.Thread(target=write, args=(slug, tag, written, resume))
+        writer.start()
+        assert written.wait(timeout=5)
+
+        # コミット前の一覧（未コミットのタグを含まない）を読み込んでからコミットさせる
+        assert tag not in [t.name for t in repo.get_all_tags()]
+        resume.set()
+        writer.join(timeout=5)
+        assert not writer.is_alive()
+
+        assert tag in [t.name for t in repo.get_all_tags()]
+
+    assert sorted(t.name for t in repo.get_all_tags()) == ["new", "newer", "old"]
+    repo.close()
+
+
+def test_tag_counts_cache_with_overlapping_commits(temp_workspace, monkeypatch):
+    """コミット直後に別スレッドのトランザクションが始まってもキャッシュが破棄されることのテスト"""
+    repo = Repository(temp_workspace, connection_profile=ConnectionProfile(read_pool_size=2))
+    committed, resume_first = threading.Event(), threading.Event()
+    written, resume_second = threading.Event(), threading.Event()
+    batch = repo.db_store.batch
+
+    @contextmanager
+    def pausing_batch() -> Iterator[None]:
+        with batch():
+            yield
+        # 最初のスレッドだけ、コミット後（トランザクションの後処理の前）で止める
+        if threading.current_thread() is first:
+            committed.set()
+            assert resume_first.wait(timeout=5)
+
+    monkeypatch.setattr(repo.db_store, "batch", pausing_batch)
+
+    def write(slug: str, tag: str) -> None:
+        with repo.transaction():
+            repo.create_page(slug=slug, title=slug, tags=[tag])
+            if slug == "second":
+                written.set()
+                assert resume_second.wait(timeout=5)
+
+    first = threading.Thread(target=write, args=("first", "first"))
+    second = threading.Thread(target=write, args=("second", "second"))
+    first.start()
+    assert committed.wait(timeout=5)
+    second.start()
+    written.wait(timeout=0.5)  # 後処理が終わるまで待たされる場合は set されない
+    resume_first.set()
+    first.join(timeout=5)
+    assert written.wait(timeout=5)
+
+    # 2つ目のトランザクションのコミット前に一覧を読み込んでキャッシュさせる
+    assert "second" not in [t.name for t in repo.get_all_tags()]
+    resume_second.set()
+    second.join(timeout=5)
+
+    assert [t.name for t in repo.get_all_tags()] == ["first", "second"]
+    repo.close()
+
+
+def test_tag_counts_cache_follows_other_instances(temp_workspace):
+    """別のインスタンス（別プロセス）のコミットがタグ一覧に反映されることのテスト"""
+    repo = Repository(temp_workspace)
+    other = Repository(temp_workspace)
+    repo.create_page(slug="a", title="A", tags=["x"])
+    assert [(tag.name, tag.page_count) for tag in repo.get_all_tags()] == [("x", 1)]
+
+    other.update_page(slug="a", tags=["y"])
+    assert [(tag.name, tag.page_count) for tag in repo.get_all_tags()] == [("y", 1), ("x", 0)]
+    other.delete_page("a")
+    assert [(tag.name, tag.page_count) for tag in repo.get_all_tags()] == [("x", 0), ("y", 0)]
+
+    other.close()
+    repo.close()
+
+
+def test_sync_from_files_incremental(temp_workspace):
+    """差分同期のテスト"""
+    repo = Repository(temp_workspace)
+    pages_dir = temp_workspace / "pages"
+
+    (pages_dir / "alpha.md").write_text(
+        "---\ntitle: Alpha\ntags: [a]\n---\n\nLinks to [[beta]].\n", encoding="utf-8"
+    )
+    (pages_dir / "beta.md").write_text("---\ntitle: Beta\n---\n\nBeta body\n", encoding="utf-8")
+
+    # 初回同期: 2件追加
+    result = repo.sync_from_files()
+    assert result.added == 2
+    assert result.updated == 0
+    assert repo.get_page("alpha").tags == ["a"]
+    assert len(repo.get_backlinks("beta")) == 1
+
+    # 変更なし: 全件スキップ、ファイルも書き換えない
+    before = (pages_dir / "alpha.md").read_text(encoding="utf-8")
+    result = repo.sync_from_files()
+    assert result.unchanged == 2
+    assert not result.changed
+    assert (pages_dir / "alpha.md").read_text(encoding="utf-8") == before
+
+    # 変更: 1件のみ更新
+    (pages_dir / "beta.md").write_text(
+        "---\ntitle: Beta 2\n---\n\nChanged body\n", encoding="utf-8"
+    )
+    result = repo.sync_from_files()
+    assert result.updated == 1
+    assert result.unchanged == 1
+    assert repo.get_page("beta").title == "Beta 2"
+
+    # 削除: DBからも消える
+    (pages_dir / "alpha.md").unlink()
+    result = repo.sync_from_files()
+    assert result.deleted == 1
+    assert repo.get_page("alpha") is None
+    assert repo.get_backlinks("beta") == []
+
+    repo.close()
+
+
+def test_sync_skips_pages_written_by_repository(temp_workspace):
+    """Repository経由で書き込んだページは再同期されないことのテスト"""
+    repo = Repository(temp_workspace)
+
+    repo.create_page(slug="page1", title="Page 1", content="Content")
+    repo.update_page(slug="page1", content="Updated")
+
+    result = repo.sync_from_files()
+    assert result.unchanged == 1
+    assert not result.changed
+
+    repo.delete_page("page1")
+    result = repo.sync_from_files()
+    assert result.deleted == 0
+    assert result.unchanged == 0
+
+    repo.close()
+
+
+def test_sync_loads_sequentially_by_default(temp_workspace):
+    """ローダーを指定しない場合はワーカープロセスを起動しないことのテスト"""
+    repo = Repository(temp_workspace)
+    assert repo.loader.max_workers == 1
+    repo.close()
+
+
+def test_sync_parallel_loader_commits_in_batches(temp_workspace):
+    """並列ローダーで読み込み、指定件数ごとにコミットすることのテスト"""
+    loader = ParallelLoader(max_workers=2, chunk_size=2, min_parallel_files=0)
+    repo = Repository(temp_workspace, loader=loader)
+    assert repo.db_store.conn is not None
+
+    pages_dir = temp_workspace / "pages"
+    for i in range(5):
+        (pages_dir / f"page{i}.md").write_text(
+            f"---\ntitle: Page {i}\n---\n\nLinks to [[page{(i + 1) % 5}]].\n",
+            encoding="utf-8",
+        )
+
+    statements: list[str] = []
+    repo.db_store.conn.set_trace_callback(statements.append)
+
+    result = repo.sync_from_files(commit_every=2)
+    assert result.added == 5
+    assert statements.count("COMMIT") == 3
+    assert [link.source_slug for link in repo.get_backlinks("page0")] == ["page4"]
+
+    repo.close()
+
+
+def test_sync_paths(temp_workspace):
+    """指定したファイルだけを同期するテスト"""
+    repo = Repository(temp_workspace)
+    pages_dir = temp_workspace / "pages"
+
+    (pages_dir / "alpha.md").write_text("---\ntitle: Alpha\n---\n", encoding="utf-8")
+    (pages_dir / "beta.md").write_text("---\ntitle: Beta\n---\n", encoding="utf-8")
+
+    result = repo.sync_paths([pages_dir / "alpha.md", temp_workspace / "notes.txt"])
+    assert result.added == 1
+    assert repo.get_page("alpha") is not None
+    assert repo.get_page("beta") is None
+
+    (pages_dir / "alpha.md").unlink()
+    result = repo.sync_paths([pages_dir / "alpha.md", pages_dir / "beta.md"])
+    assert result.deleted == 1
+    assert result.added == 1
+    assert repo.get_page("alpha") is None
+
+    repo.close()
+
+
+def test_write_operations_commit_once(temp_workspace):
+    """create/update/delete がそれぞれ1回だけコミットすることのテスト"""
+    repo = Repository(temp_workspace)
+    assert repo.db_store.conn is not None
+
+    statements: list[str] = []
+    repo.db_store.conn.set_trace_callback(statements.append)
+
+    repo.create_page(slug="p1", title="P1", content="[[p2]] [[p3]]", tags=["a", "b"])
+    assert statements.count("COMMIT") == 1
+
+    repo.update_page(slug="p1", content="[[p4]]", tags=["c"])
+    assert statements.count("COMMIT") == 2
+
+    repo.delete_page("p1")
+    assert statements.count("COMMIT") == 3
+
+    repo.close()
+
+
+def test_page_files_are_written_atomically(temp_workspace):
+    """ページファイルが一時ファイル経由で置き換えられることのテスト"""
+    with pytest.raises(ValueError):
+        Repository(temp_workspace, fsync_policy="sometimes")
+
+    repo = Repository(temp_workspace, fsync_policy="always")
+    repo.create_page(slug="page1", title="Page 1", content="v1")
+    repo.update_page(slug="page1", content="v2")
+
+    assert [path.name for path in (temp_workspace / "pages").iterdir()] == ["page1.md"]
+    assert "v2" in (temp_workspace / "pages" / "page1.md").read_text(encoding="utf-8")
+
+    repo.close()
+
+
+def test_batched_fsync_syncs_data_before_rename(temp_workspace, monkeypatch):
+    """batched でもファイルの内容を rename 前に fsync し、ディレクトリの fsync だけをまとめるテスト"""
+    repo = Repository(temp_workspace)
+    events: list[str] = []
+    fsync, replace = os.fsync, os.replace
+
+    def record_fsync(fd: int) -> None:
+        events.append("fsync-dir" if stat.S_ISDIR(os.fstat(fd).st_mode) else "fsync-file")
+        fsync(fd)
+
+    def record_replace(src, dst) -> None:
+        events.append("replace")
+        replace(src, dst)
+
+    monkeypatch.setattr(os, "fsync", record_fsync)
+    monkeypatch.setattr(os, "replace", record_replace)
+    repo.create_page(slug="page1", title="Page 1", content="v1")
+    repo.update_page(slug="page1", content="v2")
+    assert events == ["fsync-file", "replace", "fsync-file", "replace"]
+
+    repo.flush()
+    assert events[4:] == ["fsync-dir"]
+    repo.close()
+
+
+def test_write_behind_coalesces_updates(temp_workspace):
+    """連続した更新が1回の書き込みにまとめられることのテスト"""
+    repo = Repository(temp_workspace, write_behind_delay=60)
+    assert repo.db_store.conn is not None
+    repo.create_page(slug="draft", title="Draft", content="v0")
+    page_file = temp_workspace / "pages" / "draft.md"
+
+    statements: list[str] = []
+    repo.db_store.conn.set_trace_callback(statements.append)
+
+    for i in range(1, 4):
+        repo.update_page(slug="draft", content=f"v{i}")
+
+    # 書き込み前でも最新の内容が読める
+    assert repo.get_page("draft").content == "v3"
+    assert "v0" in page_file.read_text(encoding="utf-8")
+    assert statements.count("COMMIT") == 0
+
+    repo.flush()
+    assert statements.count("COMMIT") == 1
+    assert "v3" in page_file.read_text(encoding="utf-8")
+    assert repo.search_pages("v3")[0].slug == "draft"
+
+    # 削除すると予約中の書き込みは破棄される
+    repo.update_page(slug="draft", content="v4")
+    repo.delete_page("draft")
+    repo.close()
+    assert not page_file.exists()
+
+
+def test_write_behind_keeps_failed_writes(temp_workspace, monkeypatch):
+    """遅延書き込みに失敗したページが破棄されず、flush で例外になることのテスト"""
+    repo = Repository(temp_workspace, write_behind_delay=60)
+    repo.create_page(slug="draft", title="Draft", content="v0")
+    page_file = temp_workspace / "pages" / "draft.md"
+
+    save_page_file = repo.file_store.save_page_file
+
+    def fail(page):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(repo.file_store, "save_page_file", fail)
+    repo.update_page(slug="draft", content="v1")
+
+    with pytest.raises(OSError, match="disk full"):
+        repo.flush()
+    # 失敗したページは予約に残り、最新の内容として読める
+    assert repo.write_behind is not None
+    assert repo.write_behind.pending_count() == 1
+    assert repo.get_page("draft").content == "v1"
+    assert "v0" in page_file.read_text(encoding="utf-8")
+
+    # 書き込めるようになれば再試行で反映され、例外も消える
+    monkeypatch.setattr(repo.file_store, "save_page_file", save_page_file)
+    repo.flush()
+    assert repo.write_behind.pending_count() == 0
+    assert "v1" in page_file.read_text(encoding="utf-8")
+
+    # 閉じるときに書き込めなければ例外を送出し、DBは閉じる
+    monkeypatch.setattr(repo.file_store, "save_page_file", fail)
+    repo.update_page(slug="draft", content="v2")
+    with pytest.raises(OSError, match="disk full"):
+        repo.close()
+    assert repo.db_store.conn is None
+
+
+def test_update_page_skips_unchanged_parts(temp_workspace):
+    """内容が変わらない更新では何も書き込まないことのテスト"""
+    repo = Repository(temp_workspace)
+    assert repo.db_store.conn is not None
+    page = repo.create_page(slug="p1", title="P1", content="See [[p2]]", tags=["a", "b"])
+    page_file = temp_workspace / "pages" / "p1.md"
+    before = page_file.stat().st_mtime_ns
+
+    statements: list[str] = []
+    repo.db_store.conn.set_trace_callback(statements.append)
+
+    # 同じ内容（タグの順序違いを含む）: ファイル・DBとも書き込まない
+    updated = repo.update_page(slug="p1", title="P1", content="See [[p2]]", tags=["b", "a"])
+    assert updated is not None
+    assert updated.updated_at == page.updated_at
+    assert statements.count("COMMIT") == 0
+    assert page_file.stat().st_mtime_ns == before
+
+    # 本文のみ変更: リンク・タグは書き換えない
+    repo.update_page(slug="p1", content="Still see [[p2]]")
+    assert statements.count("COMMIT") == 1
+    writes = [sql for sql in statements if sql.lstrip().startswith(("INSERT", "DELETE"))]
+    assert not any("links" in sql or "page_tags" in sql for sql in writes)
+    assert any("pages_fts" in sql for sql in writes)
+    assert [link.source_slug for link in repo.get_backlinks("p2")] == ["p1"]
+
+    repo.close()
+
+
+def test_list_pages_loads_tags_in_constant_queries(temp_workspace):
+    """ページ一覧のタグ読み込みがページ数に依存しないことのテスト"""
+    repo = Repository(temp_workspace, connection_profile=ConnectionProfile(read_pool_size=0))
+    assert repo.db_store.conn is not None
+
+    with repo.transaction():
+        for i in range(20):
+            repo.create_page(slug=f"p{i}", title=f"P{i}", tags=[f"t{i % 3}", "all"])
+    repo.create_page(slug="untagged", title="Untagged")
+
+    statements: list[str] = []
+    repo.db_store.conn.set_trace_callback(statements.append)
+
+    pages = repo.list_pages()
+    assert len(pages) == 21
+    assert len(statements) == 2
+
+    tags = {page.slug: page.tags for page in pages}
+    assert tags["p4"] == ["t1", "all"]
+    assert tags["untagged"] == []
+
+    repo.close()
+
+
+def test_page_cache(temp_workspace):
+    """ページキャッシュのヒット・破棄・追い出しのテスト"""
+    repo = Repository(temp_workspace, page_cache_size=2)
+
+    repo.create_page(slug="p1", title="P1", content="one", tags=["a"])
+    repo.get_page("p1")
+    page = repo.get_page("p1")
+    assert page.content == "one"
+    stats = repo.cache_stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+
+    # 返されたページを変更してもキャッシュは汚れない
+    page.tags.append("mutated")
+    assert repo.get_page("p1").tags == ["a"]
+
+    # Repository経由の更新で破棄される
+    repo.update_page(slug="p1", content="two")
+    assert repo.get_page("p1").content == "two"
+
+    # 外部エディタによる変更をmtime/サイズで検出
+    file_path = temp_workspace / "pages" / "p1.md"
+    file_path.write_text(file_path.read_text(encoding="utf-8").replace("two", "three!"))
+    assert repo.get_page("p1").content.strip() == "three!"
+
+    # 容量超過で追い出される
+    repo.create_page(slug="p2", title="P2")
+    repo.create_page(slug="p3", title="P3")
+    repo.get_page("p2")
+    repo.get_page("p3")
+    stats = repo.cache_stats()
+    assert stats.size == 2
+    assert stats.evictions == 1
+
+    repo.close()
+
+
+def test_link_graph_tracks_writes(temp_workspace):
+    """リンクグラフが書き込み・同期に追従し、問い合わせで変更カウンタしか読まないことのテスト"""
+    repo = Repository(temp_workspace, connection_profile=ConnectionProfile(read_pool_size=0))
+    assert repo.db_store.conn is not None
+
+    repo.create_page(slug="hub", title="Hub", content="[[a]] [[b]] [[missing]]")
+    repo.create_page(slug="a", title="A", content="[[hub]]")
+    assert repo.get_orphan_pages() == []
+
+    # 構築後の書き込みは差分で反映される
+    repo.create_page(slug="b", title="B")
+    repo.update_page(slug="a", content="[[b]]")
+    repo.delete_page("hub")
+
+    statements: list[str] = []
+    repo.db_store.conn.set_trace_callback(statements.append)
+    assert [link.target_slug for link in repo.get_outgoing_links("a")] == ["b"]
+    assert [link.source_slug for link in repo.get_backlinks("b")] == ["a"]
+    assert [(link.source_slug, link.target_slug) for link in repo.get_broken_links()] == []
+    assert repo.get_orphan_pages() == ["a"]
+    assert repo.get_dangling_targets() == {}
+    assert statements
+    assert all("key = 'change_counter'" in statement for statement in statements)
+
+    # ファイルからの同期も反映される
+    (temp_workspace / "pages" / "c.md").write_text("---\ntitle: C\n---\n[[gone]]\n")
+    repo.sync_from_files()
+    assert repo.get_dangling_targets() == {"gone": 1}
+    assert repo.get_broken_links()[0].source_slug == "c"
+
+    repo.close()
+
+
+def test_link_graph_discards_rolled_back_changes(temp_workspace):
+    """ロールバックしたトランザクションのリンク変更がグラフに残らないことのテスト"""
+    repo = Repository(temp_workspace)
+    repo.create_page(slug="a", title="A", content="[[b]]")
+    assert repo.get_dangling_targets() == {"b": 1}
+
+    with pytest.raises(RuntimeError), repo.transaction():
+        repo.create_page(slug="b", title="B")
+        raise RuntimeError("abort")
+
+    assert repo.get_dangling_targets() == {"b": 1}
+    assert repo.get_backlinks("b")[0].source_page_id == repo.link_graph.page_id("a")
+
+    repo.close()
+
+
+def test_link_graph_build_does_not_start_write_transaction(temp_workspace):
+    """リンクグラフの構築で書き込みトランザクションを開始しないことのテスト"""
+    repo = Repository(temp_workspace)
+    assert repo.db_store.conn is not None
+    repo.create_page(slug="a", title="A", content="[[b]]")
+    repo.create_page(slug="b", title="B")
+
+    statements: list[str] = []
+    repo.db_store.conn.set_trace_callback(statements.append)
+    assert [link.source_slug for link in repo.get_backlinks("b")] == ["a"]
+    assert statements == []
+
+    repo.close()
+
+
+def test_link_graph_follows_other_instances(temp_workspace):
+    """別のインスタンス（別プロセス）のコミットがリンクグラフに反映されることのテスト"""
+    repo = Repository(temp_workspace)
+    other = Repository(temp_workspace)
+    repo.create_page(slug="a", title="A", content="[[b]] [[gone]]")
+    repo.create_page(slug="b", title="B")
+    assert [link.source_slug for link in repo.get_backlinks("b")] == ["a"]
+    assert [link.source_slug for link in repo.get_broken_links()] == ["a"]
+
+    other.create_page(slug="c", title="C", content="[[b]]")
+    other.delete_page("a")
+    assert [link.source_slug for link in repo.get_backlinks("b")] == ["c"]
+    assert repo.get_broken_links() == []
+
+    # 自インスタンスの書き込みは、他のコミットを反映したグラフに差分で加わる
+    other.create_page(slug="d", title="D", content="[[b]]")
+    repo.update_page(slug="c", content="no links")
+    assert [link.source_slug for link in repo.get_backlinks("b")] == ["d"]
+
+    other.close()
+    repo.close()
+
+
+def test_rename_page_rewrites_links(temp_workspace):
+    """ページ名の変更でリンク元ページも書き換えられることのテスト"""
+    repo = Repository(temp_workspace)
+    repo.create_page(slug="old", title="Old", content="Self [[old]]")
+    repo.create_page(slug="a", title="A", content="See [[old]] and [[Label|old]] and [[b]]")
+    repo.create_page(slug="b", title="B", content="Nothing to change [[a]]")
+    pages_dir = temp_workspace / "pages"
+
+    renamed = repo.rename_page("old", "new", batch_size=1)
+    assert renamed is not None
+    assert renamed.slug == "new"
+    assert renamed.content == "Self [[new]]"
+
+    assert not (pages_dir / "old.md").exists()
+    assert (pages_dir / "new.md").exists()
+    assert not list(pages_dir.glob(".*.tmp"))
+    assert repo.get_page("old") is None
+
+    page_a = repo.get_page("a")
+    assert page_a is not None
+    assert page_a.content == "See [[new]] and [[Label|new]] and [[b]]"
+    assert "[[Label|new]]" in (pages_dir / "a.md").read_text()
+
+    assert [link.source_slug for link in repo.get_backlinks("new")] == ["a", "new"]
+    assert repo.get_backlinks("old") == []
+    assert repo.get_broken_links() == []
+    assert {page.slug for page in repo.search_pages("new")} == {"new", "a"}
+
+    # マニフェストもファイルと一致している
+    result = repo.sync_from_files()
+    assert not result.changed
+    assert result.unchanged == 3
+
+    repo.close()
+
+
+def test_rename_page_is_atomic(temp_workspace, monkeypatch):
+    """途中で失敗した場合にファイル・DBとも変更されないことのテスト"""
+    repo = Repository(temp_workspace)
+    repo.create_page(slug="old", title="Old")
+    repo.create_page(slug="a", title="A", content="[[old]]")
+    repo.create_page(slug="taken", title="Taken")
+
+    with pytest.raises(ValueError):
+        repo.rename_page("old", "taken")
+
+    def fail(*args, **kwargs):
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(repo, "_rewrite_backlinks", fail)
+    with pytest.raises(RuntimeError):
+        repo.rename_page("old", "new")
+
+    pages_dir = temp_workspace / "pages"
+    assert sorted(path.name for path in pages_dir.iterdir()) == ["a.md", "old.md", "taken.md"]
+    assert repo.get_page("new") is None
+    assert [link.source_slug for link in repo.get_backlinks("old")] == ["a"]
+
+    # リンクを書き換えない場合は元のslugへのリンクがリンク切れになる
+    monkeypatch.undo()
+    repo.rename_page("old", "new", rewrite_links=False)
+    assert [link.source_slug for link in repo.get_broken_links()] == ["a"]
+
+    repo.close()
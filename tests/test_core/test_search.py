@@ -2,8 +2,12 @@
 
 from datetime import datetime, timedelta
 
+import pytest
+
 from notenest.core.page import Page
-from notenest.core.search import AdvancedSearch, DateRangeFilter
+from notenest.core.repository import Repository
+from notenest.core.search import AdvancedSearch, DateRangeFilter, PageQuery, SearchWeights
+from notenest.storage.query_compiler import PageQueryCompiler
 
 
 def test_filter_by_date_range():
@@ -120,3 +124,196 @@ def test_complex_search():
     # メタデータ型フィルタ
     result = AdvancedSearch.complex_search(pages, metadata_type="tutorial")
     assert len(result) == 2  # p1, p3
+
+
+def test_query_pages_matches_complex_search(tmp_path):
+    """SQLにコンパイルした検索がメモリ内の complex_search と同じ結果を返すことのテスト"""
+    repo = Repository(tmp_path)
+    repo.create_page(
+        slug="p1",
+        title="Python Tutorial",
+        content="Learn Python basics",
+        tags=["python", "tutorial"],
+        metadata_type="recipe",
+        metadata={"difficulty": "Easy", "servings": 2, "ingredients": ["egg", "rice"]},
+    )
+    repo.create_page(
+        slug="p2",
+        title="Rust Guide",
+        content="Advanced Rust programming with python bindings",
+        tags=["rust", "advanced"],
+        metadata={"difficulty": "hard", "servings": 4},
+    )
+    repo.create_page(
+        slug="p3",
+        title="Python Advanced",
+        content="Advanced topics",
+        tags=["python", "advanced"],
+        metadata_type="recipe",
+        metadata={"difficulty": "medium", "ingredients": ["flour"]},
+    )
+
+    all_pages = [repo.get_page(page.slug) for page in repo.list_pages()]
+    cases = [
+        {"text_query": "python"},
+        {"text_query": "PYTHON", "tags": ["advanced"], "sort_by": "title", "reverse": False},
+        {"metadata_type": "recipe"},
+        {"metadata_filters": {"difficulty": "EAS"}},
+        {"metadata_filters": {"servings": 4}},
+        {"metadata_filters": {"ingredients": ["rice", "flour"]}},
+        {"date_range": DateRangeFilter(start_date=datetime.now() + timedelta(days=1))},
+    ]
+    for case in cases:
+        query = PageQuery(**case)
+        expected = AdvancedSearch.complex_search(all_pages, **case)
+        result = repo.query_pages(query)
+        assert [p.slug for p in result] == [p.slug for p in expected], case
+        assert repo.count_query(query) == len(expected)
+
+    # 全タグ一致
+    query = PageQuery(tags=["python", "advanced"], match_all_tags=True)
+    expected = AdvancedSearch.filter_by_tags(all_pages, ["python", "advanced"], match_all=True)
+    assert [p.slug for p in repo.query_pages(query)] == [p.slug for p in expected]
+
+    # LIMIT/OFFSETもDB側で適用
+    query = PageQuery(tags=["python"], sort_by="slug", reverse=False, limit=1, offset=1)
+    assert [p.slug for p in repo.query_pages(query)] == ["p3"]
+    assert repo.count_query(query) == 2
+
+    repo.close()
+
+
+def test_trigram_tokenizer_finds_japanese_substrings(tmp_path):
+    """trigram プロファイルで日本語の部分一致検索ができることのテスト"""
+    repo = Repository(tmp_path)
+    repo.create_page(slug="curry", title="カレー", content="今日は材料を買ってカレーを作った")
+    repo.create_page(slug="memo", title="メモ", content="買い物リスト")
+
+    # porter unicode61 では文中の語を検索できない
+    assert repo.search_pages("材料") == []
+
+    repo.set_search_tokenizer("trigram")
+    assert [page.slug for page in repo.search_pages("材料を")] == ["curry"]
+    # 3文字未満の語は2文字単位のインデックスで検索
+    assert [page.slug for page in repo.search_pages("材料")] == ["curry"]
+    assert [page.slug for page in repo.query_pages(PageQuery(text_query="買って"))] == ["curry"]
+    repo.close()
+
+    # 設定はワークスペースに保存される
+    repo = Repository(tmp_path)
+    assert repo.get_search_tokenizer() == "trigram"
+    repo.update_page(slug="memo", content="材料のリスト")
+    assert sorted(page.slug for page in repo.search_pages("材料")) == ["curry", "memo"]
+    assert [page.slug for page in repo.search_pages("材料の")] == ["memo"]
+    repo.close()
+
+
+def test_trigram_short_terms_with_operators(tmp_path):
+    """trigram で短い語と FTS5 の演算子・括弧・フレーズを組み合わせた検索のテスト"""
+    repo = Repository(tmp_path)
+    repo.set_search_tokenizer("trigram")
+    repo.create_page(slug="curry", title="カレー", content="今日は材料を買ってカレーを作った")
+    repo.create_page(slug="salt", title="塩", content="塩をひとつまみ入れる")
+    repo.create_page(slug="memo", title="メモ", content="塩と砂糖の買い物リスト")
+
+    def slugs(query: str) -> list[str]:
+        return sorted(page.slug for page in repo.search_pages(query))
+
+    # 演算子は語として扱わない（"OR" は2文字でも検索語にならない）
+    assert slugs("ひとつまみ OR 材料を") == ["curry", "salt"]
+    assert sorted(hit.page.slug for hit in repo.search("塩 OR 材料")) == ["curry", "memo", "salt"]
+    assert slugs("塩 AND 砂糖") == ["memo"]
+    assert slugs("塩 砂糖") == ["memo"]
+    assert slugs("塩 NOT 砂糖") == ["salt"]
+    assert slugs("(塩 OR 材料) NOT リスト") == ["curry", "salt"]
+    # 空白を含むフレーズは1つの語として部分一致
+    assert slugs('"塩 を"') == []
+    assert slugs('"を作っ" OR 塩と') == ["curry", "memo"]
+
+    hits = repo.search("塩 OR 材料")
+    assert {hit.snippet[start:end] for hit in hits for start, end in hit.highlights} == {
+        "塩",
+        "材料",
+    }
+
+    # 語ごとの検索で再現できない構文・不正な構文は明示的にエラーにする
+    with pytest.raises(ValueError):
+        repo.search_pages("塩*")
+    with pytest.raises(ValueError):
+        repo.search_pages("(塩 OR")
+    repo.close()
+
+
+def test_trigram_short_terms_use_index(tmp_path):
+    """trigram で1〜2文字の語がインデックスで検索され、本文を走査しないことのテスト"""
+    repo = Repository(tmp_path)
+    repo.set_search_tokenizer("trigram")
+    repo.create_page(slug="curry", title="カレー", content="今日は材料を買ってカレーを作った")
+    repo.create_page(slug="py", title="Python", content="import os", tags=["dev"])
+    assert repo.db_store.conn is not None
+
+    for query in [PageQuery(fts_query="材料", sort_by="rank"), PageQuery(text_query="材料")]:
+        sql, params = PageQueryCompiler(query, "trigram").compile_select()
+        plan = [
+            row["detail"] for row in repo.db_store.conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        ]
+        assert any("pages_fts_short VIRTUAL TABLE INDEX" in detail for detail in plan)
+        assert not any("page_content" in detail or detail == "SCAN p" for detail in plan)
+
+    def slugs(query: str) -> list[str]:
+        return sorted(page.slug for page in repo.search_pages(query))
+
+    # 1文字の語は文字の並びの途中・末尾のどちらでも引ける
+    assert slugs("材") == ["curry"]
+    assert slugs("た") == ["curry"]
+    assert slugs("py") == ["py"]
+    assert slugs("DE") == ["py"]
+    assert slugs("料買") == []
+    assert [page.slug for page in repo.query_pages(PageQuery(text_query="カレ"))] == ["curry"]
+
+    # 更新・削除で古い内容はインデックスから消える
+    repo.update_page(slug="curry", content="塩をひとつまみ")
+    assert slugs("材料") == []
+    assert slugs("塩") == ["curry"]
+    repo.delete_page("curry")
+    assert slugs("塩") == []
+
+    # 記号を含む短い語はインデックスで再現できないためエラーにする
+    with pytest.raises(ValueError):
+        repo.search_pages("c#")
+    repo.close()
+
+
+def test_trigram_short_index_created_for_existing_workspace(tmp_path):
+    """短い語のインデックスがない trigram のワークスペースを開くと作成されることのテスト"""
+    repo = Repository(tmp_path)
+    repo.set_search_tokenizer("trigram")
+    repo.create_page(slug="curry", title="カレー", content="材料を買う")
+    assert repo.db_store.conn is not None
+    with repo.db_store.conn:
+        repo.db_store.conn.execute("DROP TABLE pages_fts_short")
+    repo.close()
+
+    repo = Repository(tmp_path)
+    assert [page.slug for page in repo.search_pages("材料")] == ["curry"]
+    repo.rebuild_search_index()
+    assert [page.slug for page in repo.search_pages("買")] == ["curry"]
+    repo.close()
+
+
+def test_search_hits_use_weights(tmp_path):
+    """bm25 の重みで順位が変わることのテスト"""
+    repo = Repository(tmp_path)
+    repo.create_page(slug="a", title="Cooking", content="curry curry curry")
+    repo.create_page(slug="b", title="Curry", content="A recipe", tags=["food"])
+
+    hits = repo.search("curry")
+    assert [hit.page.slug for hit in hits] == ["b", "a"]
+    assert hits[0].page.tags == ["food"]
+    assert hits[0].score >= hits[1].score
+    assert hits[1].highlights[0] == (0, 5)
+
+    hits = repo.search("curry", weights=SearchWeights(title=0.0, slug=0.0, tags=0.0))
+    assert hits[0].page.slug == "a"
+    assert len(repo.search("curry", limit=1)) == 1
+    repo.close()
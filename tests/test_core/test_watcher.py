@@ -0,0 +1,51 @@
+"""ファイル監視のテスト"""
+
+import sys
+import threading
+
+import pytest
+
+from notenest.core.repository import Repository
+from notenest.core.sync import SyncResult
+from notenest.core.watcher import WorkspaceWatcher
+
+
+@pytest.mark.parametrize("use_inotify", [True, False])
+def test_watcher_applies_changed_files(tmp_path, use_inotify):
+    """ファイルの作成・削除がDBに反映されることのテスト"""
+    if use_inotify and not sys.platform.startswith("linux"):
+        pytest.skip("inotify is Linux only")
+
+    repo = Repository(tmp_path)
+    results: list[SyncResult] = []
+    synced = threading.Event()
+
+    def on_change(result: SyncResult) -> None:
+        results.append(result)
+        synced.set()
+
+    watcher = WorkspaceWatcher(
+        repo, on_change=on_change, debounce=0.05, poll_interval=0.05, use_inotify=use_inotify
+    )
+    watcher.start()
+    try:
+        assert watcher.backend_name == ("inotify" if use_inotify else "polling")
+
+        page_file = tmp_path / "pages" / "watched.md"
+        page_file.write_text("---\ntitle: Watched\n---\n\n[[other]]\n", encoding="utf-8")
+        assert synced.wait(5)
+        assert results[-1].added == 1
+        page = repo.get_page("watched")
+        assert page is not None
+        assert page.title == "Watched"
+
+        synced.clear()
+        page_file.unlink()
+        assert synced.wait(5)
+        assert results[-1].deleted == 1
+        assert repo.get_page("watched") is None
+    finally:
+        watcher.stop()
+        repo.close()
+
+    assert not watcher.is_running
@@ -1,10 +1,14 @@
 """DBStoreのテスト"""
 
+import sqlite3
 import tempfile
+import threading
 from pathlib import Path
 
+import pytest
+
 from notenest.core.page import Page
-from notenest.storage.db_store import DBStore
+from notenest.storage.db_store import ConnectionProfile, DBStore
 
 
 def test_foreign_key_cascade_on_delete():
@@ -43,3 +47,242 @@ def test_foreign_key_cascade_on_delete():
         db.close()
     finally:
         db_path.unlink(missing_ok=True)
+
+
+def test_batch_commits_once_and_rolls_back_nested():
+    """batch() によるコミット集約とネスト時のロールバックのテスト"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = DBStore(Path(tmpdir) / "test.db")
+        db.connect()
+        assert db.conn is not None
+
+        statements: list[str] = []
+        db.conn.set_trace_callback(statements.append)
+
+        with db.batch():
+            page_id = db.save_page(Page(slug="p1", title="Page 1"))
+            db.save_page_tags(page_id, ["a", "b", "c"])
+            db.save_links(page_id, ["p2"])
+            db.index_page_for_search(page_id, "p1", "Page 1", "body", ["a", "b", "c"])
+
+            # 内側のブロックで例外 → 内側の変更だけ巻き戻る
+            try:
+                with db.batch():
+                    db.save_page(Page(slug="p2", title="Page 2"))
+                    raise ValueError("boom")
+            except ValueError:
+                pass
+
+        assert statements.count("COMMIT") == 1
+        assert db.get_page_by_slug("p1") is not None
+        assert db.get_page_by_slug("p2") is None
+        assert len(db.get_page_tags(page_id)) == 3
+
+        # 外側のブロックで例外 → 全体がロールバック
+        try:
+            with db.batch():
+                db.save_page(Page(slug="p3", title="Page 3"))
+                raise ValueError("boom")
+        except ValueError:
+            pass
+        assert db.get_page_by_slug("p3") is None
+
+        db.close()
+
+
+def test_wal_profile_and_read_pool_isolation():
+    """WALモードと読み取りプールの分離のテスト"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = DBStore(Path(tmpdir) / "test.db", ConnectionProfile(read_pool_size=2))
+        db.connect()
+        assert db.conn is not None
+
+        journal_mode = db.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert journal_mode == "wal"
+
+        db.save_page(Page(slug="committed", title="Committed"))
+
+        seen: dict[str, object] = {}
+
+        def read_from_other_thread() -> None:
+            seen["committed"] = db.get_page_by_slug("committed")
+            seen["pending"] = db.get_page_by_slug("pending")
+
+        with db.batch():
+            db.save_page(Page(slug="pending", title="Pending"))
+            # 同一スレッドは未コミットの変更を読める
+            assert db.get_page_by_slug("pending") is not None
+
+            # 他スレッドはライターを待たずにコミット済みのデータだけを読む
+            thread = threading.Thread(target=read_from_other_thread)
+            thread.start()
+            thread.join(timeout=5)
+            assert not thread.is_alive()
+
+        assert seen["committed"] is not None
+        assert seen["pending"] is None
+        assert db.get_page_by_slug("pending") is not None
+
+        db.close()
+
+
+def test_save_links_and_tags_apply_only_differences():
+    """リンク・タグの保存が差分だけを書き込むことのテスト"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = DBStore(Path(tmpdir) / "test.db")
+        db.connect()
+        assert db.conn is not None
+
+        page_id = db.save_page(Page(slug="hub", title="Hub"))
+        db.save_links(page_id, [f"p{i}" for i in range(100)] + ["p0"])
+        db.save_page_tags(page_id, ["a", "b", "a"])
+
+        statements: list[str] = []
+        db.conn.set_trace_callback(statements.append)
+
+        db.save_links(page_id, [f"p{i}" for i in range(1, 101)])
+        db.save_page_tags(page_id, ["b", "c", "d"])
+
+        writes = [
+            sql.split()[0] for sql in statements if sql.lstrip().startswith(("INSERT", "DELETE"))
+        ]
+        # リンク: DELETE 1文 + INSERT 1件、タグ: DELETE 1文 + タグ作成 + 関連 INSERT 2件
+        assert writes.count("DELETE") == 2
+        assert writes.count("INSERT") == 4
+
+        targets = sorted(link.target_slug for link in db.get_outgoing_links(page_id))
+        assert targets == sorted(f"p{i}" for i in range(1, 101))
+        assert [tag.name for tag in db.get_page_tags(page_id)] == ["b", "c", "d"]
+        assert db.get_or_create_tags(["c", "e"]).keys() == {"c", "e"}
+
+        db.close()
+
+
+def test_workspace_revision_counts_commits():
+    """コミットごとに増えるワークスペースの変更カウンタのテスト"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = DBStore(Path(tmpdir) / "test.db")
+        db.connect()
+
+        initial = db.get_workspace_revision()
+        page_id = db.save_page(Page(slug="a", title="A"))
+        after_save = db.get_workspace_revision()
+        assert after_save.tag != initial.tag
+
+        # 1トランザクションの複数の書き込みは1回と数える
+        with db.batch():
+            db.save_page_tags(page_id, ["x"])
+            db.save_links(page_id, ["b"])
+        after_batch = db.get_workspace_revision()
+        assert after_batch.tag.split("-")[-1] == str(int(after_save.tag.split("-")[-1]) + 1)
+
+        # 変更のないトランザクション・ロールバックでは増えない
+        with db.batch():
+            db.get_page_by_slug("a")
+        with pytest.raises(RuntimeError), db.batch():
+            db.save_page(Page(slug="b", title="B"))
+            raise RuntimeError("rollback")
+        assert db.get_workspace_revision() == after_batch
+
+        # 再接続しても識別子とカウンタは保たれる
+        db.close()
+        db.connect()
+        assert db.get_workspace_revision() == after_batch
+        db.close()
+
+
+def test_search_index_does_not_store_bodies_in_fts():
+    """contentless FTS の更新・削除・再構築・旧テーブルからの移行のテスト"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = Path(tmpdir) / "test.db"
+
+        # 旧バージョンのスキーマ（本文を保持するFTSテーブル）
+        conn = sqlite3.connect(db_path)
+        conn.execute(
+            "CREATE TABLE pages (id INTEGER PRIMARY KEY AUTOINCREMENT, slug TEXT UNIQUE NOT NULL, "
+            "title TEXT NOT NULL, file_path TEXT NOT NULL, metadata_type TEXT DEFAULT 'default', "
+            "created_at TIMESTAMP NOT NULL, updated_at TIMESTAMP NOT NULL, metadata_json TEXT)"
+        )
+        conn.execute(
+            "INSERT INTO pages (id, slug, title, file_path, created_at, updated_at) "
+            "VALUES (1, 'old', 'Old', '', '2025-01-01T00:00:00', '2025-01-01T00:00:00')"
+        )
+        conn.execute(
+            "CREATE VIRTUAL TABLE pages_fts USING fts5("
+            "slug, title, content, tags, tokenize='porter unicode61')"
+        )
+        conn.execute(
+            "INSERT INTO pages_fts (rowid, slug, title, content, tags) "
+            "VALUES (1, 'old', 'Old', 'legacy body', '')"
+        )
+        conn.commit()
+        conn.close()
+
+        db = DBStore(db_path)
+        db.connect()
+        assert db.conn is not None
+        page_id = 1
+        assert [page.slug for page in db.search_pages("legacy")] == ["old"]
+
+        # 更新: 古いトークンは検索に残らない
+        db.index_page_for_search(page_id, "old", "Old", "fresh body", [])
+        assert db.search_pages("legacy") == []
+        assert [page.slug for page in db.search_pages("fresh")] == ["old"]
+
+        # FTS側には本文を保持しない
+        tables = {row[0] for row in db.conn.execute("SELECT name FROM sqlite_master")}
+        assert "pages_fts_content" not in tables
+
+        db.rebuild_search_index()
+        db.optimize_search_index()
+        db.optimize_search_index(merge_pages=16)
+        assert [page.slug for page in db.search_pages("fresh")] == ["old"]
+
+        db.delete_page(page_id)
+        assert db.search_pages("fresh") == []
+
+        db.close()
+
+
+def test_search_schema_does_not_need_python_functions():
+    """DBファイルのスキーマがアプリ定義のSQL関数なしで読めること（旧スキーマからの移行を含む）"""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = Path(tmpdir) / "test.db"
+        db = DBStore(db_path)
+        db.connect()
+        page_id = db.save_page(Page(slug="a", title="A", file_path=Path("a.md")))
+        db.index_page_for_search(page_id, "a", "A", "compressed body", ["tag"])
+        db.close()
+
+        # 旧バージョンのスキーマ（展開ビューを参照する external content テーブル）に戻す
+        conn = sqlite3.connect(db_path)
+        conn.executescript("""
+            DROP TABLE pages_fts;
+            CREATE VIEW page_search_content AS
+            SELECT page_id, slug, title, notenest_decompress(body) AS content, tags
+            FROM page_content;
+            CREATE VIRTUAL TABLE pages_fts USING fts5(
+                slug, title, content, tags,
+                content='page_search_content', content_rowid='page_id',
+                tokenize='porter unicode61'
+            );
+        """)
+        conn.close()
+
+        db = DBStore(db_path)
+        db.connect()
+        assert [hit.snippet for hit in db.search_hits("compressed")] == ["compressed body"]
+        db.close()
+
+        # 関数を登録しない接続（sqlite3 CLI などの他のクライアント）でも検索・検査できる
+        conn = sqlite3.connect(db_path)
+        schema = [
+            row[0] for row in conn.execute("SELECT sql FROM sqlite_master WHERE sql IS NOT NULL")
+        ]
+        assert not any("notenest_decompress" in sql for sql in schema)
+        assert conn.execute(
+            "SELECT rowid FROM pages_fts WHERE pages_fts MATCH 'compressed'"
+        ).fetchall() == [(page_id,)]
+        conn.execute("INSERT INTO pages_fts (pages_fts) VALUES ('integrity-check')")
+        assert conn.execute("PRAGMA integrity_check").fetchone() == ("ok",)
+        conn.close()